@@ -3,6 +3,9 @@
 
 from util.walkscape_constants import *
 
+# Upper-case names of percentage attributes, built once for the display loop
+PERCENTAGE_STATS = frozenset(attr.name for attr in Attribute if attr.is_percentage)
+
 # Items to compare
 ITEM1 = Item.HYDRILIUM_SICKLE.EXCELLENT
 ITEM2 = Item.IRON_SICKLE.PERFECT
@@ -48,53 +51,33 @@ print("="*80)
 print(f"{'Stat':<25} {abbrev1:>15} {abbrev2:>15} {'Difference':>15}")
 print("-"*80)
 
-for stat_key in sorted(all_stat_keys):
-    val1 = stats1.get(stat_key, 0.0)
-    val2 = stats2.get(stat_key, 0.0)
-    diff = val2 - val1
+# Lay the stats out as parallel columns once, then print from them
+stat_keys = sorted(all_stat_keys)
+values1 = [stats1.get(stat_key, 0.0) for stat_key in stat_keys]
+values2 = [stats2.get(stat_key, 0.0) for stat_key in stat_keys]
+# Stats are stored as decimals (0.05 = 5%), display percentages as such
+is_percentage = [stat_key.upper() in PERCENTAGE_STATS for stat_key in stat_keys]
+
+# Tally which item wins each stat while printing
+better_stats_item1 = 0
+better_stats_item2 = 0
 
-    # Check if this is a percentage attribute
-    key_upper = stat_key.upper()
-    suffix = " "
-    if hasattr(Attribute, key_upper):
-        attribute_obj = getattr(Attribute, key_upper)
-        if attribute_obj.is_percentage:
-            # Stats are stored as decimals (0.05 = 5%), display as percentages
-            val1_display = val1 * 100
-            val2_display = val2 * 100
-            diff_display = diff * 100
-            suffix = "%"
-        else:
-            val1_display = val1
-            val2_display = val2
-            diff_display = diff
-    else:
-        val1_display = val1
-        val2_display = val2
-        diff_display = diff
+for stat_key, val1, val2, is_pct in zip(stat_keys, values1, values2, is_percentage):
+    diff = val2 - val1
+    better_stats_item1 += val1 > val2
+    better_stats_item2 += val2 > val1
+    scale, suffix = (100, "%") if is_pct else (1, " ")
 
     # Format the stat name nicely
     stat_display = stat_key.replace('_', ' ').title()
     
-    print(f"{stat_display:<25} {val1_display:>14.1f}{suffix} {val2_display:>14.1f}{suffix} {diff_display:>+14.1f}{suffix}")
+    print(f"{stat_display:<25} {val1 * scale:>14.1f}{suffix} {val2 * scale:>14.1f}{suffix} {diff * scale:>+14.1f}{suffix}")
 
 # Show which item is better overall
 print("\n" + "="*80)
 print("SUMMARY")
 print("="*80)
 
-better_stats_item1 = 0
-better_stats_item2 = 0
-
-for stat_key in all_stat_keys:
-    val1 = stats1.get(stat_key, 0.0)
-    val2 = stats2.get(stat_key, 0.0)
-    
-    if val1 > val2:
-        better_stats_item1 += 1
-    elif val2 > val1:
-        better_stats_item2 += 1
-
 print(f"{abbrev1}: {better_stats_item1} stats better")
 print(f"{abbrev2}: {better_stats_item2} stats better")
 
@@ -1,12 +1,20 @@
 #!/usr/bin/env python3
 """Find optimal gear configuration by testing all combinations of new items"""
 
-import math
-from itertools import combinations
+import multiprocessing
+import os
+from itertools import combinations, permutations, product
 from util.walkscape_constants import *
 from util.gearset_utils import Gearset
+from util.fast_steps import route_steps, cached_route_steps, total_steps, cache_info as step_cache_info
 import my_config
 
+# Print per-route base calculations and step cache stats
+DEBUG = False
+
+# Searches with at least this many replacement combinations run on all CPU cores
+PARALLEL_MIN_COMBINATIONS = 100_000
+
 AGILITY_LEVEL = my_config.get_agility_level()
 LEVEL_WE = (AGILITY_LEVEL - 1) * 0.005
 
@@ -33,35 +41,297 @@ for (start, end), route_data in RAW_ROUTES.items():
         ROUTES.append((start, end, route_data['distance']))
 
 
-def calc_steps(base: int, gear: dict) -> float:
+class TravelStats:
+    """The four travel stats that affect steps (decimals, as in get_stats_for_skill())."""
+    __slots__ = ('we', 'da', 'flat', 'pct')
+    
+    def __init__(self, we: float = 0.0, da: float = 0.0, flat: float = 0.0, pct: float = 0.0):
+        self.we = we
+        self.da = da
+        self.flat = flat
+        self.pct = pct
+    
+    @classmethod
+    def from_dict(cls, stats: dict) -> 'TravelStats':
+        """Pick the travel stats out of a stats dict."""
+        return cls(
+            stats.get('work_efficiency', 0.0),
+            stats.get('double_action', 0.0),
+            stats.get('steps_add', 0.0),
+            stats.get('steps_percent', 0.0)
+        )
+    
+    def __add__(self, other: 'TravelStats') -> 'TravelStats':
+        return TravelStats(self.we + other.we, self.da + other.da, self.flat + other.flat, self.pct + other.pct)
+    
+    def __sub__(self, other: 'TravelStats') -> 'TravelStats':
+        return TravelStats(self.we - other.we, self.da - other.da, self.flat - other.flat, self.pct - other.pct)
+    
+    def __bool__(self) -> bool:
+        return bool(self.we or self.da or self.flat or self.pct)
+    
+    def __repr__(self):
+        return f"TravelStats(we={self.we}, da={self.da}, flat={self.flat}, pct={self.pct})"
+
+
+def calc_steps(base: int, gear: TravelStats) -> float:
     """Calculate expected steps with DA."""
-    we = gear.get('work_efficiency', 0.0)
-    da = gear.get('double_action', 0.0)
-    flat = gear.get('steps_add', 0)
-    pct = gear.get('steps_percent', 0.0)
+    return route_steps(base, gear.we, gear.da, gear.flat, gear.pct, LEVEL_WE)
+
+
+def format_stats(stats: TravelStats) -> str:
+    """Format travel stats for display."""
+    return f"WE={stats.we*100:.0f}% DA={stats.da*100:.0f}% Flat={stats.flat:+.0f} Pct={stats.pct*100:.0f}%"
+
+
+def _travel_vectors(item, routes) -> list:
+    """Per-route TravelStats for an item."""
+    return [TravelStats.from_dict(item.get_stats_for_skill(Skill.TRAVEL, location=start))
+            for start, end, dist in routes]
+
+
+def _best_case(deltas) -> TravelStats:
+    """Best value each stat reaches across deltas: most WE/DA, fewest flat/pct steps."""
+    return TravelStats(
+        max(delta.we for delta in deltas),
+        max(delta.da for delta in deltas),
+        min(delta.flat for delta in deltas),
+        min(delta.pct for delta in deltas)
+    )
+
+
+def _route_steps(base: int, stats: TravelStats) -> float:
+    """Memoized calc_steps() for one route."""
+    return cached_route_steps(base, stats.we, stats.da, stats.flat, stats.pct, LEVEL_WE)
+
+
+def _total_steps(route_bases, route_stats, deltas) -> float:
+    """Total steps over all routes with a per-route stat delta applied."""
+    variant_stats = [stats + delta for stats, delta in zip(route_stats, deltas)]
+    return total_steps(
+        route_bases,
+        [stats.we for stats in variant_stats],
+        [stats.da for stats in variant_stats],
+        [stats.flat for stats in variant_stats],
+        [stats.pct for stats in variant_stats],
+        LEVEL_WE
+    )
+
+
+def _slot_assignments(equipped_in_slot, new_items_in_slot):
+    """
+    Enumerate every distinct way to swap new items into one slot type.
     
-    # Travel formula: base efficiency is 200% (2.0), NO WE cap
-    eff = 2.00 + LEVEL_WE + we
-    per_action = base / eff / 10.0
-    per_action = per_action * (1.0 + pct) + flat
-    per_action = max(10, math.ceil(per_action))
-    expected_paid_nodes = 10.0 / (1 + da)
-    return math.ceil(expected_paid_nodes * per_action)
+    Each assignment is packed into an int with one bit field per equipped
+    slot holding the new item's index (0 = keep). Slots holding the same
+    item, and repeated new items, share field values and are sorted within
+    their group, so swaps that leave the same gear (e.g. ring1/ring2 both
+    wearing the same ring) pack to the same key and are only kept once.
+    
+    Args:
+        equipped_in_slot: List of (slot_name, item) currently equipped in this slot type
+        new_items_in_slot: List of new items for this slot type
+        
+    Returns:
+        List of {slot_name: (old_item, new_item)} dicts, starting with {} (no replacement)
+    """
+    field_bits = len(new_items_in_slot).bit_length()
+    new_index = {}
+    for new_item in new_items_in_slot:
+        new_index.setdefault(new_item.name, len(new_index) + 1)
+    
+    # Field positions of the equipped slots, grouped by the item they hold
+    position = {slot_name: i for i, (slot_name, _) in enumerate(equipped_in_slot)}
+    same_item = {}
+    for slot_name, item in equipped_in_slot:
+        same_item.setdefault(item.name, []).append(position[slot_name])
+    groups = [positions for positions in same_item.values() if len(positions) > 1]
+    
+    assignments = [{}]
+    seen = {0}
+    
+    # Try replacing 1, 2, 3... items in this slot
+    for num_replacements in range(1, min(len(equipped_in_slot), len(new_items_in_slot)) + 1):
+        # Every ordered pick of new items, enumerated once rather than per equipped combo
+        new_perms = [
+            new_perm
+            for new_combo in combinations(new_items_in_slot, num_replacements)
+            for new_perm in permutations(new_combo)
+        ]
+        
+        # Pair each choice of equipped items to replace with each ordered pick
+        for equipped_combo, new_perm in product(combinations(equipped_in_slot, num_replacements), new_perms):
+            fields = [0] * len(equipped_in_slot)
+            for (slot_name, _), new_item in zip(equipped_combo, new_perm):
+                fields[position[slot_name]] = new_index[new_item.name]
+            for positions in groups:
+                for pos, value in zip(positions, sorted(fields[pos] for pos in positions)):
+                    fields[pos] = value
+            
+            key = 0
+            for value in reversed(fields):
+                key = (key << field_bits) | value
+            if key in seen:
+                continue
+            seen.add(key)
+            
+            assignment = {}
+            for (slot_name, old_item), new_item in zip(equipped_combo, new_perm):
+                assignment[slot_name] = (old_item, new_item)
+            assignments.append(assignment)
+    
+    return assignments
 
 
-def format_stats(stats: dict) -> str:
-    """Format stats dict for display."""
-    we = stats.get('work_efficiency', 0.0)
-    da = stats.get('double_action', 0.0)
-    flat = stats.get('steps_add', 0.0)
-    pct = stats.get('steps_percent', 0.0)
-    return f"WE={we*100:.0f}% DA={da*100:.0f}% Flat={flat:+.0f} Pct={pct*100:.0f}%"
+def _pair_deltas(equipped_in_slot, new_items_in_slot, equipped_vectors: dict, new_vectors: dict) -> dict:
+    """
+    Per-route stat change for every single (equipped slot, new item) swap.
+    
+    Args:
+        equipped_in_slot: List of (slot_name, item) currently equipped in this slot type
+        new_items_in_slot: List of new items for this slot type
+        equipped_vectors: Per-route TravelStats keyed by equipped slot name
+        new_vectors: Per-route TravelStats keyed by id() of each new item
+        
+    Returns:
+        Dict of (slot_name, id(new_item)) -> per-route TravelStats deltas
+    """
+    return {
+        (slot_name, id(new_item)): [
+            new_stats - old_stats
+            for new_stats, old_stats in zip(new_vectors[id(new_item)], equipped_vectors[slot_name])
+        ]
+        for slot_name, _ in equipped_in_slot
+        for new_item in new_items_in_slot
+    }
+
+
+def _replacement_delta(assignment: dict, pair_deltas: dict, num_routes: int) -> list:
+    """
+    Per-route stat change from applying a slot assignment.
+    
+    Args:
+        assignment: {slot_name: (old_item, new_item)}
+        pair_deltas: Single-swap deltas from _pair_deltas()
+        num_routes: Number of routes
+    """
+    delta = [TravelStats()] * num_routes
+    for slot_name, (old_item, new_item) in assignment.items():
+        delta = [d + p for d, p in zip(delta, pair_deltas[(slot_name, id(new_item))])]
+    return delta
+
+
+class _ReplacementSearch:
+    """
+    Depth-first branch-and-bound over slot types.
+    
+    Per-route stats and step counts are updated in place as options are
+    applied and restored on the way back out of each branch.
+    """
+    
+    def __init__(self, slot_groups, remaining_bounds, route_bases, base_route_stats, best_total):
+        self.slot_groups = slot_groups
+        self.remaining_bounds = remaining_bounds
+        self.route_bases = route_bases
+        self.route_stats = list(base_route_stats)
+        self.current_steps = [_route_steps(dist, stats) for dist, stats in zip(route_bases, self.route_stats)]
+        self.base_total = sum(self.current_steps)
+        self.best_total = best_total
+        self.best_choice = ()  # Option index per slot group of the best leaf
+        self.chosen = []
+    
+    def run(self):
+        """Search the whole tree."""
+        self._bb(0, self.base_total)
+    
+    def run_branch(self, option_index):
+        """Search only the subtree under one option of the first slot group."""
+        saved, variant_total = self._apply(0, option_index, self.base_total)
+        self._bb(1, variant_total)
+        self._undo(saved)
+    
+    def _apply(self, depth, option_index, current_total):
+        """Apply an option in place; returns the undo record and the new total."""
+        assignment, deltas, changed_routes = self.slot_groups[depth][0][option_index]
+        saved = [(r, self.route_stats[r], self.current_steps[r]) for r in changed_routes]
+        for r, stats, steps in saved:
+            self.route_stats[r] = stats + deltas[r]
+            self.current_steps[r] = _route_steps(self.route_bases[r], self.route_stats[r])
+            current_total += self.current_steps[r] - steps
+        self.chosen.append(option_index)
+        return saved, current_total
+    
+    def _undo(self, saved):
+        self.chosen.pop()
+        for r, stats, steps in saved:
+            self.route_stats[r] = stats
+            self.current_steps[r] = steps
+    
+    def _bb(self, depth, current_total):
+        if depth == len(self.slot_groups):
+            # Option 0 is not always "no replacement" (options are sorted), so check the assignments
+            if current_total < self.best_total and any(
+                self.slot_groups[d][0][i][0] for d, i in enumerate(self.chosen)
+            ):
+                self.best_total = current_total
+                self.best_choice = tuple(self.chosen)
+            return
+        
+        # Prune when even the best case for the remaining slot types can't win
+        lower_bound = _total_steps(self.route_bases, self.route_stats, self.remaining_bounds[depth])
+        if lower_bound >= self.best_total:
+            return
+        
+        for option_index in range(len(self.slot_groups[depth][0])):
+            saved, variant_total = self._apply(depth, option_index, current_total)
+            self._bb(depth + 1, variant_total)
+            self._undo(saved)
+
+
+# Search being sharded across worker processes (inherited through fork, never pickled)
+_ACTIVE_SEARCH = None
+
+
+def _search_top_branch(option_index):
+    """Worker: search one top-level branch, return (best_total, best_choice)."""
+    _ACTIVE_SEARCH.run_branch(option_index)
+    return _ACTIVE_SEARCH.best_total, _ACTIVE_SEARCH.best_choice
+
+
+def _search_parallel(search):
+    """
+    Split the search across CPU cores by the options of the first slot group.
+    
+    Falls back to a serial search where fork isn't available, since workers
+    rely on inheriting the prebuilt search state instead of pickling it.
+    """
+    global _ACTIVE_SEARCH
+    
+    if 'fork' not in multiprocessing.get_all_start_methods():
+        search.run()
+        return search.best_total, search.best_choice
+    
+    # Seed every worker with the incumbent from the most promising branch
+    search.run_branch(0)
+    
+    _ACTIVE_SEARCH = search
+    try:
+        with multiprocessing.get_context('fork').Pool(processes=os.cpu_count()) as pool:
+            results = pool.map(_search_top_branch, range(1, len(search.slot_groups[0][0])), chunksize=1)
+    finally:
+        _ACTIVE_SEARCH = None
+    
+    return min([(search.best_total, search.best_choice)] + results, key=lambda result: result[0])
 
 
 def find_best_gear_combination(gearset, new_items, routes):
     """
     Find the best combination of gear replacements
     
+    Uses a depth-first branch-and-bound over slot types: a branch is pruned
+    once the best stats its remaining slot types could reach still can't beat
+    the best total found so far.
+    
     Args:
         gearset: Current Gearset object
         new_items: List of new items to consider
@@ -72,19 +342,21 @@ def find_best_gear_combination(gearset, new_items, routes):
     """
     # Calculate base total with location-aware stats per route
     base_total = 0
-    print("\nDEBUG: Base route calculations:")
+    if DEBUG:
+        print("\nDEBUG: Base route calculations:")
     for start, end, dist in routes:
         # Pass the Location object directly for location-aware stats
-        route_stats = gearset.get_total_stats(Skill.TRAVEL, location=start)
-        route_steps = calc_steps(dist, route_stats)
-        start_name = start.name if hasattr(start, 'name') else str(start)
-        end_name = end.name if hasattr(end, 'name') else str(end)
-        print(f"  {start_name} → {end_name}: {route_steps:.0f} steps ({format_stats(route_stats)})")
-        base_total += route_steps
+        route_stats = TravelStats.from_dict(gearset.get_total_stats(Skill.TRAVEL, location=start))
+        steps = calc_steps(dist, route_stats)
+        if DEBUG:
+            start_name = start.name if hasattr(start, 'name') else str(start)
+            end_name = end.name if hasattr(end, 'name') else str(end)
+            print(f"  {start_name} → {end_name}: {steps:.0f} steps ({format_stats(route_stats)})")
+        base_total += steps
     
     # For display, use first route's location
     first_location = routes[0][0] if routes else None
-    base_stats = gearset.get_total_stats(Skill.TRAVEL, location=first_location)
+    base_stats = TravelStats.from_dict(gearset.get_total_stats(Skill.TRAVEL, location=first_location))
     
     best_config = {
         'replacements': [],
@@ -109,88 +381,86 @@ def find_best_gear_combination(gearset, new_items, routes):
             new_by_slot[new_item.slot] = []
         new_by_slot[new_item.slot].append(new_item)
     
-    # Generate all possible replacement combinations
-    # For each slot with new items, try all combinations of replacements
-    all_combinations = [{}]  # Start with no replacements
+    # Look up every item's travel stats once per route, up front
+    equipped_vectors = {slot: _travel_vectors(item, routes) for slot, item in equipped_items}
+    new_vectors = {id(new_item): _travel_vectors(new_item, routes) for new_item in new_items}
     
+    # Stats of the current gear per route (replacements are applied as deltas on top)
+    base_route_stats = [TravelStats()] * len(routes)
+    for slot, item in equipped_items:
+        base_route_stats = [stats + vector for stats, vector in zip(base_route_stats, equipped_vectors[slot])]
+    
+    route_bases = [dist for start, end, dist in routes]
+    
+    # Slot types are independent, so enumerate each one's replacement options once
+    slot_groups = []
     for slot_type, new_items_in_slot in new_by_slot.items():
         if slot_type not in items_by_slot:
             continue
         
-        equipped_in_slot = items_by_slot[slot_type]
-        new_combinations = []
+        # Each (slot, new item) swap is diffed once and shared by every assignment using it
+        pair_deltas = _pair_deltas(items_by_slot[slot_type], new_items_in_slot, equipped_vectors, new_vectors)
         
-        for combo in all_combinations:
-            # Keep current combo (no replacement in this slot)
-            new_combinations.append(combo.copy())
-            
-            # Try replacing 1, 2, 3... items in this slot
-            for num_replacements in range(1, min(len(equipped_in_slot), len(new_items_in_slot)) + 1):
-                # Try all combinations of which equipped items to replace
-                for equipped_combo in combinations(equipped_in_slot, num_replacements):
-                    # Try all combinations of which new items to use
-                    for new_combo in combinations(new_items_in_slot, num_replacements):
-                        # Try all permutations of assignment
-                        from itertools import permutations as perms
-                        for new_perm in perms(new_combo):
-                            new_config = combo.copy()
-                            for (slot_name, old_item), new_item in zip(equipped_combo, new_perm):
-                                new_config[slot_name] = (old_item, new_item)
-                            new_combinations.append(new_config)
+        options = []
+        for assignment in _slot_assignments(items_by_slot[slot_type], new_items_in_slot):
+            deltas = _replacement_delta(assignment, pair_deltas, len(routes))
+            # Only routes whose stats actually move need their steps recomputed
+            changed_routes = [r for r, delta in enumerate(deltas) if delta]
+            options.append((assignment, deltas, changed_routes))
+        
+        # Best value each stat can reach within this slot type (admissible bound)
+        optimistic = [_best_case([deltas[r] for assignment, deltas, changed_routes in options])
+                      for r in range(len(routes))]
         
-        all_combinations = new_combinations
+        # Order options best-first so a strong incumbent is found early
+        options.sort(key=lambda option: _total_steps(route_bases, base_route_stats, option[1]))
+        slot_groups.append((options, optimistic))
     
-    # Test each combination
-    print(f"Testing {len(all_combinations)} gear combinations...\n")
+    # Explore the most promising slot types first
+    slot_groups.sort(key=lambda group: _total_steps(route_bases, base_route_stats, group[1]))
     
-    for combo in all_combinations:
-        if not combo:
-            continue  # Skip empty (current gear)
-        
-        # Calculate stats for this combination
-        variant_stats = base_stats.copy()
-        
-        for slot_name, (old_item, new_item) in combo.items():
-            old_stats = old_item.attr(Skill.TRAVEL)
-            new_stats = new_item.get_stats_for_skill(Skill.TRAVEL)
-            
-            # Subtract old stats
-            for stat_name, value in old_stats.items():
-                variant_stats[stat_name] = variant_stats.get(stat_name, 0.0) - value
-            
-            # Add new stats
-            for stat_name, value in new_stats.items():
-                variant_stats[stat_name] = variant_stats.get(stat_name, 0.0) + value
+    # remaining_bounds[d][r]: best possible stat delta from slot groups d.. on route r
+    remaining_bounds = [[TravelStats()] * len(routes)]
+    for options, optimistic in reversed(slot_groups):
+        remaining_bounds.insert(0, [bound + best_delta for bound, best_delta in zip(remaining_bounds[0], optimistic)])
+    
+    print(f"\nSearching {len(slot_groups)} slot types "
+          f"({sum(len(options) for options, _ in slot_groups)} replacement options)...\n")
+    
+    search = _ReplacementSearch(slot_groups, remaining_bounds, route_bases, base_route_stats, base_total)
+    num_combinations = 1
+    for options, _ in slot_groups:
+        num_combinations *= len(options)
+    if num_combinations >= PARALLEL_MIN_COMBINATIONS and len(slot_groups) > 1:
+        best_total, best_choice = _search_parallel(search)
+    else:
+        search.run()
+        best_total, best_choice = search.best_total, search.best_choice
+    
+    best_replacements = {}
+    for depth, option_index in enumerate(best_choice):
+        assignment, _, _ = slot_groups[depth][0][option_index]
+        best_replacements.update(assignment)
+    
+    if DEBUG:
+        cache = step_cache_info()
+        print(f"Step cache: {cache.hits} hits, {cache.misses} misses")
+    
+    if best_replacements:
+        # Calculate display stats for the winning combination
+        variant_stats = base_stats
         
-        # Calculate total steps with location-aware stats per route
-        variant_total = 0
-        for start, end, dist in routes:
-            # Calculate stats for this route with replacements
-            route_stats = {}
-            
-            # Get stats from all items (with replacements applied)
-            for slot, item in equipped_items:
-                # Check if this slot is being replaced
-                if slot in combo:
-                    _, new_item = combo[slot]
-                    item_stats = new_item.get_stats_for_skill(Skill.TRAVEL, location=start)
-                else:
-                    item_stats = item.get_stats_for_skill(Skill.TRAVEL, location=start)
-                
-                # Add item stats to route stats
-                for stat_name, value in item_stats.items():
-                    route_stats[stat_name] = route_stats.get(stat_name, 0.0) + value
-            
-            variant_total += calc_steps(dist, route_stats)
-        improvement = base_total - variant_total
+        for slot_name, (old_item, new_item) in best_replacements.items():
+            old_stats = TravelStats.from_dict(old_item.attr(Skill.TRAVEL))
+            new_stats = TravelStats.from_dict(new_item.get_stats_for_skill(Skill.TRAVEL))
+            variant_stats = variant_stats - old_stats + new_stats
         
-        if variant_total < best_config['total_steps']:
-            best_config = {
-                'replacements': list(combo.items()),
-                'total_steps': variant_total,
-                'improvement': improvement,
-                'stats': variant_stats
-            }
+        best_config = {
+            'replacements': list(best_replacements.items()),
+            'total_steps': best_total,
+            'improvement': base_total - best_total,
+            'stats': variant_stats
+        }
     
     return best_config, base_total
 
@@ -203,7 +473,7 @@ for slot, item in gearset.get_all_items():
     stats = item.get_stats_for_skill(Skill.TRAVEL)
     print(f"{slot:12}: {item.name:35} {stats}")
 
-base_stats = gearset.get_total_stats(Skill.TRAVEL)
+base_stats = TravelStats.from_dict(gearset.get_total_stats(Skill.TRAVEL))
 print(f"\nBase Total: {format_stats(base_stats)}")
 
 print("\n=== New Items to Test ===")
@@ -13,6 +13,9 @@ Suffix patterns:
 - Hydrilium gear: (T5-Perfect) or (T5-Perfect) (NMC-only) for underwater
 """
 
+import re
+from functools import lru_cache
+
 from util.gearset_utils import Gearset
 from util.walkscape_constants import *
 
@@ -61,47 +64,47 @@ def get_region_name(location_key: str) -> str:
     }
     return region_map.get(location_key.lower(), location_key.capitalize())
 
+# For crafted items, the quality IS the tier
+QUALITY_TO_TIER = {
+    'normal': 'T1',
+    'good': 'T2',
+    'great': 'T3',
+    'excellent': 'T4',
+    'perfect': 'T5',
+    'eternal': 'T6'
+}
+
+# Fallback: material tier patterns
+MATERIAL_TO_TIER = {
+    'copper': 'T1', 'bronze': 'T1', 'iron': 'T1',
+    'steel': 'T2', 'black steel': 'T3',
+    'mithril': 'T4', 'adamantine': 'T5',
+    'birch': 'T1', 'pine': 'T2', 'oak': 'T3',
+    'maple': 'T4', 'yew': 'T5'
+}
+
+# Compiled once; longest alternatives first so 'black steel' wins over 'steel'
+_QUALITY_RE = re.compile(r'\b(' + '|'.join(QUALITY_TO_TIER) + r')\b', re.IGNORECASE)
+_MATERIAL_RE = re.compile(
+    r'\b(' + '|'.join(sorted(MATERIAL_TO_TIER, key=len, reverse=True)) + r')\b', re.IGNORECASE
+)
+
 def get_tier_from_name(name: str) -> str:
     """Extract tier from crafted item name or quality level."""
-    # For crafted items, the quality IS the tier
-    # Normal=T1, Good=T2, Great=T3, Excellent=T4, Perfect=T5, Eternal=T6
-    quality_to_tier = {
-        'normal': 'T1',
-        'good': 'T2',
-        'great': 'T3',
-        'excellent': 'T4',
-        'perfect': 'T5',
-        'eternal': 'T6'
-    }
-    
-    name_lower = name.lower()
-    for quality, tier in quality_to_tier.items():
-        if quality in name_lower:
-            return tier
-    
-    # Fallback: check material tier patterns
-    tier_map = {
-        'copper': 'T1', 'bronze': 'T1', 'iron': 'T1',
-        'steel': 'T2', 'black steel': 'T3',
-        'mithril': 'T4', 'adamantine': 'T5',
-        'birch': 'T1', 'pine': 'T2', 'oak': 'T3',
-        'maple': 'T4', 'yew': 'T5'
-    }
+    match = _QUALITY_RE.search(name)
+    if match:
+        return QUALITY_TO_TIER[match.group(0).lower()]
     
-    for material, tier in tier_map.items():
-        if material in name_lower:
-            return tier
+    match = _MATERIAL_RE.search(name)
+    if match:
+        return MATERIAL_TO_TIER[match.group(0).lower()]
     
     return 'T1'  # Default
 
 def get_quality_from_name(name: str) -> str:
     """Extract quality from item name."""
-    qualities = ['Normal', 'Good', 'Great', 'Excellent', 'Perfect', 'Eternal']
-    name_lower = name.lower()
-    for quality in qualities:
-        if quality.lower() in name_lower:
-            return quality
-    return None
+    match = _QUALITY_RE.search(name)
+    return match.group(0).title() if match else None
 
 def get_set_name(item) -> str:
     """Get set name from gated_stats."""
@@ -122,10 +125,14 @@ def get_set_name(item) -> str:
     
     return None
 
+@lru_cache(maxsize=4096)
 def analyze_item_stats(item, location=None, skill=None) -> dict:
     """
     Analyze item stats to determine what suffixes to add.
     
+    Cached per (item, location, skill), so the returned dict is shared and
+    must not be modified.
+    
     Args:
         item: Item instance
         location: LocationInfo object for location-specific checks
@@ -250,9 +257,10 @@ def analyze_item_stats(item, location=None, skill=None) -> dict:
     
     return result
 
+@lru_cache(maxsize=4096)
 def format_item_name(item, location=None, skill=None) -> str:
     """
-    Format item name with appropriate suffixes.
+    Format item name with appropriate suffixes (cached per item, location and skill).
     
     Args:
         item: Item instance
@@ -298,14 +306,12 @@ def format_item_name(item, location=None, skill=None) -> str:
     # Set bonuses
     if analysis['set_name']:
         # Check if item has base stats (non-set stats)
-        has_base_stats = False
-        if hasattr(item, '_stats') and item._stats:
-            for skill_data in item._stats.values():
-                if isinstance(skill_data, dict):
-                    for location_data in skill_data.values():
-                        if isinstance(location_data, dict) and location_data:
-                            has_base_stats = True
-                            break
+        has_base_stats = any(
+            isinstance(location_data, dict) and location_data
+            for skill_data in (getattr(item, '_stats', None) or {}).values()
+            if isinstance(skill_data, dict)
+            for location_data in skill_data.values()
+        )
         
         if has_base_stats:
             suffixes.append("Base")
@@ -370,20 +376,12 @@ def main():
         item_name = format_item_name(item, LOCATION, SKILL)
         slot_map[slot] = item_name
     
-    # Print in Arky's sheet order
-    print("Gearset for Arky's Sheet:")
-    print("-" * 40)
-    
-    for slot in SLOT_ORDER:
-        item_name = slot_map.get(slot, 'None')
-        print(item_name)
-
-    if CONSUMABLE: 
-        print(CONSUMABLE.name)
-    else: 
-        print('None')
-    
-    print("-" * 40)
+    # Print in Arky's sheet order, consumable last, as one write
+    lines = ["Gearset for Arky's Sheet:", "-" * 40]
+    lines.extend(slot_map.get(slot, 'None') for slot in SLOT_ORDER)
+    lines.append(CONSUMABLE.name if CONSUMABLE else 'None')
+    lines.append("-" * 40)
+    print('\n'.join(lines))
     print(f"Total items: {len([v for v in slot_map.values() if v != 'None'])}")
     if SKILL:
         print(f"Skill filter: {SKILL.name}")
@@ -3,8 +3,33 @@
 Calculate the value of inventory items where quantity > 2, keeping 1 of each.
 """
 
+from collections import defaultdict
+from operator import itemgetter
+
 from util.character_export_util import Character
-from my_config import CHARACTER_EXPORT
+from my_config import get_character
+
+
+# Category of each item class seen so far (classes come from the autogenerated modules)
+_CATEGORY_BY_TYPE = {}
+
+
+def get_item_category(item) -> str:
+    """Classify an inventory item as 'equipment', 'material', 'consumable' or 'other'."""
+    item_type = type(item)
+    category = _CATEGORY_BY_TYPE.get(item_type)
+    if category is None:
+        class_name = item_type.__name__
+        if hasattr(item, 'slot'):
+            category = 'equipment'
+        elif 'Material' in class_name:
+            category = 'material'
+        elif 'Consumable' in class_name:
+            category = 'consumable'
+        else:
+            category = 'other'
+        _CATEGORY_BY_TYPE[item_type] = category
+    return category
 
 
 def calculate_sellable_value(character: Character, min_quantity: int = 3, keep_quantity: int = 1):
@@ -17,34 +42,29 @@ def calculate_sellable_value(character: Character, min_quantity: int = 3, keep_q
         keep_quantity: How many to keep (default 1)
     
     Returns:
-        tuple: (total_value, items_list)
+        tuple: (total_value, items_list); each item dict keeps its item object under 'obj'
     """
-    sellable_items = []
-    total_value = 0
-    
-    for item, qty in character.items.items():
-        if qty >= min_quantity and hasattr(item, 'value'):
-            sell_qty = qty - keep_quantity
-            sell_value = item.value * sell_qty
-            total_value += sell_value
-            
-            # Get item name
-            if hasattr(item, 'name'):
-                item_name = item.name
-            else:
-                item_name = str(item)
-            
-            sellable_items.append({
-                'name': item_name,
-                'total_qty': qty,
-                'sell_qty': sell_qty,
-                'keep_qty': keep_quantity,
-                'unit_value': item.value,
-                'total_value': sell_value
-            })
+    # Items that qualify, then the per-item arithmetic as whole columns
+    sellable = [(item, qty) for item, qty in character.valued_items if qty >= min_quantity]
+    sell_qtys = [qty - keep_quantity for item, qty in sellable]
+    sell_values = [item.value * sell_qty for (item, qty), sell_qty in zip(sellable, sell_qtys)]
+    total_value = sum(sell_values)
+    
+    sellable_items = [
+        {
+            'name': item.name if hasattr(item, 'name') else str(item),
+            'total_qty': qty,
+            'sell_qty': sell_qty,
+            'keep_qty': keep_quantity,
+            'unit_value': item.value,
+            'total_value': sell_value,
+            'obj': item
+        }
+        for (item, qty), sell_qty, sell_value in zip(sellable, sell_qtys, sell_values)
+    ]
     
     # Sort by total value descending
-    sellable_items.sort(key=lambda x: x['total_value'], reverse=True)
+    sellable_items.sort(key=itemgetter('total_value'), reverse=True)
     
     return total_value, sellable_items
 
@@ -82,34 +102,15 @@ def print_sellable_items(character: Character, min_quantity: int = 3, keep_quant
     print("\nBREAKDOWN BY CATEGORY:")
     print(f"{'='*80}")
     
-    equipment_value = 0
-    material_value = 0
-    consumable_value = 0
-    other_value = 0
+    category_values = defaultdict(int)
     
     for item_dict in items:
-        # Find the actual item object
-        item_obj = None
-        for item, qty in character.items.items():
-            if hasattr(item, 'name') and item.name == item_dict['name']:
-                item_obj = item
-                break
-        
-        if item_obj:
-            if hasattr(item_obj, 'slot'):
-                equipment_value += item_dict['total_value']
-            elif hasattr(item_obj, '__class__'):
-                class_name = item_obj.__class__.__name__
-                if 'Material' in class_name:
-                    material_value += item_dict['total_value']
-                elif 'Consumable' in class_name:
-                    consumable_value += item_dict['total_value']
-                else:
-                    other_value += item_dict['total_value']
-            else:
-                other_value += item_dict['total_value']
-        else:
-            other_value += item_dict['total_value']
+        category_values[get_item_category(item_dict['obj'])] += item_dict['total_value']
+    
+    equipment_value = category_values['equipment']
+    material_value = category_values['material']
+    consumable_value = category_values['consumable']
+    other_value = category_values['other']
     
     print(f"Equipment:  {equipment_value:>12,} coins")
     print(f"Materials:  {material_value:>12,} coins")
@@ -122,7 +123,7 @@ def print_sellable_items(character: Character, min_quantity: int = 3, keep_quant
 
 if __name__ == '__main__':
     # Load character
-    character = Character(CHARACTER_EXPORT)
+    character = get_character()
     
     # Calculate and print sellable items (quantity > 2, keeping 1)
     print_sellable_items(character, min_quantity=3, keep_quantity=1)
@@ -23,6 +23,7 @@ from util.my_config_helpers import (
     RUN_SHORTCUT, EXPLORE_BOG_BOTTOM, EXPLORE_UNDERWATER_CAVE,
     RUN_FOR_YOUR_LIFE_STEPS, EXPLORE_BOG_BOTTOM_STEPS
 )
+from functools import lru_cache
 from typing import Union
 
 # ============================================================
@@ -47,6 +48,8 @@ ACCESS_SYRENTHIA = False
 # GEARSETS - PASTE YOUR GEARSET EXPORTS HERE
 # ============================================================
 # Get these from the game: Equipment > Export Gearset
+# Each value is either the export string itself or the path of a .b64 file holding it
+# (relative to this folder, e.g. 'gearsets/gdte.b64'); files are only read when used.
 #
 # Gearset Types:
 #
@@ -105,10 +108,22 @@ LOCATION_SERVICES = {
 # CHARACTER LOADING HELPER
 # ============================================================
 
+# Parsed character, shared by every get_character() call (the UI worker sets this directly)
+_CHARACTER_INSTANCE = None
+
 def get_character():
-    """Load character from export string"""
-    from util.character_export_util import Character
-    return Character(CHARACTER_EXPORT)
+    """Load character from export string (parsed once, then reused)"""
+    global _CHARACTER_INSTANCE
+    if _CHARACTER_INSTANCE is None:
+        from util.character_export_util import Character
+        _CHARACTER_INSTANCE = Character(CHARACTER_EXPORT)
+    return _CHARACTER_INSTANCE
+
+@lru_cache(maxsize=None)
+def get_parsed_gearset(name: str = 'default'):
+    """Decode a gearset from GEARSETS once and reuse it (shared - don't modify)"""
+    from util.gearset_utils import Gearset
+    return Gearset(get_gearset(GEARSETS, name))
 
 def get_agility_level():
     """Get agility level from config or character export"""
@@ -17,6 +17,7 @@ from util.my_config_helpers import (
     RUN_SHORTCUT, EXPLORE_BOG_BOTTOM, EXPLORE_UNDERWATER_CAVE,
     RUN_FOR_YOUR_LIFE_STEPS, EXPLORE_BOG_BOTTOM_STEPS
 )
+from functools import lru_cache
 from typing import Union
 
 # ============================================================
@@ -41,6 +42,8 @@ ACCESS_SYRENTHIA = True
 # GEARSETS - PASTE YOUR GEARSET EXPORTS HERE
 # ============================================================
 # Get these from the game: Equipment > Export Gearset
+# Each value is either the export string itself or the path of a .b64 file holding it
+# (relative to this folder, e.g. 'gearsets/gdte.b64'); files are only read when used.
 # 
 # Gearset Types:
 # 
@@ -70,17 +73,17 @@ ACCESS_SYRENTHIA = True
 # 4. Default to GDTE
 
 GEARSETS = {
-    'GDTE': "H4sIAAAAAAAAA62W227aQBCG38XXGWnPh7xKidDs7ixYGJvapm0U5d075iJS6tKQ0AuMtF6jj/+w45emnek4NY/fXpr5+UTNY7MnLM1D0/aFfjWP4uGyg9dfNk1bNs3j5rIA9IvG3E60XfYn7AtEoaV23kMsNoEx2kCwgaBU5bWT0SjnN83Dpvl+xq6dny+/1dGO+oLj8+XOjDte7c9d98oINI7DuLA9vT684WXkr4/xlm3boW732FXAvG/pB42QlVOkq4eCpYBJRQNSlVC1zVVJK2Vx9yMmzIcbEJdtJ/6A09L6FAIIChGMrIHvqcSCxljIRBmd/g/C7Wmab8Aaz33f9rvttG/HGWxmH7WxIGU2zKbZZykJJJocQ3TGe7NiO/d5OB6H/la009ge+Z/cANeOQ7+dfg5jASEqEioEnwWTaW8BiybItqochClK4d1kE+XhovINbNNM1C2yUcciJe+9TJU9TYunXkPwzkIWtgREouziim7EkW4l23Plpn9TSWm1CyKAUwLBKO8gBmWheI8FvTM2yrsYOIMfIPyRqGGcJ9BOSZ1Ic8iJsXRVgC4S1EqqYvBEVO82rqePOujRZRutA++8AEOJIDpkm0gXhV7JkulujEp0S+eOVPiAQk5PT3igcREp2xKdhOyW3hm+pKIqeJtStUaEnOyKjk5tvpVsZEc+EMjGgCqwT9FzhLPlgnG5oIpkhXWFpFkfS19HkNfEGbqy3S2XZT8o1NEb58Fd0mOTAxRGsGCpJLLJVruu/WdCPQ9D929haqbivOLQXLwpikNTqgZlAtkYvXe4niKfTc57jKvizCMdDku5TkNHE1tFRQcVQCcWxgS2C5NWUKOoPpsQlFt36+vqqKuBxtMyfXdlJkgqRCuTApUxc9EsJ8rx0E1ZCS1sFEavc3SfXPq6XOdpft7O1M/8csKqEAWQLgUwwhcIfGJClWTSUjPl1kn6TL7fM5nrTPiDOi799tDO4CpGrJHzrZdXFM/HN4bM4So258rTxPxlrH2dyr5RLQ9dHdB/P8XWjzy9/gadJmLKUgoAAA==",
-    'Jarvonia': "H4sIAAAAAAAAA62W627aQBCF38W/M9LeL3mVUqHZ3dngYmy6dpJGUd69Yyq1imgaEvoDkNZj83HOmRmeu36hw9zdfnnulqcjdbfdjrB0N10/FvrR3YqbUwWfP2+6vmy6283pAOgHtdzPtF3rE44FotBSO+8hFpvAGG0g2EBQqvLayWiU85vuZtN9v8ehX55OzxrojsaC7el0ZcE7Ph3vh+GFEai1qa1sX19ufuNl5I/38day7VS3OxwqYN719EANsnKKdPVQsBQwqWhAqhKqtrkqaaUs7nrEhHl/AeJaduQXOC2tTyGAoBDByBr4mkosaIyFTJTR6f8g3I7m5QKsdj+O/Xi3nXd9W8Bm9lEbC1Jmw2yafZaSQKLJMURnvDdnbPdjng6HabwU7dj6A/+SC+D6No3b+XFqBYSoSKgQfBZMpr0FLJog26pyEKYohVeTzZSnk8oXsM0L0bDKRgOLlLz3MlX2NK2eeg3BOwtZ2BIQibKLZ3QNG11KtuOWmy+gWhrRds78JexpHvBxhsrWkSnsqWA7jU0SonUFnKjB5YAFfblaOc7nJXh/0ja1ZQbtlNSJNDcAIZtaFaCLBLWSqhg8EdWr0UZ6rz89umxZE/DOCzCUCKJDtpB0UeiVLJmuxqhEl/TjhPvtvO9nkCRZA0ogZMqrbW6F4lmmQixJWV/IXhWpxka8o4uNAVVge6LnVGfLPcf9BlUkKzhCJM35pKJjnz+HIN/UZCjbu/VtrQeFOnrjPLhTaFZhUBjBYUolkU222vNJ8BFhlmka/i1MzVScV5wVt47JojgrpWpQJpCN0XuH54vlo4F5jfGmOAc8rpvvG7aHaewRgksYXeJVF3iOm2ozy2MNCEPZSuMqZ+c/s6m32OowPa7tfpzynpZHXPIOpMtkg+EtHInHEQpuNlsj+KhVVNX7LP8SqmVHjXD4HJ9+e1riAw3U5u2+X8BVjFgjB0uvfxe8CKxhZleLzbnyZDd/WTEfiftrKvOPGb7f/5JtoJmbj4oOKoBOHHUTuAExacX6ieqzCUG58yH5+bzb31jrTa/v+fryE8VQUYVCCgAA",
-    'Jarvonia_short': "H4sIAAAAAAAAE7WW227bOhBFfyXwcwfg/dJfOS6EITm0VcuSj6Q0NYL8e4fJQwsDJ9AB1AfbBC/ywt6zh3o99Ctdl8PXp39eD+v9Rjw6nAnL4cvToR8L/eQJ0ca8ra29Hg99OfLo+D4F9JPm3C/UtUMJxwJRaKmd9xCLTWCMNhBsIChVee1kNMr5Iz/+ePj3GYd+vX887XnM0/U6jR9LK57a9Pg8DG8NheZ5mt8xv719efqNmpF/N6K2vd1UuzMOFTCfe/pBM2TlFOnqoWApYFLRgFQlVG1zVdJKWdxuuAnzZStu23vjDzgtrU8hgKAQwcgaeE0lFjrGQibK6PR+gp5pWbcizs/j2I+nbjn38wo2s9faWJAyG+bUXAtSEkg0OYbojPdmN87b3F9xvm8l7edp7JaXaS4gREVCheCzYEztLWDRBNlWlYMwRSncDXOhPI3lf4AuK9HQBKWB5Uvee5kqO5+a815D8M5CFrYERKLs4m6oZw7vshVznYm6JfOfsv15wJcFKrtMprD9gp03NkmI1hVwogaXAxb0ZTfYgU6bWX9X6TSvC2inpE6kOUSE7H9VgC4S1EqqYvBEVHfjHGlT4D26bFkt8M4LMJQIokN2m3RR6JUsmXZjqkSbEz7hpVsu/QKSJKtDCYRMubnrGiF3TRViScr6QnY3wpnt2qKajQFVYCej53hky0nmFEMVyQouPZJmv8b4yCQ/U20o3al9tUOgUEdvnAf3XnBNOhRGcCGmksgmW+1+DWedpmGruVe8tfvwO84/prFHCC5hdIkvwMBd3FSbGdQaEIaylcZV9vmvgf6HnjVTcV5xKFy7VIriUJSqQZlANkbvHe53PT8yqc874OXS2sptGmjhEqSigwqgE/trApchJq2gRlF9NiEot19XeeTUn3DWYXr5wMwXWl9wzWeQLpMNhl9ymBoMCm43tkbwUauoqvdZ7hecR1jzCeyJr5Vy72796XTv+G3yAqFKGXPl9uwj++9FhJS5RDXZmiqnPRX511DtH6jt8OPZb2+/AEvj6cFACwAA",
-    'Swamp_2light': "H4sIAAAAAAAAA62W227jNhCG30XXGYDnQ16lXghDzjAWqkiuJHc3CPLuHflii8AJ4tS9sA1QI+vzfyD92g0bP6/d4x+v3fZy4u6xOzJS99ANE/Gv7lE9XCZk/fXQDXToHg+XBeBfvNRh5X6fLzgRZGW1DTFCJl/AOesg+cRAzUQbdHYmxEP3cOj+OuM4bC+X7xr5iSfC5eVyZcMnWZ3O4/gmCLws87Kz/Xh7+I1XUT6+xtvH+rn1RxwbYD0O/DcvUE0wbFsEQiJwhSwgNw3N+tqM9lpTuB+xYP3zBsR97CQvCFb7WFICxSmD0y3JNVNE0JyJXdY52P9BuCOv2w1Yy3mahumpX4/DsoGv4qN1HrSuTtis+Kw1g0ZXc8rBxeiu2M5TnZ+f5+lWtNMyPMsvuQFuWOapX3/OC4FSDRkNQqxKyGz0gGQZqm+mJuXIGLybbOU6X1S+gW3dmMddNh5FpBJj1KWJp2X3NFpIMXioylNCZK4hX9EtuPCtZEep3HoD1bYw92uVh4indcSfKzSxjh2Jp0rsdL5oyD4QBNVSqAkJI92tnOTzFrx/0zYv2wo2GG0LWykAo5jaDGDIDK2xaZgiM7e70Sb+qp8RQ/WiCcQQFTguDDmgWMiWDEajqfLdGI35iz6qaJQ8qQIprOBaCYAxNIhR8m0iEbZrNb4TokWk/0IJnxOaJIbkKDmuXlomDYOmilcSGtbuem/i01D/G4L+LCfzSP3T/rbPg0GbowsRwiUmfhdGOSXxKVTYF9/8dfe/I8w2z+NN5Tqv20u/8bTJWdeyYk6gQ0ngVCRI2ltoml3xpTQTrpm+o9R7po+UahozW0lsoyBmocuQTVVQk3XRo2zXWO6O7XsM8+luODyfRu63ealH4Oi8q5Qh5cgSZIeAusq5a6IhmyzZen+t34PZj/SpTEE6BS7shxkZaTQ1C8Yl9jnHGPD6+L8Pw32mz75/9yNOGy+TJLhWrFaDJidFx8oSJ2el6FSzic7aD/4B3Afmf4PtN72/58fbP4BuokAYCgAA",
-    'Swamp_3light': "H4sIAAAAAAAAA6WW2W7bOhCG30XXGYD7klepC2M4HMZCZcmV5PYEQd79jHzRInCCOPWFbYCmzM//QvKl61c+Lt3jt5dufT5x99gdGGv30PVj5f+6R/VwmSHjL7uur7vucXcZgGM/9uPT/sDDETjFqq0KkE3M4KzzgKUU0C0QZeUiF7XrHnbdzzMO/fp8+ZUZZ74MrvgkA+N5GF5lXZ7nad6Avr8+/GEilI/PmbZp+6ntDzg0QDr0/ItnIBMM2xahYq3gSrWA3DQ066kZ7bWu4Ypu4CceK87PtyIWpB83IG7TTvKCYLWPJSVQnEQz3ZJ8ZwpklXNll3UO9n4qOvCy3oA1n8eLncuhn1fwJB5uLmpNTthshaw1g0ZHOeXgYnRXbOeRpuNxGm9FO839Uf7JDXD9PI375fc0V1CqIaNBiKSEzEZJWrUM5JuhpFw1Bu8mW5imi8o3sC0r87DJxoOIVGKMujTxtGyeRgspBg+kfE2IzBTyXT044FiXG6jWmXm/kCwintKAvxdoYh27Kp4qsdP5oiH7UCGolgIlrBjr3cpJPm/B+5u2aV4XsMFoW9hKARjF1GYAQ2ZojU3DFJm53Y028mf9jBjIiyYQQ1TguDDkgGIh22owGl2J78ZozJ/0UUWjZCWCqpDAtRIAY2gQo+TbxFqxXavxlRDNIv0nSvic0CQxJG/7OXlpmTQMmipeSWhYu+u9iU89/RuC/ign01D3T9vbNh8M2hxdiBAuMfGbMMopiU+phX3xzV93/yvCrNM03FSu87I+71ceV0i+ZcWcQIeSwKlYIWlvoWl2xZfSTLhm+opSb5neU6ppzGwlsa0GMQtdlmOYFFCyLnqU7RrL3bF9i2E+3A3742ng/TrNdACOzjuqGVKOLEF2CKhJzl0TTbXJVkv31/otmP3YM/zFA8/L/ke/QmiYsWVJkt1uBFElwEQWTPVETTZv984p8u+uuY+otu18P+C48jxKoImQrAZdnfQeiSVdzkrvK8m9yln7zoXgPrn8H7DtobfPfH/9H/kZizwcCgAA",
-    'Swamp_3light_short': "H4sIAAAAAAAAA6WWyW7jOBCG30XnFMB9yauMG0axWIyFkSWPpEx3EOTdu+RDDwIniDM6WAYoyvz8L6Reu37l89I9/vXarS8X7h67E2PtHrp+rPyre1QP1xky/nro+nroHg/XATj3Yz8+HU88nIFTrNqqANnEDM46D1hKAd0CUVYuclGH7uHQ/fOMQ7++XH9lxpmvgys+ycD4PAxvsi7P8zRvQD/eHv4wEcrX10zbtOPUjiccGiCdev6XZyATDNsWoWKt4Eq1gNw0NOupGe21ruGGbuAnHivOL/ciFqS/70Dcpl3kA8FqH0tKoDiJZroluWcKZJVzZZd1DnY/FZ14We/Amp/Hq53LqZ9X8CQebi5qTU7YbIWsNYNGRznl4GJ0N2zPI03n8zTei3aZ+7P8kzvg+nkaj8vPaa6gVENGgxBJCZmNkrRqGcg3Q0m5agzuJluYpqvKd7AtK/OwycaDiFRijLo08bRsnkYLKQYPpHxNiMwU8q4enHCsyx1U68x8XEgWEU9pwJ8LNLGOXRVPldjpfNGQfagQVEuBElaMdbdyks978P5L2zSvC9hgtC1spQCMYmozgCEztMamYYrM3HajjfxVPyMG8qIJxBAVOC4MOaBYyLYajEZX4t0YjfmLPqpolKxEUBUSuFYCYAwNYpR8m1grtls1vhOiWaT/QgmfE5okhuRtPycvLZOGQVPFKwkNa3e7N/Glp/+HoD/LyTTU49N22eaDQZujCxHCNSZ+E0Y5JfEptbAvvvnb7n9HmHWahrvK9bysL8eVxxWSb1kxJ9ChJHAqVkjaW2iaXfGlNBNumb6j1Humj5RqGjNbSWyrQcxCl+UYJgWUrIseZbvGsju27zHMp7thf74MfFynmU7A0XlHNUPKkSXIDgE1yblroqk22Wppf63fg9mP9CGuQToFLmyHWTXS6NosGJfY5xxjwNvjfx+G+0yfbf8+DjiuPI+SYCIkq0FXJ0VHYomTs1L0SvIi5az94A1gH5j/A7Y99P6ZH2+/AQyX8xcNCgAA",
-    'Diving': "H4sIAAAAAAAAA6WW627bMAyF38W/S0D3S19lGQxKohIjjt3Z7iUo+u6jM2BAkXZN5/yIAYUSvhyeQ/m16RY6zc39j9dmOT9Qc98cCEtz13RDoZfmXtxdKnj9ddd0Zdfc7y4LQC805W6mdq1POBSIQkvtvIdYbAJjtIFgA0Gpymsno1HO75q7XfPrEftuOV/O6mlPQ8HpfPllwT2vDo99/8YINE3jtLL9fLv7i5eRH1/jrWXtWNsD9hUwHzp6ogmycop09VCwFDCpaECqEqq2uSpppSxuO2LCfLwBcXw588HtgsMRrDKhZnIgha1gMGhIIidQhYIWWUaZxBXYhBPdLNuB5uUGqMO5TF3fPZ7a0j11w75d+KwRUope2WhBSB3BFCZNslpAGQyKFKqVZbtwD1N34vIbMLtpHNr5eZwKCFGRUCH4LAwY7ZmqaIJsq8pBmKIUXqE9Dnk8ncbhVrKZ8nj5KzewzQtR385suZ5Dkbz3MlUQlFg46TUE7yxkYUtAJMoubmrsgaM330BVu6Hd9+MTzaACCpeVhKgEpyCrClFKzZmJ0bOWwfrrFHxXMW7+LVhXfuN9e34yZfYoVdYQbfGcVcuRcESgqFpfi6rJqE3KDfRVTD26zKZ34J0XYCgRRIfcQdJFoVeyZNosVCX6IpjCc58yZSgCM5iaHKB3FbxneytfCta6SYmJBf9CCRsDqnUqRc82zpZDxgGDKpIV1hWSRl8h0EOX/w9Bfjoz+9Lu16+1HhTq6I3z4Ni1YOwqjDACtEslkU222uvof0eYZRz7fwvDQ7s47g8Yl3n6FMXuKFUDz3OyHCfvcHuW3mN8JI6z3BciBZX7xGNmjU2VCgLfwII/0uN1f7ZhqE8nTT8+r0l+GPORlmdc8gGky2SD4Zs2Eo8cFJwkWyP4qFVU1fssP/DPcqCJsP8/Pv0Z3zLhE/U0ze2xW8BVjFgje0ivrwReBMDA8qlic648tc0H18d3nP2eynxORcfjH9l6ntGJddJBBdCJXW0CZw2TXvsrqs8mBOW2Zf49lv2LtW56v+fn229wbLoBJgoAAA==",
-    'Diving_short': "H4sIAAAAAAAAA6WW7WrjPBCF78W/O6Dvj97Km8WMpFFi4thd22kbSu99x1lYKNm+Tdf5EYMiiSdnzpnxW9MtdJqbx//emuXyRM1jcyAszUPTDYVem0fxcN3B62+7piu75nF3XQB6pSl3M7Xr/oRDgSi01M57iMUmMEYbCDYQlKq8djIa5fyuedg1P8/Yd8vleldPexoKTpfrLwvueXU49/07I9A0jdPK9uP94Q9eRn58jbdua8faHrCvgPnQ0TNNkJVTpKuHgqWASUUDUpVQtc1VSStlcdsRE+bjHYjj64UvbhccjmCVCTWTAylsBYNBQxI5gSoUtMgyyiRuwCac6G7ZDjQvd0AdLmXq+u58akv33A37duG7RkgpemWjBSF1BFOYNMlqAWUwKFKoVpbtwj1N3Ym334HZTePQzi/jVECIioQKwWdhwGjPVEUTZFtVDsIUpfAG7Tzk8XQah3vJZsrj9a/cwTYvRH07s+V6DkXy3stUQVBi4aTXELyzkIUtAZEou7ipsAeO3nwHVe2Gdt+PzzSDCihcVhKiEpyCrCpEKTVnJkbPWgbrb1PwXcW4+Pdg3fiNz+35yZTZo1RZQ7TFc1YtR8IRgaJqfS2qJqM2KTfQVzH16DKb3oF3XoChRBAdcgVJF4VeyZJps1CV6ItgCs91ypShCMxganKA3lXwnu2tfClY6yYlJhb8CyVsDKjWrhQ92zhbDhkHDKpIVlhXSBp9g0BPXf43BPlpz+xLu1+/1v2gUEdvnAfHrgVjV2GEEaBdKolsstXeRv87wizj2P+/MNy0i+P6gHGZu09R7I5SNXA/J8tx8g63Z+kjxt/EcZbrQqSgcp24zayxqVJB4Aks+CM93tZnG4b6tNP048ua5KcxH2l5wSUfQLpMNhietJG45aDgJNkawUetoqreZ/kX/ywHmgj7f+PTn/FhGVf3tBV5hCy4nIlnSEFTJA8TFdZXF+7SyWgLzggrKk/gEm+D/u3x9pHPfMa3THQ8/haw526dWDEdVACd2N8mcOow6bXSovpsQlBuW/o/Ytk/WOuhj2d+vP8Cd6kfSDAKAAA=",
-    from_to_location_gear_set_name(Location.PORT_SKILDAR, Location.CASBRANTS_GRAVE): "H4sIAAAAAAAAA62W627bOhCE30W/swDvl7zKcSEsyaWtY1lyJTmJEeTdu3KBAoGbxqn7xwJkUvo8nJn1a9MtdJibx/9em+V8pOax2RGW5qHphkIvzaN4uKzg+6+bpiub5nFzuQH0QlPuZmrX9QmHAlFoqZ33EItNYIw2EGwgKFV57WQ0yvlN87Bpvp+w75bz5Vk9bWkoOJ0v3yy45bvDqe/fGIGmaZxWtm9vD7/wMvLlc7x1WTvWdod9Bcy7jp5ogqycIl09FCwFTCoakKqEqm2uSlopi7sfMWHe34A4vpz5we2Cwx6sMqFmciCFrWAwaEgiJ1CFghZZRpnEFdiEE90s247m5Qao3blMXd+dDm3pnrph2y78rBFSil7ZaEFIHcEUJk2yWkAZDIoUqpXlfuGOU3fg5TdgdtM4tPPzOBUQoiKhQvBZGDDaM1XRBNlWlYMwRSm8QjsNeTwcxuFWspnyePkpN7DNC1Hfzmy5nkORvPcyVRCUWDjpNQTvLGRhS0Akyi7edbA7jt58A9UyEbVz5pfwoeYen2eoJkcyxbLpNKfBJgnRugJO1OBywIL++lC/qhyb4Ba8K9/xvi1fZ1DZo1RZM1vxnFnL0XBEoKhaX4uqyai7FBzos7h6dJnN78A7L8BQIogO+SRJF4VeyZLpbqEq0S0BHXHfzvtuBklSsfMTRzLl9fTcCsXVpkIsSVlfyN6ly8Tyf6KLjQHV2lXRs7mz5ehx7KCKZAU7iaTRVwh07PLfIcgPNelLu10/1vWgUEdvnAfHvfBTGBRGgHapJLLJVntdCF8RZhnH/s/CcJUX5xV7xWXupKLYK6Vq4JYnG6P3Dq/nzFcN8x7jQ3EOeFwH4f84PY1DhxBcwugST75gLJhqM8tjDQhD2UrjKnvnH7Opj9hqPz6vYT+OeU/LMy55B9JlssHwUI7ErYSCw2ZrBB+1iqp6n+VvTLXsaCLs/45Pf8SHZVwt1VbkabPgciIeNwVNkTx3VFj/5XChJ6MtOCMs96YWJV53wZcn4Xs+84dS3+9/CtjTzDGkooMKoBOb3gSOIiatWElRfTYhKFf/ofPtL6x10/s9395+AB3VqY5bCgAA",
-    from_to_location_gear_set_name(Location.GRANFIDDICH_SHORES, Location.KELP_FOREST): "H4sIAAAAAAAAA6WW627jOAyF38W/S0D3S19lOzAokUqMOnHGdqctir770llggCLbaTr5EwOKJH85PIfMWzesfFi6+3/euvX1xN19t2ek7q4bjsQv3b26O++Q9beHbqCH7v7hvAD8wnMdFu63/QWPBFlZbUOMkMkXcM46SD4xUDPRBp2dCfGhu3vofj7hOKyv57tG3vGRcH49f7PiTlaPT+P4Lgg8z9O8sf14v/uNV1EeX+Nt2/qp9XscG2DdD/yLZ6gmGLYtAiERuEIWkJuGZn1tRnutKdyOWLA+XoE4vbzKxf2Kx0fwxqVWOYBWvoHDZKGoWsAQJ6uqzrqoC7AZZ75atj0v6xVQ+1eah3F4OvQ0/BqOu36VuyYoJUfjswelbQZHQlp084A6OVQlNa/pduFO83CQ7VdgDvN07JfnaSZQqiGjQYhVOXA2ChVZhuqbqUk5MgYv0J6OdTocpuO1ZAvX6fxTrmBbVuaxX8Ryo4SixBh1aaC4iHA6WkgxeKjKU0JkriHfVNi9RG+5gmqdmfulykukqHXE5wWaq5kdeTGdlTT4oiH7QBBUS6EmJIyXRf2ucmKCa/AufCfndvJcwNSI2lQrbBQls16iEZjBcPOxkWnFmZsUPPJXcY0Yqpg/QAxRgePCkANKJdmSwWg0Vb5ZqMb8RUBVNEreVIEUVnCtBMAYGsQoNjeRCFu7SYlZBP9CCZ8Tmq075Sh2rl7CJkGDpopX4h3Wzl4g8Gmof4egP+2dI/W77WPbDwZtji5ECNIJNiOLMMopsKFQYV9885ct4DvCrNM0/lkYad4UpD7gQpUuREbcQc2C9HX2OccY8HKyfNciHzE+FeeAp2307WhlKCZlr4uRGG2e4XN6ZOKVapRVPitnLwt2G5f5jKuN0/MW7dNUH3l9xrXuQYfKPjkZwZmlB6GSaPmWIWZrsmkxVv0/hlr3PDOOf8dnP+NDmjY79Q1ltqy4PrEMF0JHWqaMSdt/GmnfxVkPwSkvXdIqypfJ//bc+8jn/tDCHx//E3DkRSLIZJNJYIsY3iWJIRZrREnVYnUpmXBbO/iI5X9jbYc+nvnx/i8sjjFnSQoAAA==",
-    from_to_location_gear_set_name(Location.EVERHAVEN, Location.BILGEMONT_PORT): "H4sIAAAAAAAAE7WW247aMBCGX2XFdUfy+dBXKRUa22OICAlNQrdote/eye7FVgih7Cq9IBgfwqf/n9/2y6aZ6DRuvj/9eNlM1zNxa3MgLJtvT5umK/SHO8Tc5mnz2Mt205Qtt7ZvXUB/aMjNSLt5UcKuQBRaauc9xGITGKMNBBsISlVeOxmNcn7Lr99ufl2wbabr+9tyfzr13fvAhPu5s7u07esMQsPQD2+QP1+/PX2AZuTvhaDz3F1fdwdsK2A+NPSbBsjKKdLVQ8FSwKSiAalKqNrmqqSVsriVYBPm41LYee6ZP+C0tD6FAIJCBCNr4DGVWOQYC5koo9NriXmgcVoKOFy6run2u/HQDBPYzC5rY0HKbJhScxVISSDR5BiiM96blSjPQ3PC4bqUsxn6bjc+90MBISoSKgSfBUNqbwGLJsi2qhyEKUrhHchL9xXMkXLflU+AjhNRO8tJLYuXvPcyVXY9za57DcE7C1nYEhCJsot3UAcc6HOYBw7suBRxGoh2Y+Y/ZONzi88jVPaXTGHjBXtubJIQrSvgRA0uByzoy0rGt7RfTPpRnf0wjaCdkjqR5ugQsvNVAbpIUCupisETUV2JsqNFIffosmWlwDsvwFAiiA7ZZdJFoVeyZFqtFivR4lyfqPDGiFyJHeGRhlm8bEt0ErKbs234kYqq4G1K1RoRcrIriTewZ0tB+7bs9vNjXgQKdfTGeXBvDtvkAIURDJ9KIptstfeyvQakfBTqQ9Nd3wmRd+0S2GynlGbHS4Tk+Nzhn4IUoknunuNfIZz6vl0gY81UnFdcfm/GFsYKpWpQJpCN0XuH946+r9XgLdMj1XifOR7n+J77lkZIkYoOKoBObKsJlo/vpBXUKKrPJgTl1krvLaV6lBQ8z9eJfZkIkgrRyqRAZcxsrtWzuRJSVkILG4XRa53St4j6AWJt++d3HfORpmec8gGky2SD4RsOywoGBe88tkbwUauoqvdZ/i9U89DzyzhddxN1E98W2VqiwKwpgBG+QJAsaZVk0rzrKLdWmG8R7T+I8+LbtT9f/wKPMh1FMQsAAA==",
+    'GDTE': "gearsets/gdte.b64",
+    'Jarvonia': "gearsets/jarvonia.b64",
+    'Jarvonia_short': "gearsets/jarvonia_short.b64",
+    'Swamp_2light': "gearsets/swamp_2light.b64",
+    'Swamp_3light': "gearsets/swamp_3light.b64",
+    'Swamp_3light_short': "gearsets/swamp_3light_short.b64",
+    'Diving': "gearsets/diving.b64",
+    'Diving_short': "gearsets/diving_short.b64",
+    from_to_location_gear_set_name(Location.PORT_SKILDAR, Location.CASBRANTS_GRAVE): "gearsets/port_skildar_to_casbrants_grave.b64",
+    from_to_location_gear_set_name(Location.GRANFIDDICH_SHORES, Location.KELP_FOREST): "gearsets/granfiddich_shores_to_kelp_forest.b64",
+    from_to_location_gear_set_name(Location.EVERHAVEN, Location.BILGEMONT_PORT): "gearsets/everhaven_to_bilgemont_port.b64",
 }
 
 # ============================================================
@@ -183,10 +186,22 @@ LOCATION_SERVICES = {
 # CHARACTER LOADING HELPER
 # ============================================================
 
+# Parsed character, shared by every get_character() call (the UI worker sets this directly)
+_CHARACTER_INSTANCE = None
+
 def get_character():
-    """Load character from export string"""
-    from util.character_export_util import Character
-    return Character(CHARACTER_EXPORT)
+    """Load character from export string (parsed once, then reused)"""
+    global _CHARACTER_INSTANCE
+    if _CHARACTER_INSTANCE is None:
+        from util.character_export_util import Character
+        _CHARACTER_INSTANCE = Character(CHARACTER_EXPORT)
+    return _CHARACTER_INSTANCE
+
+@lru_cache(maxsize=None)
+def get_parsed_gearset(name: str = 'default'):
+    """Decode a gearset from GEARSETS once and reuse it (shared - don't modify)"""
+    from util.gearset_utils import Gearset
+    return Gearset(get_gearset(GEARSETS, name))
 
 def get_agility_level():
     """Get agility level from config or character export"""
@@ -4,16 +4,20 @@ Walkscape Graph Optimizer
 Finds optimal routes to visit multiple locations using Dijkstra's algorithm.
 """
 
-import math
+from functools import lru_cache
 import heapq
+from array import array
+from bisect import bisect_left
 from itertools import permutations
-from typing import List, Tuple, Optional, Union, Dict
+from typing import List, Tuple, Optional, Union, Dict, Sequence
 
 # Import constants and utilities from shared modules
 from util.walkscape_constants import *
 from util.gearset_utils import gearset_to_stats, Gearset
+from util.fast_steps import route_steps
 from util.my_config_helpers import (
-    RUN_SHORTCUT, EXPLORE_BOG_BOTTOM, EXPLORE_UNDERWATER_CAVE
+    RUN_SHORTCUT, EXPLORE_BOG_BOTTOM, EXPLORE_UNDERWATER_CAVE,
+    load_gearset_export
 )
 
 # Use strings or Location.NAME.name for the locations. Either of these formats work
@@ -38,28 +42,48 @@ def _build_gear_sets():
     gear_sets = {}
     for name, export_str in my_config.GEARSETS.items():
         if export_str and export_str != "H4sI...":  # Skip placeholder values
-            gear_sets[name] = export_str
+            gear_sets[name] = load_gearset_export(export_str)
     return gear_sets
 
 GEAR_SETS = _build_gear_sets()
 
+@lru_cache(maxsize=None)
+def _parsed_gearset(gearset_name: str) -> Gearset:
+    """Gearset for a GEAR_SETS entry, parsed once per name."""
+    return Gearset(GEAR_SETS[gearset_name])
+
+def _region_key(location):
+    """Cache key for location-aware stats: items only check a location's region tags."""
+    regions = getattr(location, 'regions', None)
+    return tuple(regions) if regions is not None else location
+
+# (gearset_name, region key) -> summed travel stats
+_GEARSET_STATS_CACHE = {}
+
 def get_gearset_stats(gearset_name: str, location: str) -> dict:
-    """Get stats for a gearset at a specific location (for location-aware bonuses)."""
+    """Get stats for a gearset at a specific location (for location-aware bonuses).
+    
+    Results are shared by every location with the same region tags; don't modify them.
+    """
     if gearset_name not in GEAR_SETS:
         return {'we': 0, 'da': 0, 'flat': 0, 'pct': 0}
     
-    export_str = GEAR_SETS[gearset_name]
-    gearset = Gearset(export_str)
-    
-    # Get location region for stat calculation
-    location_region = location
+    key = (gearset_name, _region_key(location))
+    total = _GEARSET_STATS_CACHE.get(key)
+    if total is None:
+        total = _GEARSET_STATS_CACHE[key] = _sum_gearset_stats(gearset_name, location)
+    return total
+
+def _sum_gearset_stats(gearset_name: str, location) -> dict:
+    """Sum a gearset's travel stats at a location, rounded."""
+    gearset = _parsed_gearset(gearset_name)
     
     # Manually sum stats with location parameter
     total = {}
     
     for slot, item in gearset.get_all_items():
         if item:
-            stats = item.attr(Skill.TRAVEL, location=location_region)
+            stats = item.attr(Skill.TRAVEL, location=location)
             for stat_name, stat_value in stats.items():
                 total[stat_name] = total.get(stat_name, 0.0) + stat_value
     
@@ -69,51 +93,63 @@ def get_gearset_stats(gearset_name: str, location: str) -> dict:
     
     return total
 
+# Route requirement flags, as tested by select_gear() / gearset_meets_requirements()
+REQ_DIVING = 1
+REQ_2_LIGHTS = 2
+REQ_3_LIGHTS = 4
+REQ_SKIS = 8
+
+@lru_cache(maxsize=None)
+def requirement_mask(req) -> int:
+    """Reduce a route's requirements (string or tuple) to REQ_* flags."""
+    mask = 0
+    if 'diving_gear' in req or 'expert_diving_gear' in req or 'advanced_diving_gear' in req:
+        mask |= REQ_DIVING
+    if '2_light_sources' in req:
+        mask |= REQ_2_LIGHTS
+    if '3_light_sources' in req:
+        mask |= REQ_3_LIGHTS
+    if 'skis' in req:
+        mask |= REQ_SKIS
+    return mask
+
+def _gearset_capabilities(gearset_name: str) -> Tuple[int, int, int]:
+    """Count a gearset's (diving gear items, unique light sources, skis items)."""
+    diving_count = 0
+    seen_lights = set()
+    skis_count = 0
+    for slot, item in _parsed_gearset(gearset_name).get_all_items():  # Unpack tuple
+        if item and hasattr(item, 'keywords'):
+            keywords = [kw.lower() for kw in item.keywords]
+            if any('diving gear' in kw for kw in keywords):
+                diving_count += 1
+            if any('light source' in kw for kw in keywords):
+                # Count unique light sources
+                seen_lights.add(item.name)
+            if any('skis' in kw for kw in keywords):
+                skis_count += 1
+    return diving_count, len(seen_lights), skis_count
+
+# Gearset name -> (diving gear items, unique light sources, skis items), counted once at import
+GEARSET_CAPS = {gearset_name: _gearset_capabilities(gearset_name) for gearset_name in GEAR_SETS}
+
 def gearset_meets_requirements(gearset_name: str, requirements: str) -> bool:
     """Check if a gearset meets route requirements (diving gear, light sources, etc)."""
     if not requirements or gearset_name not in GEAR_SETS:
         return True
     
-    export_str = GEAR_SETS[gearset_name]
-    gearset = Gearset(export_str)
-    items = gearset.get_all_items()  # Returns list of (slot, item) tuples
-    
-    # Check diving gear requirement (need 3 diving gear items)
-    if 'diving_gear' in requirements or 'expert_diving_gear' in requirements or 'advanced_diving_gear' in requirements:
-        diving_count = 0
-        for slot, item in items:  # Unpack tuple
-            if item and hasattr(item, 'keywords'):
-                if any('diving gear' in kw.lower() for kw in item.keywords):
-                    diving_count += 1
-        if diving_count < 3:
-            return False
+    req_mask = requirement_mask(requirements)
+    diving_count, light_count, skis_count = GEARSET_CAPS[gearset_name]
     
-    # Check light source requirements
-    if '2_light_sources' in requirements or '3_light_sources' in requirements:
-        light_count = 0
-        seen_lights = set()
-        for slot, item in items:  # Unpack tuple
-            if item and hasattr(item, 'keywords'):
-                if any('light source' in kw.lower() for kw in item.keywords):
-                    # Count unique light sources
-                    if item.name not in seen_lights:
-                        light_count += 1
-                        seen_lights.add(item.name)
-        
-        required_lights = 3 if '3_light_sources' in requirements else 2
+    # Need 3 diving gear items
+    if req_mask & REQ_DIVING and diving_count < 3:
+        return False
+    if req_mask & (REQ_2_LIGHTS | REQ_3_LIGHTS):
+        required_lights = 3 if req_mask & REQ_3_LIGHTS else 2
         if light_count < required_lights:
             return False
-    
-    # Check skis requirement
-    if 'skis' in requirements:
-        has_skis = False
-        for slot, item in items:  # Unpack tuple
-            if item and hasattr(item, 'keywords'):
-                if any('skis' in kw.lower() for kw in item.keywords):
-                    has_skis = True
-                    break
-        if not has_skis:
-            return False
+    if req_mask & REQ_SKIS and not skis_count:
+        return False
     
     return True
 
@@ -130,8 +166,8 @@ SHORTCUTS = {
 LOCATION_SERVICES = my_config.LOCATION_SERVICES
 
 # Build service location lists
-def get_service_locations(category: ServiceCategory, min_tier: ServiceTier = ServiceTier.BASIC) -> List[str]:
-    """Get all unlocked locations with this service at minimum tier."""
+def _scan_service_locations(category: ServiceCategory, min_tier: ServiceTier) -> List[str]:
+    """Scan LOCATION_SERVICES for unlocked locations with this service at minimum tier."""
     locations = []
     for loc, services in LOCATION_SERVICES.items():
         if category in services:
@@ -142,6 +178,35 @@ def get_service_locations(category: ServiceCategory, min_tier: ServiceTier = Ser
                 locations.append(loc_name)
     return locations
 
+# (category, min_tier) -> service location names, scanned once at import
+_SERVICE_LOCATION_CACHE = {
+    (category, tier): _scan_service_locations(category, tier)
+    for category in ServiceCategory
+    for tier in ServiceTier
+}
+
+def get_service_locations(category: ServiceCategory, min_tier: ServiceTier = ServiceTier.BASIC) -> List[str]:
+    """Get all unlocked locations with this service at minimum tier (shared list, don't modify)."""
+    return _SERVICE_LOCATION_CACHE[(category, min_tier)]
+
+# Dense id per service category, for visited-service bitmasks
+SERVICE_CATEGORY_IDS = {category: i for i, category in enumerate(ServiceCategory)}
+
+# Location name -> LOCATION_SERVICES key
+_SERVICE_LOCATION_BY_NAME = {
+    (loc.name if hasattr(loc, 'name') else str(loc)): loc
+    for loc in reversed(list(LOCATION_SERVICES))
+}
+
+# Location name -> ids of its unlocked service categories
+NODE_SERVICES = {
+    loc_name: [
+        SERVICE_CATEGORY_IDS[category]
+        for category, (tier, unlocked) in LOCATION_SERVICES[loc].items() if unlocked
+    ]
+    for loc_name, loc in _SERVICE_LOCATION_BY_NAME.items()
+}
+
 ALL_BANKS = get_service_locations(ServiceCategory.BANK)
 ALL_TRINKETRY = get_service_locations(ServiceCategory.TRINKETRY)
 
@@ -173,6 +238,26 @@ SWAMP_LOCATIONS = {
     Location.BOG_BOTTOM.name, Location.HALFMAW_HIDEOUT.name
 }
 
+# (prefix, category, tier) for every service prefix, longest first (advanced "TA:" before "T:")
+_PREFIX_MAP = tuple(sorted(
+    [(ServicePrefix[cat.name].value[:-1] + "A:", cat, ServiceTier.ADVANCED) for cat in ServiceCategory]
+    + [(ServicePrefix[cat.name].value, cat, ServiceTier.BASIC) for cat in ServiceCategory],
+    key=lambda entry: -len(entry[0])
+))
+
+def parse_services(dest_str: str) -> Tuple[List[Tuple[ServiceCategory, ServiceTier]], str]:
+    """Extract service requirements and clean destination. Returns (services_needed, clean_dest)."""
+    services = []
+    current = dest_str
+    while True:
+        for prefix, category, tier in _PREFIX_MAP:
+            if current.startswith(prefix):
+                services.append((category, tier))
+                current = current[len(prefix):]
+                break
+        else:
+            return services, current
+
 def to_str(loc: Union[Location, str, None]) -> Optional[str]:
     """Convert Location enum or string to string."""
     if loc is None:
@@ -210,16 +295,24 @@ def calc_steps(base: int, gear: str, location: str = None) -> int:
         else:
             # For shortcuts like 'Ring', return base steps
             return base
-    
-    # Travel formula confirmed against official Walkscape tool:
-    # Base efficiency is 200% (2.0) for traveling, NO WE cap
-    eff = 2.00 + LEVEL_WE + g.get('work_efficiency', 0.0)
-    adjusted = base / eff
-    per_action = adjusted / 10.0
-    per_action = per_action * (1 + g.get('steps_percent', 0.0)) + g.get('steps_add', 0)
-    per_action = max(10, math.ceil(per_action))
-    expected_paid_nodes = 10.0 / (1 + g.get('double_action', 0.0))
-    return math.ceil(expected_paid_nodes * per_action)
+    return steps_for_stats(base, g)
+
+def stat_vector(g: dict) -> Tuple[float, float, float, float]:
+    """Resolved gearset stats as (work_efficiency, double_action, steps_add, steps_percent),
+    in route_steps() argument order."""
+    return (
+        g.get('work_efficiency', 0.0), g.get('double_action', 0.0),
+        g.get('steps_add', 0), g.get('steps_percent', 0.0)
+    )
+
+def travel_stat_vector(gear: str, location) -> Tuple[float, float, float, float]:
+    """A gearset's stat_vector() at a location."""
+    return stat_vector(get_gearset_stats(gear, location))
+
+def steps_for_stats(base: int, g: dict) -> int:
+    """Calculate expected steps with DA for already-resolved gearset stats."""
+    # Travel formula (confirmed against official Walkscape tool) lives in route_steps()
+    return route_steps(base, *stat_vector(g), LEVEL_WE)
 
 def find_breakpoint(normal: str, short: str) -> int:
     """Binary search for gear breakpoint.
@@ -235,11 +328,15 @@ def find_breakpoint(normal: str, short: str) -> int:
     else:
         location = Location.TRELLIN  # Representative GDTE location
     
+    # Stats don't depend on the distance, so resolve them once for the whole search
+    normal_stats = get_gearset_stats(normal, location)
+    short_stats = get_gearset_stats(short, location)
+    
     lo, hi = 100, 3000
     while hi - lo > 1:
         mid = (lo + hi) // 2
-        normal_steps = calc_steps(mid, normal, location=location)
-        short_steps = calc_steps(mid, short, location=location)
+        normal_steps = steps_for_stats(mid, normal_stats)
+        short_steps = steps_for_stats(mid, short_stats)
         
         if short_steps < normal_steps:
             lo = mid
@@ -260,24 +357,30 @@ def _calculate_breakpoints():
 
 BREAKPOINTS = _calculate_breakpoints()
 
-def select_gear(from_loc: str, to_loc: str, req: str, dist: int) -> str:
-    """Select optimal gear for route, validating that it meets requirements."""
-    # Check for custom from/to location gearsets first
-    # from_loc and to_loc are already Location enums when called from _build()
-    # Convert them to proper format for the custom gear name lookup
-    if hasattr(from_loc, 'name') and hasattr(to_loc, 'name'):
-        # They're Location enums, use them directly
-        custom_gear_name = my_config.from_to_location_gear_set_name(from_loc, to_loc)
-        if custom_gear_name in GEAR_SETS:
-            # Validate it meets requirements
-            if gearset_meets_requirements(custom_gear_name, req):
-                return custom_gear_name
-            # If custom gearset doesn't meet requirements, fall through to automatic selection
-    
-    # Convert to strings for region checks
-    from_str = from_loc.name if hasattr(from_loc, 'name') else str(from_loc)
-    to_str = to_loc.name if hasattr(to_loc, 'name') else str(to_loc)
-    
+# Requirements string standing in for each flag combination when filling GEAR_TABLE
+_REQ_FLAG_NAMES = ((REQ_DIVING, 'diving_gear'), (REQ_2_LIGHTS, '2_light_sources'),
+                   (REQ_3_LIGHTS, '3_light_sources'), (REQ_SKIS, 'skis'))
+
+# Gear region of each starting location; earlier sets win, matching the checks in _select_gear_auto()
+REGION_SYRENTHIA, REGION_JARVONIA, REGION_SWAMP, REGION_OTHER = range(4)
+_REGION_OF = {}
+for _region, _locations in ((REGION_SWAMP, SWAMP_LOCATIONS), (REGION_JARVONIA, JARVONIA_LOCATIONS),
+                            (REGION_SYRENTHIA, SYRENTHIA_LOCATIONS)):
+    _REGION_OF.update(dict.fromkeys(_locations, _region))
+
+# Gearsets whose long/short variant is picked by distance
+BREAKPOINT_GEARS = tuple(BREAKPOINTS)
+
+def length_mask(dist: int) -> int:
+    """Bit i set when dist is at or past BREAKPOINT_GEARS[i]'s breakpoint (long variant)."""
+    mask = 0
+    for i, gear_name in enumerate(BREAKPOINT_GEARS):
+        if dist >= BREAKPOINTS[gear_name]:
+            mask |= 1 << i
+    return mask
+
+def _select_gear_auto(region: int, req: str, dist: int) -> str:
+    """Automatic gear choice from requirements, starting region and distance."""
     # By requirement - validate that selected gearset actually meets requirements
     if 'diving_gear' in req or 'expert_diving_gear' in req or 'advanced_diving_gear' in req:
         gear_name = 'Diving'
@@ -313,7 +416,7 @@ def select_gear(from_loc: str, to_loc: str, req: str, dist: int) -> str:
             return 'Jarvonia'
     
     # By region (use starting location's gear)
-    if from_str in SYRENTHIA_LOCATIONS:
+    if region == REGION_SYRENTHIA:
         gear_name = 'Diving'
         if 'Diving' in BREAKPOINTS:
             gear_name = 'Diving' if dist >= BREAKPOINTS['Diving'] else 'Diving_short'
@@ -321,7 +424,7 @@ def select_gear(from_loc: str, to_loc: str, req: str, dist: int) -> str:
             return gear_name
         return 'Diving' if 'Diving' in GEAR_SETS else 'GDTE'
     
-    if from_str in JARVONIA_LOCATIONS:
+    if region == REGION_JARVONIA:
         gear_name = 'Jarvonia'
         if 'Jarvonia' in BREAKPOINTS:
             gear_name = 'Jarvonia' if dist >= BREAKPOINTS['Jarvonia'] else 'Jarvonia_short'
@@ -329,7 +432,7 @@ def select_gear(from_loc: str, to_loc: str, req: str, dist: int) -> str:
             return gear_name
         return 'Jarvonia' if 'Jarvonia' in GEAR_SETS else 'GDTE'
     
-    if from_str in SWAMP_LOCATIONS:
+    if region == REGION_SWAMP:
         if 'Swamp_2light' in GEAR_SETS:
             return 'Swamp_2light'
     
@@ -340,95 +443,347 @@ def select_gear(from_loc: str, to_loc: str, req: str, dist: int) -> str:
             return gear_name
     return 'GDTE' if 'GDTE' in GEAR_SETS else 'default'
 
+def _build_gear_table() -> dict:
+    """Run _select_gear_auto() once per (region, requirement flags, length mask) combination.
+    
+    Its choice only depends on those discrete inputs, so one representative
+    requirements string and distance per combination covers every route.
+    """
+    # One distance below every breakpoint, then one at each breakpoint
+    distances = [0] + sorted(set(BREAKPOINTS.values()))
+    table = {}
+    for req_mask in range(REQ_SKIS << 1):
+        req = ','.join(name for flag, name in _REQ_FLAG_NAMES if req_mask & flag)
+        for region in (REGION_SYRENTHIA, REGION_JARVONIA, REGION_SWAMP, REGION_OTHER):
+            for dist in distances:
+                table[(region, req_mask, length_mask(dist))] = _select_gear_auto(region, req, dist)
+    return table
+
+def select_gear(from_loc: str, to_loc: str, req: str, dist: int) -> str:
+    """Select optimal gear for route, validating that it meets requirements."""
+    # Check for custom from/to location gearsets first
+    # from_loc and to_loc are already Location enums when called from _build()
+    # Convert them to proper format for the custom gear name lookup
+    if hasattr(from_loc, 'name') and hasattr(to_loc, 'name'):
+        # They're Location enums, use them directly
+        custom_gear_name = my_config.from_to_location_gear_set_name(from_loc, to_loc)
+        if custom_gear_name in GEAR_SETS:
+            # Validate it meets requirements
+            if gearset_meets_requirements(custom_gear_name, req):
+                return custom_gear_name
+            # If custom gearset doesn't meet requirements, fall through to automatic selection
+    
+    # Convert to strings for region checks
+    from_str = from_loc.name if hasattr(from_loc, 'name') else str(from_loc)
+    
+    return GEAR_TABLE[(_REGION_OF.get(from_str, REGION_OTHER), requirement_mask(req), length_mask(dist))]
+
+# (region, requirement flags, length mask) -> automatic gear choice
+GEAR_TABLE = _build_gear_table()
+
+# Bits reserved for the node id in _dijkstra()'s packed heap keys
+NODE_ID_BITS = 20
+NODE_ID_MASK = (1 << NODE_ID_BITS) - 1
+
+def _dijkstra(indptr: Sequence[int], indices: Sequence[int], weights: Sequence[int], src: int, dst: int) -> Tuple[list, List[int], List[int]]:
+    """Dijkstra over a CSR graph of integer node ids, stopping once dst is settled.
+    
+    Heap entries are single ints packing (steps << NODE_ID_BITS) | node, which
+    order the same as (steps, node) tuples but compare without tuple overhead.
+    Step weights must be integers.
+    
+    Returns:
+        (dist, prev, prev_edge) lists indexed by node id; prev is the predecessor
+        node and prev_edge the CSR slot of the edge taken from it, -1 where unset
+    """
+    inf = float('inf')
+    dist = [inf] * (len(indptr) - 1)
+    prev = [-1] * (len(indptr) - 1)
+    prev_edge = [-1] * (len(indptr) - 1)
+    dist[src] = 0
+    pq = [src]
+    
+    while pq:
+        key = heapq.heappop(pq)
+        d = key >> NODE_ID_BITS
+        u = key & NODE_ID_MASK
+        if u == dst:
+            break
+        if d > dist[u]:
+            continue
+        
+        for e in range(indptr[u], indptr[u + 1]):
+            v = indices[e]
+            alt = d + weights[e]
+            if alt < dist[v]:
+                dist[v] = alt
+                prev[v] = u
+                prev_edge[v] = e
+                heapq.heappush(pq, (alt << NODE_ID_BITS) | v)
+    
+    return dist, prev, prev_edge
+
+def _held_karp(start_costs: List[int], costs: List[List[int]], end_costs: List[int]) -> Tuple[int, Optional[List[int]]]:
+    """Cheapest order to visit every destination once, by Held-Karp DP over visited-set bitmasks.
+    
+    O(k^2 * 2^k) instead of trying all k! orders. Among equally cheap orders the
+    lexicographically smallest is returned, i.e. the one a permutations() scan
+    keeping the first strict improvement would find.
+    
+    Args:
+        start_costs: Steps from the start to each destination
+        costs: costs[i][j] is steps from destination i to destination j
+        end_costs: Steps from each destination to the end (0 if there is no end)
+    
+    Returns:
+        (total_steps, order of destination indices), or (inf, None) if no order is finite
+    """
+    inf = float('inf')
+    k = len(start_costs)
+    full = (1 << k) - 1
+    # finish[mask][i]: cheapest way to visit the rest after visiting mask, standing at i
+    finish = [None] * (full + 1)
+    finish[full] = list(end_costs)
+    for mask in range(full - 1, 0, -1):
+        row = [inf] * k
+        for i in range(k):
+            if not mask & (1 << i):
+                continue
+            cost_i = costs[i]
+            best = inf
+            for j in range(k):
+                if not mask & (1 << j):
+                    candidate = cost_i[j] + finish[mask | (1 << j)][j]
+                    if candidate < best:
+                        best = candidate
+            row[i] = best
+        finish[mask] = row
+    
+    total, first = inf, None
+    for j in range(k):
+        candidate = start_costs[j] + finish[1 << j][j]
+        if candidate < total:
+            total, first = candidate, j
+    if first is None:
+        return inf, None
+    
+    # Walk forward taking the smallest index that stays on an optimal tour
+    order = [first]
+    mask = 1 << first
+    while mask != full:
+        i = order[-1]
+        for j in range(k):
+            if not mask & (1 << j) and costs[i][j] + finish[mask | (1 << j)][j] == finish[mask][i]:
+                break
+        order.append(j)
+        mask |= 1 << j
+    return total, order
+
 class Graph:
     def __init__(self, enable_ring=True):
-        self.edges = {}
         self.enable_ring = enable_ring
+        # All-pairs shortest steps / predecessor rows by node id, filled by _all_pairs()
+        self.dist = None
+        self.prev = None
+        self.prev_edge = None
+        # Per-graph memo of rebuilt paths, keyed on (src_id, dst_id)
+        self._shortest_path = lru_cache(maxsize=None)(self._shortest_path_ids)
         self._build()
     
     def _build(self):
         """Build bidirectional graph."""
+        # {from: {to: (steps, gear, base)}} while building; flattened to CSR arrays at the end
+        edges = {}
+        
+        # Pick gear for both directions of every route first (the branchy part)
+        routes = []
         for (a, b), data in RAW_ROUTES.items():
             dist = data['distance']
             req = data.get('requires', '')
-            
+            routes.append((a, b, dist, select_gear(a, b, req, dist), select_gear(b, a, req, dist)))
+        
+        # Then the step arithmetic in one sweep, using each direction's starting location for stats
+        route_steps_both = [
+            (
+                route_steps(dist, *travel_stat_vector(gear_ab, a), LEVEL_WE),
+                route_steps(dist, *travel_stat_vector(gear_ba, b), LEVEL_WE),
+            )
+            for a, b, dist, gear_ab, gear_ba in routes
+        ]
+        
+        for (a, b, dist, gear_ab, gear_ba), (steps_ab, steps_ba) in zip(routes, route_steps_both):
             # Convert Location enums to strings for graph keys
             a_str = a.name if hasattr(a, 'name') else str(a)
             b_str = b.name if hasattr(b, 'name') else str(b)
             
-            # Forward direction
-            gear_ab = select_gear(a, b, req, dist)
-            steps_ab = calc_steps(dist, gear_ab, location=a)  # Use starting location for stats
-            
-            # Reverse direction
-            gear_ba = select_gear(b, a, req, dist)
-            steps_ba = calc_steps(dist, gear_ba, location=b)  # Use starting location for stats
+            if a_str not in edges:
+                edges[a_str] = {}
+            if b_str not in edges:
+                edges[b_str] = {}
             
-            if a_str not in self.edges:
-                self.edges[a_str] = {}
-            if b_str not in self.edges:
-                self.edges[b_str] = {}
-            
-            self.edges[a_str][b_str] = {'steps': steps_ab, 'gear': gear_ab, 'base': dist}
-            self.edges[b_str][a_str] = {'steps': steps_ba, 'gear': gear_ba, 'base': dist}
-
-            # if Location.OLD_ARENA_RUINS.name in [a,b] and Location.HALFMAW_HIDEOUT.name in [a,b]:
-            #     print("--GOTHERE--")
-            #     print(a)
-            #     print(b)
-            #     print(self.edges[a][b])
-            #     print(self.edges[b][a]) 
+            edges[a_str][b_str] = (steps_ab, gear_ab, dist)
+            edges[b_str][a_str] = (steps_ba, gear_ba, dist)
         
         # Add shortcuts (only if shorter than existing route)
         for (a, b, shortcut_name, unlocked), steps in SHORTCUTS.items():
             if unlocked:
-                if a not in self.edges:
-                    self.edges[a] = {}
+                if a not in edges:
+                    edges[a] = {}
                 # Only add shortcut if it's shorter than existing route or no route exists
-                if b not in self.edges[a] or steps < self.edges[a][b]['steps']:
-                    self.edges[a][b] = {'steps': steps, 'gear': shortcut_name, 'base': steps}
+                if b not in edges[a] or steps < edges[a][b][0]:
+                    edges[a][b] = (steps, shortcut_name, steps)
         
         # Add Ring of Homesickness teleport from all locations
         if self.enable_ring:
-            for loc in self.edges.keys():
+            for loc in edges.keys():
                 if loc != RING_TELEPORT_TARGET:
-                    if loc not in self.edges:
-                        self.edges[loc] = {}
-                    self.edges[loc][RING_TELEPORT_TARGET] = {'steps': 0, 'gear': 'Ring', 'base': 0}
+                    if loc not in edges:
+                        edges[loc] = {}
+                    edges[loc][RING_TELEPORT_TARGET] = (0, 'Ring', 0)
+        
+        self._build_csr(edges)
     
-    def dijkstra(self, start: str, end: str) -> Tuple[List[str], int]:
-        """Find shortest path between two locations."""
-        if start not in self.edges or end not in self.edges:
-            return [], float('inf')
+    def _build_csr(self, edges: dict):
+        """Flatten {from: {to: (steps, gear, base)}} into CSR arrays over integer node ids.
         
-        dist = {start: 0}
-        prev = {}
-        pq = [(0, start)]
+        Location-name nodes get ids in name order, so the packed (steps, id) heap
+        keys in _dijkstra() break ties exactly like comparing (steps, name) tuples.
+        Each node's out-edges occupy slots indptr[u]:indptr[u+1], sorted by target id
+        (see edge_slot()); per-slot data lives in parallel typed arrays, with gear
+        names interned in self.gear_names.
+        """
+        nodes = set(edges)
+        for neighbors in edges.values():
+            nodes.update(neighbors)
+        names = sorted(node for node in nodes if isinstance(node, str))
+        # Non-string nodes (shortcut / ring endpoints kept as LocationInfo) go last
+        others = sorted((node for node in nodes if not isinstance(node, str)), key=str)
+        self.id_to_name = names + others
+        self.name_to_id = {node: i for i, node in enumerate(self.id_to_name)}
         
-        while pq:
-            d, u = heapq.heappop(pq)
-            if u == end:
-                break
-            if d > dist.get(u, float('inf')):
-                continue
-            
-            for v, edge in self.edges.get(u, {}).items():
-                alt = d + edge['steps']
-                if alt < dist.get(v, float('inf')):
-                    dist[v] = alt
-                    prev[v] = u
-                    heapq.heappush(pq, (alt, v))
+        self.gear_names = []
+        gear_ids = {}
+        indptr = array('i', [0])
+        indices = array('i')
+        weights = array('i')
+        edge_gear = array('H')
+        edge_base = array('i')
+        for node in self.id_to_name:
+            out_edges = sorted(
+                (self.name_to_id[neighbor], edge) for neighbor, edge in edges.get(node, {}).items()
+            )
+            for v, (steps, gear, base) in out_edges:
+                if gear not in gear_ids:
+                    gear_ids[gear] = len(self.gear_names)
+                    self.gear_names.append(gear)
+                indices.append(v)
+                weights.append(steps)
+                edge_gear.append(gear_ids[gear])
+                edge_base.append(base)
+            indptr.append(len(indices))
+        self._indptr, self._indices, self._weights = indptr, indices, weights
+        self._edge_gear, self._edge_base = edge_gear, edge_base
+        # Per CSR slot, whether the edge is a Ring of Homesickness teleport
+        ring_gear = gear_ids.get('Ring', -1)
+        self._edge_is_ring = [gear == ring_gear for gear in edge_gear]
+    
+    def has_location(self, loc) -> bool:
+        """Whether loc is a graph node with at least one outgoing edge."""
+        u = self.name_to_id.get(loc)
+        return u is not None and self._indptr[u + 1] > self._indptr[u]
+    
+    def edge_slot(self, a, b) -> int:
+        """CSR slot of the a -> b edge (binary search over a's sorted targets), or -1."""
+        u = self.name_to_id.get(a)
+        v = self.name_to_id.get(b)
+        if u is None or v is None:
+            return -1
+        lo, hi = self._indptr[u], self._indptr[u + 1]
+        slot = bisect_left(self._indices, v, lo, hi)
+        return slot if slot < hi and self._indices[slot] == v else -1
+    
+    def edge(self, a, b) -> Tuple[str, int, int]:
+        """(gear, steps, base distance) of the a -> b edge."""
+        slot = self.edge_slot(a, b)
+        if slot < 0:
+            raise KeyError((a, b))
+        return self.gear_names[self._edge_gear[slot]], self._weights[slot], self._edge_base[slot]
+    
+    def _all_pairs(self):
+        """Run _dijkstra() to completion from every node once, filling self.dist, self.prev and self.prev_edge.
+        
+        Row src of each is that source's steps / predecessor / incoming CSR slot per
+        node id; paths are rebuilt from them only when a route actually needs them.
+        """
+        if self.dist is not None:
+            return
+        rows = [
+            _dijkstra(self._indptr, self._indices, self._weights, src, -1)
+            for src in range(len(self.id_to_name))
+        ]
+        self.dist = [dist for dist, _, _ in rows]
+        self.prev = [prev for _, prev, _ in rows]
+        self.prev_edge = [prev_edge for _, _, prev_edge in rows]
+    
+    def steps_between(self, start: str, end: str) -> int:
+        """Shortest-path steps between two locations, without building the path.
         
-        if end not in prev:
-            return [], float('inf')
+        Same conventions as dijkstra(): inf if unreachable or if start == end.
+        """
+        if not self.has_location(start) or not self.has_location(end):
+            return float('inf')
+        self._all_pairs()
+        src = self.name_to_id[start]
+        dst = self.name_to_id[end]
+        if self.prev[src][dst] < 0:
+            return float('inf')
+        return self.dist[src][dst]
+    
+    def _shortest_path_ids(self, src: int, dst: int) -> Tuple[tuple, int, int]:
+        """Rebuild the src -> dst path from the predecessor tables (memoized per graph as _shortest_path).
+        
+        Returns (path, steps, ring_uses); ring_uses counts Ring teleport edges on the path.
+        """
+        self._all_pairs()
+        prev = self.prev[src]
+        prev_edge = self.prev_edge[src]
+        
+        if prev[dst] < 0:
+            return (), float('inf'), 0
         
         path = []
-        u = end
-        while u in prev:
-            path.append(u)
+        ring_uses = 0
+        u = dst
+        while prev[u] >= 0:
+            path.append(self.id_to_name[u])
+            ring_uses += self._edge_is_ring[prev_edge[u]]
             u = prev[u]
-        path.append(start)
-        return path[::-1], dist[end]
+        path.append(self.id_to_name[src])
+        return tuple(reversed(path)), self.dist[src][dst], ring_uses
+    
+    def _min_steps_into(self, end: str) -> int:
+        """Fewest steps from any other location to end (inf if it can't be reached)."""
+        if not self.has_location(end):
+            return float('inf')
+        self._all_pairs()
+        dst = self.name_to_id[end]
+        return min(
+            (dist[dst] for src, dist in enumerate(self.dist) if src != dst),
+            default=float('inf')
+        )
+    
+    def shortest_path(self, start: str, end: str) -> Tuple[List[str], int, int]:
+        """Like dijkstra(), also returning how many Ring teleports the path uses."""
+        if not self.has_location(start) or not self.has_location(end):
+            return [], float('inf'), 0
+        
+        path, steps, ring_uses = self._shortest_path(self.name_to_id[start], self.name_to_id[end])
+        return list(path), steps, ring_uses
+    
+    def dijkstra(self, start: str, end: str) -> Tuple[List[str], int]:
+        """Find shortest path between two locations."""
+        path, steps, _ = self.shortest_path(start, end)
+        return path, steps
     
     def find_tour(self, start: Union[Location, str], dests: List[Union[Location, str]], end: Union[Location, str, None] = None) -> Tuple[List[str], int, int, dict]:
         """Find optimal order to visit all destinations. Returns (route, steps, ring_uses, service_visits).
@@ -443,67 +798,66 @@ class Graph:
         end = to_str(end)
         dests = to_str_list(dests)
         
-        # Parse service requirements from destinations
-        def parse_services(dest_str):
-            """Extract service requirements and clean destination. Returns (services_needed, clean_dest)."""
-            services = []
-            current = dest_str
-            # Build prefix map using reflection
-            prefix_map = {ServicePrefix[cat.name].value: cat for cat in ServiceCategory}
-            while True:
-                matched = False
-                for prefix, category in prefix_map.items():
-                    # Check for advanced variant (e.g., "TA:")
-                    advanced_prefix = prefix[:-1] + "A:"
-                    if current.startswith(advanced_prefix):
-                        services.append((category, ServiceTier.ADVANCED))
-                        current = current[len(advanced_prefix):]
-                        matched = True
-                        break
-                    elif current.startswith(prefix):
-                        services.append((category, ServiceTier.BASIC))
-                        current = current[len(prefix):]
-                        matched = True
-                        break
-                if not matched:
-                    break
-            return services, current
-        
         # Parse all destinations
         dest_info = [parse_services(d) for d in dests]
         clean_dests = [dest for _, dest in dest_info]
         
         best_route, best_steps, best_rings, best_service_visits = None, float('inf'), 0, {}
         
-        for perm in permutations(clean_dests):
+        if clean_dests and not any(services for services, _ in dest_info):
+            # No service stops: a pure shortest-tour problem, solved exactly by Held-Karp
+            start_costs = [self.steps_between(start, dest) for dest in clean_dests]
+            costs = [[self.steps_between(a, b) for b in clean_dests] for a in clean_dests]
+            end_costs = [
+                self.steps_between(dest, end) if end and dest != end else 0
+                for dest in clean_dests
+            ]
+            best_steps, order = _held_karp(start_costs, costs, end_costs)
+            if order is not None:
+                route = [start]
+                ring_uses = 0
+                for dest in [clean_dests[i] for i in order] + ([end] if end else []):
+                    if route[-1] == dest:
+                        continue
+                    path, _, path_rings = self.shortest_path(route[-1], dest)
+                    ring_uses += path_rings
+                    route.extend(path[1:])
+                best_route, best_rings = route, ring_uses
+            return best_route or [start], best_steps, best_rings, best_service_visits
+        
+        # Services available at the starting location, the same for every permutation.
+        # Visited services are a bitmask over SERVICE_CATEGORY_IDS plus the location per category id.
+        start_visited_mask = 0
+        start_visited_loc = [None] * len(SERVICE_CATEGORY_IDS)
+        for category_id in NODE_SERVICES.get(start, ()):  # Only unlocked services count as visited
+            start_visited_mask |= 1 << category_id
+            start_visited_loc[category_id] = start
+        
+        # Every destination leg costs at least the cheapest way into that destination,
+        # so a partial order whose steps plus these bounds can't beat the best is dropped early
+        min_steps_in = [self._min_steps_into(dest) for dest in clean_dests]
+        
+        # Permute destination indices, so duplicate locations keep their own service requirements
+        for perm in permutations(range(len(clean_dests))):
             route = [start]
             total = 0
+            remaining_bound = sum(min_steps_in)
             ring_uses = 0
             valid = True
-            services_visited = {}  # Track which services have been visited
+            visited_mask = start_visited_mask  # Track which services have been visited
+            visited_loc = list(start_visited_loc)
             services_used = {}  # Track which services were actually used for requirements
             
-            # Check if starting location has any services
-            start_loc = None
-            for loc in LOCATION_SERVICES:
-                loc_name = loc.name if hasattr(loc, 'name') else str(loc)
-                if loc_name == start:
-                    start_loc = loc
-                    break
-            if start_loc and start_loc in LOCATION_SERVICES:
-                for service_category, (tier, unlocked) in LOCATION_SERVICES[start_loc].items():
-                    if unlocked:  # Only mark as visited if unlocked
-                        services_visited[service_category] = start
-            
-            for i, dest in enumerate(perm):
+            for dest_idx in perm:
                 # Get required services for this destination
-                required_services, _ = dest_info[clean_dests.index(dest)]
+                required_services, dest = dest_info[dest_idx]
                 
                 # Visit each required service in order
                 for service_category, tier in required_services:
-                    if service_category in services_visited:
+                    category_id = SERVICE_CATEGORY_IDS[service_category]
+                    if visited_mask & (1 << category_id):
                         # Mark as used since it was required
-                        services_used[service_category] = services_visited[service_category]
+                        services_used[service_category] = visited_loc[category_id]
                         continue  # Already visited this service type
                     
                     # Get all locations with this service
@@ -523,70 +877,71 @@ class Graph:
                     
                     if service_on_path:
                         # Service is on the path, mark it
-                        services_visited[service_category] = service_on_path
+                        visited_mask |= 1 << category_id
+                        visited_loc[category_id] = service_on_path
                         services_used[service_category] = service_on_path
                     else:
                         # Find nearest service location
                         best_service_loc = None
                         best_service_steps = float('inf')
-                        best_service_path = None
+                        best_steps_to_service = float('inf')
                         
                         for service_loc in service_locations:
-                            path_to_service, steps_to_service = self.dijkstra(route[-1], service_loc)
-                            path_from_service, steps_from_service = self.dijkstra(service_loc, dest)
+                            steps_to_service = self.steps_between(route[-1], service_loc)
+                            steps_from_service = self.steps_between(service_loc, dest)
                             total_via_service = steps_to_service + steps_from_service
                             
                             if total_via_service < best_service_steps:
                                 best_service_loc = service_loc
                                 best_service_steps = total_via_service
-                                best_service_path = path_to_service
+                                best_steps_to_service = steps_to_service
                         
                         if best_service_loc:
+                            best_service_path, _, path_rings = self.shortest_path(route[-1], best_service_loc)
                             # Add service location to route
-                            for j in range(len(best_service_path) - 1):
-                                if self.edges[best_service_path[j]][best_service_path[j+1]]['gear'] == 'Ring':
-                                    ring_uses += 1
+                            ring_uses += path_rings
                             route.extend(best_service_path[1:])
-                            total += self.dijkstra(route[-len(best_service_path)], route[-1])[1]
-                            services_visited[service_category] = best_service_loc
+                            total += best_steps_to_service
+                            visited_mask |= 1 << category_id
+                            visited_loc[category_id] = best_service_loc
                             services_used[service_category] = best_service_loc
+                            if total + remaining_bound >= best_steps:
+                                valid = False
+                                break
                 
                 if not valid:
                     break
                 
                 # Now go to the actual destination
-                path, steps = self.dijkstra(route[-1], dest)
+                path, steps, path_rings = self.shortest_path(route[-1], dest)
                 if steps == float('inf'):
                     valid = False
                     break
                 
                 # Count ring uses in this path
-                for j in range(len(path) - 1):
-                    if self.edges[path[j]][path[j+1]]['gear'] == 'Ring':
-                        ring_uses += 1
+                ring_uses += path_rings
                 
                 route.extend(path[1:])
                 total += steps
+                remaining_bound -= min_steps_in[dest_idx]
+                if total + remaining_bound >= best_steps:
+                    valid = False
+                    break
                 
                 # Check if we passed through any services
                 for loc_str in path:
-                    for loc_enum in LOCATION_SERVICES:
-                        loc_name = loc_enum.name if hasattr(loc_enum, 'name') else str(loc_enum)
-                        if loc_name == loc_str:
-                            for service_category, (tier, unlocked) in LOCATION_SERVICES[loc_enum].items():
-                                if unlocked and service_category not in services_visited:
-                                    services_visited[service_category] = loc_str
-                            break
+                    for category_id in NODE_SERVICES.get(loc_str, ()):
+                        if not visited_mask & (1 << category_id):
+                            visited_mask |= 1 << category_id
+                            visited_loc[category_id] = loc_str
             
             # If end location specified, go there
-            if end and route[-1] != end:
-                path, steps = self.dijkstra(route[-1], end)
+            if valid and end and route[-1] != end:
+                path, steps, path_rings = self.shortest_path(route[-1], end)
                 if steps == float('inf'):
                     valid = False
                 else:
-                    for j in range(len(path) - 1):
-                        if self.edges[path[j]][path[j+1]]['gear'] == 'Ring':
-                            ring_uses += 1
+                    ring_uses += path_rings
                     route.extend(path[1:])
                     total += steps
             
@@ -628,9 +983,7 @@ class Graph:
         
         for i in range(len(route) - 1):
             a, b = route[i], route[i+1]
-            edge = self.edges[a][b]
-            gear = edge['gear']
-            steps = edge['steps']
+            gear, steps, _ = self.edge(a, b)
             
             # Special handling for Ring and Shortcut
             if gear == 'Ring':
@@ -3598,7 +3598,7 @@ def run_optimization_background(
         # Check if name already exists and append (1), (2), etc. if needed
         db = get_db()
         existing_names = set()
-        all_gearsets = db.get_gear_sets(session_uuid)
+        all_gearsets = db.get_gear_sets(session_uuid, include_slots=False)
         for gs in all_gearsets:
             existing_names.add(gs['name'])
         
@@ -3,19 +3,33 @@
 Apply database migrations from the migrations/ folder.
 
 Migrations are SQL files named with timestamps: YYYYMMDD_HHMMSS_description.sql
-They are applied in order and tracked in a migrations table.
+They are applied in order and tracked in a migrations table. All pending
+migrations run in one transaction, so a failing migration leaves the database
+as it was before the run.
 """
 
 import os
-import sqlite3
-from pathlib import Path
-from datetime import datetime
+import sys
+from bisect import bisect_right
 
 DB_PATH = 'sessions.db'
 MIGRATIONS_DIR = 'migrations'
 
+# Progress lines are written out once per this many migrations
+OUTPUT_FLUSH_EVERY = 16
+
 def init_migrations_table(conn):
-    """Create migrations tracking table if it doesn't exist."""
+    """Create migrations tracking tables if they don't exist.
+    
+    Probes sqlite_master first, so an initialized database costs one read and no DDL or commit.
+    """
+    existing = conn.execute(
+        "SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' "
+        "AND name IN ('schema_migrations', 'schema_migrations_meta')"
+    ).fetchone()[0]
+    if existing == 2:
+        return
+    
     conn.execute('''
         CREATE TABLE IF NOT EXISTS schema_migrations (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -23,45 +37,123 @@ def init_migrations_table(conn):
             applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         )
     ''')
+    # One row: migrations dir mtime and applied count as of the last complete run
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS schema_migrations_meta (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            dir_mtime_ns INTEGER NOT NULL,
+            applied_count INTEGER NOT NULL
+        )
+    ''')
     conn.commit()
 
+def get_dir_sentinel(conn):
+    """Get the stored (dir_mtime_ns, applied_count), or None if never recorded."""
+    return conn.execute(
+        'SELECT dir_mtime_ns, applied_count FROM schema_migrations_meta WHERE id = 1'
+    ).fetchone()
+
+def set_dir_sentinel(conn, dir_mtime_ns, applied_count):
+    """Record the migrations dir state after every migration in it was applied."""
+    conn.execute(
+        'INSERT OR REPLACE INTO schema_migrations_meta (id, dir_mtime_ns, applied_count) VALUES (1, ?, ?)',
+        (dir_mtime_ns, applied_count)
+    )
+
+def get_dir_mtime_ns(migrations_dir):
+    """Get the migrations dir mtime in ns (changes when files are added or removed), or None."""
+    try:
+        return os.stat(migrations_dir).st_mtime_ns
+    except OSError:
+        return None
+
 def get_applied_migrations(conn):
-    """Get list of already-applied migrations."""
+    """Get set of already-applied migrations."""
     cursor = conn.execute('SELECT filename FROM schema_migrations')
-    return {row[0] for row in cursor.fetchall()}
+    return frozenset(row[0] for row in cursor)
 
 def get_pending_migrations(applied, migrations_dir):
-    """Get list of migrations that haven't been applied yet."""
-    migrations_path = Path(migrations_dir)
-    if not migrations_path.exists():
+    """Get (filename, path) of migrations that haven't been applied yet, in order.
+    
+    Filenames start with a timestamp, so the sorted listing usually splits into
+    an applied head and a pending tail past the newest applied name. The head is
+    still checked against applied: a branch merged late can add a migration
+    older than ones already applied.
+    """
+    if not os.path.isdir(migrations_dir):
         return []
     
-    all_migrations = sorted([
-        f.name for f in migrations_path.glob('*.sql')
-    ])
+    with os.scandir(migrations_dir) as entries:
+        migrations = sorted(
+            (entry.name, entry.path) for entry in entries
+            if entry.name.endswith('.sql') and entry.is_file()
+        )
+    if not applied:
+        return migrations
+    
+    names = [name for name, _ in migrations]
+    split = bisect_right(names, max(applied))
+    if applied.issuperset(names[:split]):
+        return migrations[split:]
+    
+    # Out-of-order migration somewhere in the head; filter the whole listing
+    return [migration for migration in migrations if migration[0] not in applied]
+
+def split_statements(sql):
+    """Split a migration script into complete SQL statements.
+    
+    Semicolons inside strings, comments and trigger bodies don't end a statement
+    (checked with sqlite3.complete_statement).
+    """
+    from sqlite3 import complete_statement
     
-    return [m for m in all_migrations if m not in applied]
+    statements = []
+    buffer = ''
+    pieces = sql.split(';')
+    for piece in pieces[:-1]:
+        buffer += piece + ';'
+        if complete_statement(buffer):
+            statements.append(buffer)
+            buffer = ''
+    buffer += pieces[-1]
+    if buffer.strip():
+        statements.append(buffer)
+    return statements
 
-def apply_migration(conn, filename, migrations_dir):
-    """Apply a single migration file."""
-    filepath = Path(migrations_dir) / filename
+def apply_migration(conn, filename, filepath, out=print):
+    """Apply a single migration file inside the caller's transaction (see record_migrations).
     
-    print(f"  Applying {filename}...")
+    Progress lines go to out (print by default; run_migrations buffers them).
+    """
+    out(f"  Applying {filename}...")
     
-    with open(filepath, 'r') as f:
-        sql = f.read()
+    # Migrations are small; one raw read and a single decode skips the text-mode layers
+    fd = os.open(filepath, os.O_RDONLY)
+    try:
+        size = os.fstat(fd).st_size
+        data = os.read(fd, size)
+        while len(data) < size:
+            chunk = os.read(fd, size - len(data))
+            if not chunk:
+                break
+            data += chunk
+    finally:
+        os.close(fd)
+    sql = data.decode('utf-8')
     
-    # Execute the migration
-    conn.executescript(sql)
+    # Execute the migration statement by statement; executescript() would
+    # commit the surrounding transaction
+    for statement in split_statements(sql):
+        conn.execute(statement)
     
-    # Record that it was applied
-    conn.execute(
+    out(f"  ✓ Applied {filename}")
+
+def record_migrations(conn, filenames):
+    """Record applied migrations with one batched INSERT."""
+    conn.executemany(
         'INSERT INTO schema_migrations (filename) VALUES (?)',
-        (filename,)
+        [(filename,) for filename in filenames]
     )
-    conn.commit()
-    
-    print(f"  ✓ Applied {filename}")
 
 def run_migrations(db_path=None, migrations_dir=None):
     """Apply all pending migrations.
@@ -73,6 +165,9 @@ def run_migrations(db_path=None, migrations_dir=None):
     Returns:
         Number of migrations applied
     """
+    # Imported here so loading this module doesn't pull in the sqlite3 extension
+    import sqlite3
+    
     db_path = db_path or DB_PATH
     migrations_dir = migrations_dir or MIGRATIONS_DIR
     
@@ -80,28 +175,73 @@ def run_migrations(db_path=None, migrations_dir=None):
         print(f"⚠️  Database not found at {db_path}")
         print("   Creating new database...")
     
-    conn = sqlite3.connect(db_path)
+    # Autocommit mode: transactions are opened and closed explicitly below
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    # WAL + synchronous=NORMAL: commits append to the write-ahead log instead of
+    # syncing the main database file; temp structures and a 64 MB page cache stay in memory
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.execute('PRAGMA temp_store=MEMORY')
+    conn.execute('PRAGMA cache_size=-65536')
+    
+    # Buffered progress output, written and flushed in batches
+    lines = []
+    out = lines.append
+    
+    def flush_output():
+        if lines:
+            sys.stdout.write("\n".join(lines) + "\n")
+            lines.clear()
+        sys.stdout.flush()
     
     try:
         init_migrations_table(conn)
         
+        applied = get_applied_migrations(conn)
+        
+        # Steady state: the directory hasn't changed since a run that left nothing
+        # pending, and no applied rows came or went, so skip the scan entirely.
+        # The mtime is taken before scanning, so files added mid-scan still count as a change.
+        dir_mtime_ns = get_dir_mtime_ns(migrations_dir)
+        sentinel = get_dir_sentinel(conn)
+        if dir_mtime_ns is not None and sentinel == (dir_mtime_ns, len(applied)):
+            print("✓ No pending migrations")
+            return 0
+        
+        # One transaction (and one sync to disk) for the whole batch. The applied
+        # set is re-read under the write lock: another process (e.g. deploy.sh)
+        # may have applied migrations since the read above.
+        conn.execute('BEGIN IMMEDIATE')
         applied = get_applied_migrations(conn)
         pending = get_pending_migrations(applied, migrations_dir)
         
         if not pending:
+            if dir_mtime_ns is not None:
+                set_dir_sentinel(conn, dir_mtime_ns, len(applied))
+            conn.execute('COMMIT')
             print("✓ No pending migrations")
             return 0
         
         print(f"Found {len(pending)} pending migration(s):")
-        for migration in pending:
-            apply_migration(conn, migration, migrations_dir)
+        for i, (filename, filepath) in enumerate(pending, 1):
+            apply_migration(conn, filename, filepath, out)
+            if i % OUTPUT_FLUSH_EVERY == 0:
+                flush_output()
+        flush_output()
+        record_migrations(conn, [filename for filename, _ in pending])
+        if dir_mtime_ns is not None:
+            set_dir_sentinel(conn, dir_mtime_ns, len(applied) + len(pending))
+        conn.execute('COMMIT')
         
         print(f"\n✓ Successfully applied {len(pending)} migration(s)")
         return len(pending)
         
     except Exception as e:
+        # Show progress up to the failing migration first
+        flush_output()
         print(f"\n✗ Migration failed: {e}")
-        conn.rollback()
+        if conn.in_transaction:
+            conn.execute('ROLLBACK')
         raise
     finally:
         conn.close()
@@ -8,13 +8,186 @@ Each session is identified by a UUID and stores:
 - ui_config: User preferences (hidden items, quality selections, custom stats)
 """
 
+import atexit
 import json
 import sqlite3
+import threading
+import time
 import uuid
+import zlib
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from functools import lru_cache
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, Optional, Any
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    def _dumps(value: Any) -> str:
+        """Serialize to JSON text with orjson (stdlib json for values orjson rejects)."""
+        try:
+            return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+        except orjson.JSONEncodeError:
+            return json.dumps(value)
+
+    def _loads(text) -> Any:
+        """Parse JSON text with orjson (stdlib json for NaN/Infinity written by json.dumps)."""
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            return json.loads(text)
+else:
+    _dumps = json.dumps
+    _loads = json.loads
+
+# Applied to every new connection. journal_mode=WAL is stored in the database
+# file, so it is only set once, in _init_db_with_conn.
+# synchronous=NORMAL is safe under WAL (commits may only be lost on power failure,
+# never corrupted); temp tables/indexes stay in memory; 64 MB page cache; 256 MB mmap.
+CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA mmap_size=268435456",
+)
+
+# API stats count requests in buckets this wide (ms) before grouping them by local date
+DAY_BUCKET_MS = 15 * 60 * 1000
+
+# Prepared statements kept per connection. Each distinct SQL string (including the
+# f-string variants) takes a slot; sized so the module's whole statement set fits.
+STATEMENT_CACHE_SIZE = 256
+
+# SQL for the per-request paths, shared as constants so every call site
+# hits the same prepared statement
+SQL_SESSION_VERSION = "SELECT last_updated FROM sessions WHERE uuid = ?"
+SQL_GET_SESSION = "SELECT uuid, character_config, ui_config, last_updated FROM sessions WHERE uuid = ?"
+SQL_INSERT_API_ACCESS = """
+    INSERT INTO api_access_audit (session_uuid, endpoint, method, user_agent, ip_address, timestamp)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+SQL_UPSERT_GEAR_SET = """
+    INSERT INTO gear_sets (id, session_uuid, name, slots_json, export_string, is_optimized, created_at, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(session_uuid, name) DO UPDATE SET
+        slots_json = excluded.slots_json,
+        updated_at = excluded.updated_at
+    RETURNING id, export_string, is_optimized, created_at, updated_at
+"""
+
+# Parsed configs kept for this many recently read sessions
+SESSION_CACHE_SIZE = 256
+
+# API access rows are queued and written by a background thread every
+# AUDIT_FLUSH_INTERVAL seconds, at most AUDIT_BATCH_SIZE rows per INSERT
+AUDIT_FLUSH_INTERVAL = 0.25
+AUDIT_BATCH_SIZE = 500
+
+# get_api_access_stats results are reused for this many seconds per days value.
+# Not invalidated by new access rows: every /api/ request logs one, so the
+# stats would never be served from cache.
+STATS_CACHE_TTL = 60.0
+
+
+def _copy_json(value):
+    """Copy a decoded JSON value (nested dicts/lists of immutable leaves).
+    
+    Cheaper than both copy.deepcopy and re-parsing the JSON text.
+    """
+    if type(value) is dict:
+        return {k: _copy_json(v) if type(v) in (dict, list) else v for k, v in value.items()}
+    if type(value) is list:
+        return [_copy_json(v) if type(v) in (dict, list) else v for v in value]
+    return value
+
+
+# Screenshot JSON (base64 images, rarely read) is stored as a BLOB: one tag byte,
+# then the UTF-8 JSON either as-is or zlib-compressed. Payloads under
+# COMPRESS_MIN_BYTES aren't worth the codec. Older rows hold plain JSON text.
+COMPRESS_MIN_BYTES = 512
+COMPRESS_LEVEL = 6
+_TAG_RAW = b'\x00'
+_TAG_ZLIB = b'\x01'
+
+
+def _pack_json(value: Any) -> bytes:
+    """Serialize a value to tagged, possibly compressed JSON bytes."""
+    data = _dumps(value).encode()
+    if len(data) < COMPRESS_MIN_BYTES:
+        return _TAG_RAW + data
+    return _TAG_ZLIB + zlib.compress(data, COMPRESS_LEVEL)
+
+
+def _unpack_json(stored) -> Any:
+    """Parse a value written by _pack_json (or legacy JSON text)."""
+    if isinstance(stored, str):
+        return _loads(stored)
+    payload = memoryview(stored)[1:]
+    if stored[:1] == _TAG_ZLIB:
+        return _loads(zlib.decompress(payload))
+    return _loads(bytes(payload))
+
+
+# Timestamps written by this module are stored as integer epoch milliseconds
+# and returned as ISO 8601 local time strings.
+# (table, column) pairs holding them, converted from text once (SCHEMA_VERSION_EPOCH_MS).
+EPOCH_MS_COLUMNS = (
+    ('sessions', 'last_updated'),
+    ('gear_sets', 'created_at'),
+    ('gear_sets', 'updated_at'),
+    ('optimization_presets', 'created_at'),
+    ('optimization_presets', 'updated_at'),
+    ('bug_reports', 'timestamp'),
+    ('bug_reports', 'reviewed_at'),
+    ('api_access_audit', 'timestamp'),
+)
+SCHEMA_VERSION_EPOCH_MS = 1
+
+# PRAGMA user_version steps; _init_db_with_conn only runs the upgrades past the stored version
+SCHEMA_VERSION_GEAR_SET_COLUMNS = 2
+SCHEMA_VERSION = SCHEMA_VERSION_GEAR_SET_COLUMNS
+
+
+def _now() -> int:
+    """Current time in epoch milliseconds, as stored in timestamp columns."""
+    return int(time.time() * 1000)
+
+
+@lru_cache(maxsize=4096)
+def _to_iso(timestamp) -> Optional[str]:
+    """Stored timestamp -> ISO 8601 local time string (None and legacy text pass through).
+    
+    Memoized: the same few timestamps are formatted over and over (a session's
+    last_updated on every read, created_at == updated_at on untouched rows).
+    """
+    if timestamp is None or isinstance(timestamp, str):
+        return timestamp
+    return datetime.fromtimestamp(timestamp / 1000).isoformat()
+
+
+def _classify_path(path: str) -> tuple:
+    """Route an update_config_path path to its config.
+    
+    ui_config paths: ui.* (prefix dropped), items.*.hide, quality_overrides.*, custom_stats.*
+    character_config paths: everything else (skills.*, reputation.*, items.*.has, coins, ...)
+    
+    Returns:
+        ('ui' or 'character', path parts within that config)
+    """
+    parts = path.split('.')
+    if parts[0] == 'ui':
+        return 'ui', parts[1:]
+    if len(parts) >= 3 and parts[0] == 'items' and parts[2] == 'hide':
+        return 'ui', parts
+    if parts[0] in ('quality_overrides', 'custom_stats'):
+        return 'ui', parts
+    return 'character', parts
+
 
 class DatabaseManager:
     """Manages SQLite database for session persistence."""
@@ -27,18 +200,38 @@ class DatabaseManager:
         """
         self.db_path = db_path
         self._persistent_conn = None
+        # File-based databases: one connection per thread, opened on first use and reused
+        self._local = threading.local()
+        # session_uuid -> (last_updated, character_config, ui_config), least recently used first
+        self._session_cache = OrderedDict()
+        self._session_cache_lock = threading.Lock()
+        # Pending api_access_audit rows; the flush thread starts with the first one
+        self._audit_queue = deque()
+        self._audit_thread = None
+        self._audit_thread_lock = threading.Lock()
+        # days -> (expires_at, cutoff_ms, stats) for get_api_access_stats
+        self._stats_cache = {}
+        self._stats_cache_lock = threading.Lock()
         
         # For in-memory databases, keep connection open
         # Use check_same_thread=False for async/multi-threaded environments
         if db_path == ":memory:":
-            self._persistent_conn = sqlite3.connect(db_path, check_same_thread=False)
+            self._persistent_conn = self._connect(check_same_thread=False)
             self._init_db_with_conn(self._persistent_conn)
         else:
             self._init_db()
     
+    def _connect(self, **kwargs):
+        """Open a new connection with CONNECTION_PRAGMAS applied."""
+        kwargs.setdefault('cached_statements', STATEMENT_CACHE_SIZE)
+        conn = sqlite3.connect(self.db_path, **kwargs)
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+    
     def _init_db(self):
         """Create sessions table if not exists (for file-based databases)."""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         self._init_db_with_conn(conn)
         conn.close()
     
@@ -46,12 +239,16 @@ class DatabaseManager:
         """Create sessions and gear_sets tables using provided connection."""
         cursor = conn.cursor()
         
+        # Write-ahead log: readers don't block on writers, commits append to the log
+        # (persistent per database file; in-memory databases keep their own journal)
+        cursor.execute("PRAGMA journal_mode=WAL")
+        
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS sessions (
                 uuid TEXT PRIMARY KEY,
                 character_config TEXT,
                 ui_config TEXT,
-                last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                last_updated INTEGER
             )
         """)
         
@@ -64,23 +261,21 @@ class DatabaseManager:
                 slots_json TEXT NOT NULL,
                 export_string TEXT,
                 is_optimized INTEGER DEFAULT 0,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                created_at INTEGER,
+                updated_at INTEGER,
                 FOREIGN KEY (session_uuid) REFERENCES sessions(uuid),
                 UNIQUE(session_uuid, name)
             )
         """)
         
-        # Add columns if they don't exist (migrations)
-        try:
-            cursor.execute("ALTER TABLE gear_sets ADD COLUMN is_optimized INTEGER DEFAULT 0")
-        except:
-            pass  # Column already exists
-        
-        try:
-            cursor.execute("ALTER TABLE gear_sets ADD COLUMN export_string TEXT")
-        except:
-            pass  # Column already exists
+        # Add columns missing from gear_sets tables created by older versions
+        schema_version = cursor.execute("PRAGMA user_version").fetchone()[0]
+        if schema_version < SCHEMA_VERSION_GEAR_SET_COLUMNS:
+            existing = {row[1] for row in cursor.execute("PRAGMA table_info(gear_sets)")}
+            if 'is_optimized' not in existing:
+                cursor.execute("ALTER TABLE gear_sets ADD COLUMN is_optimized INTEGER DEFAULT 0")
+            if 'export_string' not in existing:
+                cursor.execute("ALTER TABLE gear_sets ADD COLUMN export_string TEXT")
         
         # Bug reports table for user-submitted issues
         cursor.execute("""
@@ -91,8 +286,8 @@ class DatabaseManager:
                 preset_type TEXT NOT NULL,
                 sorting_json TEXT NOT NULL,
                 include_consumables INTEGER DEFAULT 0,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                created_at INTEGER,
+                updated_at INTEGER,
                 FOREIGN KEY (session_uuid) REFERENCES sessions(uuid),
                 UNIQUE(session_uuid, name, preset_type)
             )
@@ -107,10 +302,10 @@ class DatabaseManager:
                 description TEXT NOT NULL,
                 app_version TEXT NOT NULL,
                 browser_info TEXT NOT NULL,
-                timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                screenshots_json TEXT,
+                timestamp INTEGER,
+                screenshots_json BLOB,
                 reviewed BOOLEAN DEFAULT 0,
-                reviewed_at TIMESTAMP,
+                reviewed_at INTEGER,
                 reviewed_by TEXT,
                 notes TEXT,
                 FOREIGN KEY (original_session_uuid) REFERENCES sessions(uuid),
@@ -125,7 +320,7 @@ class DatabaseManager:
                 session_uuid TEXT NOT NULL,
                 endpoint TEXT NOT NULL,
                 method TEXT NOT NULL,
-                timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                timestamp INTEGER,
                 user_agent TEXT,
                 ip_address TEXT,
                 FOREIGN KEY (session_uuid) REFERENCES sessions(uuid)
@@ -133,28 +328,52 @@ class DatabaseManager:
         """)
         
         # Create index for faster queries
+        # (session_uuid, timestamp): per-session history in timestamp order, no sort step.
+        # Deliberately not covering: get_session_api_access reads at most `limit` rows
+        # (admin view), while a copy of user_agent/ip_address in the index would be
+        # paid on every /api/ request's insert. The table keeps its rowid, since
+        # AUTOINCREMENT ids can't be used WITHOUT ROWID.
         cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_api_access_session 
-            ON api_access_audit(session_uuid)
+            CREATE INDEX IF NOT EXISTS idx_api_access_session_ts
+            ON api_access_audit(session_uuid, timestamp)
         """)
         
+        # (timestamp, session_uuid, endpoint): stats cutoff range scan, with every stats
+        # aggregate (sessions, endpoints, days) answered from the index alone
         cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_api_access_timestamp 
-            ON api_access_audit(timestamp)
+            CREATE INDEX IF NOT EXISTS idx_api_access_ts_session_endpoint
+            ON api_access_audit(timestamp, session_uuid, endpoint)
         """)
         
+        # Indexes superseded by the compound ones above. The endpoint-only index
+        # also led the planner to answer the windowed endpoint GROUP BY with a
+        # sort-free scan of the whole table instead of the timestamp range.
+        cursor.execute("DROP INDEX IF EXISTS idx_api_access_session")
+        cursor.execute("DROP INDEX IF EXISTS idx_api_access_timestamp")
+        cursor.execute("DROP INDEX IF EXISTS idx_api_access_ts_session")
+        cursor.execute("DROP INDEX IF EXISTS idx_api_access_endpoint")
+        
+        # Gear sets listed per session, newest first
         cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_api_access_endpoint 
-            ON api_access_audit(endpoint)
+            CREATE INDEX IF NOT EXISTS idx_gear_sets_session_updated
+            ON gear_sets(session_uuid, updated_at DESC)
+        """)
+        
+        # Bug reports filtered by reviewed status, newest first
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_bug_reports_reviewed_ts
+            ON bug_reports(reviewed, timestamp DESC)
         """)
         
         # Debug sessions table for remote debug mode toggling
+        # (small rows keyed by a TEXT uuid: WITHOUT ROWID stores them in the PK b-tree
+        # itself, so lookups are one descent instead of PK index -> rowid -> row)
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS debug_sessions (
                 session_uuid TEXT PRIMARY KEY,
                 enabled_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
                 enabled_by TEXT NOT NULL
-            )
+            ) WITHOUT ROWID
         """)
         
         # Broadcasts table for admin broadcast messages
@@ -179,13 +398,59 @@ class DatabaseManager:
             )
         """)
         
+        # Convert ISO text timestamps from older versions (written with datetime.now(),
+        # so local time) to epoch milliseconds, once per database
+        if schema_version < SCHEMA_VERSION_EPOCH_MS:
+            for table, column in EPOCH_MS_COLUMNS:
+                cursor.execute(f"""
+                    UPDATE {table}
+                    SET {column} = CAST(ROUND((julianday({column}, 'utc') - 2440587.5) * 86400000) AS INTEGER)
+                    WHERE typeof({column}) = 'text' AND julianday({column}) IS NOT NULL
+                """)
+        
+        if schema_version < SCHEMA_VERSION:
+            cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        
         conn.commit()
     
     def _get_connection(self):
-        """Get database connection (reuse for in-memory, create new for file-based)."""
+        """Get database connection (shared for in-memory, one per thread for file-based)."""
         if self._persistent_conn:
             return self._persistent_conn
-        return sqlite3.connect(self.db_path)
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+        return conn
+    
+    @contextmanager
+    def _connection(self):
+        """Borrow the connection for one operation.
+        
+        Connections stay open between calls; anything left uncommitted
+        (e.g. after an error) is rolled back on exit, as closing used to do.
+        """
+        conn = self._get_connection()
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+    
+    @contextmanager
+    def _txn(self, conn, mode: str = 'IMMEDIATE'):
+        """Run a block in one explicit transaction, committed on success.
+        
+        IMMEDIATE takes the write lock up front, so a read-then-write block can't
+        be interleaved with another writer or fail upgrading its lock mid-way.
+        """
+        conn.execute(f"BEGIN {mode}")
+        try:
+            yield
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
     
     def get_session(self, session_uuid: str) -> Optional[Dict[str, Any]]:
         """Retrieve session data by UUID.
@@ -197,31 +462,55 @@ class DatabaseManager:
             Dictionary with uuid, character_config, ui_config, last_updated
             or None if session doesn't exist
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT uuid, character_config, ui_config, last_updated
-            FROM sessions
-            WHERE uuid = ?
-        """, (session_uuid,))
-        
-        row = cursor.fetchone()
-        
-        # Only close if not persistent connection
-        if not self._persistent_conn:
-            conn.close()
-        
-        if not row:
-            return None
-        
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            
+            # last_updated versions the row, so a matching cached entry is still current
+            cursor.execute(SQL_SESSION_VERSION, (session_uuid,))
+            version = cursor.fetchone()
+            if not version:
+                self._invalidate_session(session_uuid)
+                return None
+            
+            with self._session_cache_lock:
+                cached = self._session_cache.get(session_uuid)
+                if cached is not None and cached[0] == version[0]:
+                    self._session_cache.move_to_end(session_uuid)
+                else:
+                    cached = None
+            
+            if cached is None:
+                cursor.execute(SQL_GET_SESSION, (session_uuid,))
+                
+                row = cursor.fetchone()
+                if not row:
+                    self._invalidate_session(session_uuid)
+                    return None
+                
+                cached = (
+                    row[3],
+                    _loads(row[1]) if row[1] else None,
+                    _loads(row[2]) if row[2] else {}
+                )
+                with self._session_cache_lock:
+                    self._session_cache[session_uuid] = cached
+                    self._session_cache.move_to_end(session_uuid)
+                    if len(self._session_cache) > SESSION_CACHE_SIZE:
+                        self._session_cache.popitem(last=False)
+        
+        # Callers may modify the returned configs, so hand out copies
         return {
-            'uuid': row[0],
-            'character_config': json.loads(row[1]) if row[1] else None,
-            'ui_config': json.loads(row[2]) if row[2] else {},
-            'last_updated': row[3]
+            'uuid': session_uuid,
+            'character_config': _copy_json(cached[1]),
+            'ui_config': _copy_json(cached[2]),
+            'last_updated': _to_iso(cached[0])
         }
     
+    def _invalidate_session(self, session_uuid: str):
+        """Drop a session's cached configs (call after writing to its row)."""
+        with self._session_cache_lock:
+            self._session_cache.pop(session_uuid, None)
+    
     def create_session(self, session_uuid: str) -> Dict[str, Any]:
         """Create a new session with empty configs.
         
@@ -231,28 +520,25 @@ class DatabaseManager:
         Returns:
             Dictionary with uuid, character_config (None), ui_config (empty dict)
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        # Create empty ui_config
-        ui_config = {}
-        
-        cursor.execute("""
-            INSERT INTO sessions (uuid, character_config, ui_config, last_updated)
-            VALUES (?, NULL, ?, ?)
-        """, (session_uuid, json.dumps(ui_config), datetime.now().isoformat()))
-        
-        conn.commit()
-        
-        # Only close if not persistent connection
-        if not self._persistent_conn:
-            conn.close()
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            
+            # Create empty ui_config
+            ui_config = {}
+            now = _now()
+            
+            cursor.execute("""
+                INSERT INTO sessions (uuid, character_config, ui_config, last_updated)
+                VALUES (?, NULL, ?, ?)
+            """, (session_uuid, _dumps(ui_config), now))
+            
+            conn.commit()
         
         return {
             'uuid': session_uuid,
             'character_config': None,
             'ui_config': ui_config,
-            'last_updated': datetime.now().isoformat()
+            'last_updated': _to_iso(now)
         }
     
     def update_character_config(self, session_uuid: str, config: Dict[str, Any]):
@@ -262,20 +548,17 @@ class DatabaseManager:
             session_uuid: Session UUID to update
             config: Character configuration dictionary
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            UPDATE sessions
-            SET character_config = ?, last_updated = ?
-            WHERE uuid = ?
-        """, (json.dumps(config), datetime.now().isoformat(), session_uuid))
-        
-        conn.commit()
-        
-        # Only close if not persistent connection
-        if not self._persistent_conn:
-            conn.close()
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("""
+                UPDATE sessions
+                SET character_config = ?, last_updated = ?
+                WHERE uuid = ?
+            """, (_dumps(config), _now(), session_uuid))
+            
+            conn.commit()
+        self._invalidate_session(session_uuid)
     
     def update_ui_config(self, session_uuid: str, config: Dict[str, Any]):
         """Update ui_config for a session.
@@ -284,20 +567,17 @@ class DatabaseManager:
             session_uuid: Session UUID to update
             config: UI configuration dictionary
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            UPDATE sessions
-            SET ui_config = ?, last_updated = ?
-            WHERE uuid = ?
-        """, (json.dumps(config), datetime.now().isoformat(), session_uuid))
-        
-        conn.commit()
-        
-        # Only close if not persistent connection
-        if not self._persistent_conn:
-            conn.close()
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("""
+                UPDATE sessions
+                SET ui_config = ?, last_updated = ?
+                WHERE uuid = ?
+            """, (_dumps(config), _now(), session_uuid))
+            
+            conn.commit()
+        self._invalidate_session(session_uuid)
     
     def update_config_path(self, session_uuid: str, path: str, value: Any):
         """Update a specific path in the configuration.
@@ -311,97 +591,92 @@ class DatabaseManager:
             path: Dot-separated path (e.g., "items.TRAVELERS_KIT.has")
             value: Value to set at the path
         """
-        # Get current session
-        session = self.get_session(session_uuid)
-        if not session:
-            return
+        config_type, parts = _classify_path(path)
         
-        # Determine which config to update based on path
-        # ui_config paths: ui.*, items.*.hide, quality_overrides.*
-        # character_config paths: skills.*, reputation.*, items.*.has, achievement_points, coins
-        
-        parts = path.split('.')
-        
-        # Determine target config and adjust path
-        if parts[0] == 'ui':
-            config = session['ui_config']
-            config_type = 'ui'
-            # Skip the 'ui' prefix since we're already in ui_config
-            parts = parts[1:]
-        elif len(parts) >= 3 and parts[0] == 'items' and parts[2] == 'hide':
-            config = session['ui_config']
-            config_type = 'ui'
-        elif parts[0] == 'quality_overrides':
-            config = session['ui_config']
-            config_type = 'ui'
-        elif parts[0] == 'custom_stats':
-            config = session['ui_config']
-            config_type = 'ui'
-        else:
-            config = session['character_config']
-            if config is None:
-                config = {}
-            config_type = 'character'
-        
-        # Navigate to the parent of the target path
-        current = config
-        for i, part in enumerate(parts[:-1]):
-            if part not in current:
-                current[part] = {}
-            current = current[part]
-        
-        # Set the value
-        current[parts[-1]] = value
+        # Keys containing '"' can't be quoted in a JSON path; patch those in Python
+        if not parts or any('"' in part for part in parts):
+            self._update_config_path_in_python(session_uuid, config_type, parts, value)
+            return
         
-        # Update the appropriate config
-        if config_type == 'ui':
-            self.update_ui_config(session_uuid, config)
-        else:
-            self.update_character_config(session_uuid, config)
+        # Patch the one value in place with JSON1 json_set, which also creates
+        # missing parent objects; no SELECT or re-serializing the whole config
+        column = 'ui_config' if config_type == 'ui' else 'character_config'
+        json_path = '$' + ''.join(f'."{part}"' for part in parts)
+        
+        with self._connection() as conn, self._txn(conn):
+            conn.execute(f"""
+                UPDATE sessions
+                SET {column} = json_set(COALESCE({column}, '{{}}'), ?, json(?)), last_updated = ?
+                WHERE uuid = ?
+            """, (json_path, _dumps(value), _now(), session_uuid))
+        self._invalidate_session(session_uuid)
+    
+    def _update_config_path_in_python(self, session_uuid: str, config_type: str, parts: list, value: Any):
+        """Read-modify-write fallback for update_config_path."""
+        # Only the target config is read and parsed; the write lock is held from
+        # the read on, so a concurrent edit can't be lost
+        column = 'ui_config' if config_type == 'ui' else 'character_config'
+        with self._connection() as conn, self._txn(conn):
+            row = conn.execute(f"SELECT {column} FROM sessions WHERE uuid = ?", (session_uuid,)).fetchone()
+            if not row:
+                return
+            
+            config = _loads(row[0]) if row[0] else {}
+            
+            # Navigate to the parent of the target path
+            current = config
+            for i, part in enumerate(parts[:-1]):
+                if part not in current:
+                    current[part] = {}
+                current = current[part]
+            
+            # Set the value
+            current[parts[-1]] = value
+            
+            conn.execute(f"""
+                UPDATE sessions
+                SET {column} = ?, last_updated = ?
+                WHERE uuid = ?
+            """, (_dumps(config), _now(), session_uuid))
+        self._invalidate_session(session_uuid)
 
     # ========================================================================
     # GEAR SET CRUD METHODS
     # ========================================================================
 
-    def get_gear_sets(self, session_uuid: str) -> list:
+    def get_gear_sets(self, session_uuid: str, include_slots: bool = True) -> list:
         """Get all gear sets for a session.
         
         Args:
             session_uuid: Session UUID to get gear sets for
+            include_slots: Load and parse slots_json; when False it is None (for name-only listings)
             
         Returns:
             List of gear set dictionaries with id, name, slots_json, is_optimized, timestamps
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT id, session_uuid, name, slots_json, export_string, is_optimized, created_at, updated_at
-            FROM gear_sets
-            WHERE session_uuid = ?
-            ORDER BY updated_at DESC
-        """, (session_uuid,))
-        
-        rows = cursor.fetchall()
+        slots_column = "slots_json" if include_slots else "NULL AS slots_json"
         
-        # Only close if not persistent connection
-        if not self._persistent_conn:
-            conn.close()
-        
-        gear_sets = []
-        for row in rows:
-            gear_sets.append({
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute(f"""
+                SELECT id, session_uuid, name, {slots_column}, export_string, is_optimized, created_at, updated_at
+                FROM gear_sets
+                WHERE session_uuid = ?
+                ORDER BY updated_at DESC
+            """, (session_uuid,))
+            
+            # Build the dicts straight off the cursor, no intermediate fetchall() list
+            return [{
                 'id': row[0],
                 'session_uuid': row[1],
                 'name': row[2],
-                'slots_json': json.loads(row[3]) if row[3] else {},
+                'slots_json': (_loads(row[3]) if row[3] else {}) if include_slots else None,
                 'export_string': row[4],
                 'is_optimized': bool(row[5]),
-                'created_at': row[6],
-                'updated_at': row[7]
-            })
-        
-        return gear_sets
+                'created_at': _to_iso(row[6]),
+                'updated_at': _to_iso(row[7])
+            } for row in cursor]
 
     def get_gear_set(self, session_uuid: str, gear_set_id: str) -> Optional[Dict[str, Any]]:
         """Get a specific gear set by ID.
@@ -413,20 +688,16 @@ class DatabaseManager:
         Returns:
             Gear set dictionary or None if not found
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT id, session_uuid, name, slots_json, created_at, updated_at
-            FROM gear_sets
-            WHERE id = ? AND session_uuid = ?
-        """, (gear_set_id, session_uuid))
-        
-        row = cursor.fetchone()
-        
-        # Only close if not persistent connection
-        if not self._persistent_conn:
-            conn.close()
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("""
+                SELECT id, session_uuid, name, slots_json, created_at, updated_at
+                FROM gear_sets
+                WHERE id = ? AND session_uuid = ?
+            """, (gear_set_id, session_uuid))
+            
+            row = cursor.fetchone()
         
         if not row:
             return None
@@ -435,9 +706,9 @@ class DatabaseManager:
             'id': row[0],
             'session_uuid': row[1],
             'name': row[2],
-            'slots_json': json.loads(row[3]) if row[3] else {},
-            'created_at': row[4],
-            'updated_at': row[5]
+            'slots_json': _loads(row[3]) if row[3] else {},
+            'created_at': _to_iso(row[4]),
+            'updated_at': _to_iso(row[5])
         }
 
     def get_gear_set_by_name(self, session_uuid: str, name: str) -> Optional[Dict[str, Any]]:
@@ -450,20 +721,16 @@ class DatabaseManager:
         Returns:
             Gear set dictionary or None if not found
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT id, session_uuid, name, slots_json, created_at, updated_at
-            FROM gear_sets
-            WHERE session_uuid = ? AND name = ?
-        """, (session_uuid, name))
-        
-        row = cursor.fetchone()
-        
-        # Only close if not persistent connection
-        if not self._persistent_conn:
-            conn.close()
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("""
+                SELECT id, session_uuid, name, slots_json, created_at, updated_at
+                FROM gear_sets
+                WHERE session_uuid = ? AND name = ?
+            """, (session_uuid, name))
+            
+            row = cursor.fetchone()
         
         if not row:
             return None
@@ -472,9 +739,9 @@ class DatabaseManager:
             'id': row[0],
             'session_uuid': row[1],
             'name': row[2],
-            'slots_json': json.loads(row[3]) if row[3] else {},
-            'created_at': row[4],
-            'updated_at': row[5]
+            'slots_json': _loads(row[3]) if row[3] else {},
+            'created_at': _to_iso(row[4]),
+            'updated_at': _to_iso(row[5])
         }
 
     def create_gear_set(self, session_uuid: str, name: str, slots_json: Dict[str, Any], is_optimized: bool = False, export_string: str = None) -> Dict[str, Any]:
@@ -498,22 +765,18 @@ class DatabaseManager:
         if existing:
             raise ValueError(f"A gear set with name '{name}' already exists")
         
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        gear_set_id = str(uuid.uuid4())
-        now = datetime.now().isoformat()
-        
-        cursor.execute("""
-            INSERT INTO gear_sets (id, session_uuid, name, slots_json, export_string, is_optimized, created_at, updated_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """, (gear_set_id, session_uuid, name, json.dumps(slots_json), export_string, 1 if is_optimized else 0, now, now))
-        
-        conn.commit()
-        
-        # Only close if not persistent connection
-        if not self._persistent_conn:
-            conn.close()
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            
+            gear_set_id = str(uuid.uuid4())
+            now = _now()
+            
+            cursor.execute("""
+                INSERT INTO gear_sets (id, session_uuid, name, slots_json, export_string, is_optimized, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, (gear_set_id, session_uuid, name, _dumps(slots_json), export_string, 1 if is_optimized else 0, now, now))
+            
+            conn.commit()
         
         return {
             'id': gear_set_id,
@@ -522,8 +785,8 @@ class DatabaseManager:
             'slots_json': slots_json,
             'export_string': export_string,
             'is_optimized': is_optimized,
-            'created_at': now,
-            'updated_at': now
+            'created_at': _to_iso(now),
+            'updated_at': _to_iso(now)
         }
 
     def update_gear_set(self, session_uuid: str, gear_set_id: str, 
@@ -543,18 +806,12 @@ class DatabaseManager:
         Raises:
             ValueError: If new name conflicts with existing gear set
         """
-        # Get existing gear set
-        existing = self.get_gear_set(session_uuid, gear_set_id)
-        if not existing:
-            return None
-        
-        # Check for name conflict if name is being changed
-        if name and name != existing['name']:
-            conflict = self.get_gear_set_by_name(session_uuid, name)
-            if conflict:
-                raise ValueError(f"A gear set with name '{name}' already exists")
-        
-        conn = self._get_connection()
+        with self._connection() as conn, self._txn(conn):
+            return self._update_gear_set_with_conn(conn, session_uuid, gear_set_id, name, slots_json)
+    
+    def _update_gear_set_with_conn(self, conn, session_uuid: str, gear_set_id: str,
+                                   name: Optional[str], slots_json: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """update_gear_set on the caller's connection, inside the caller's transaction."""
         cursor = conn.cursor()
         
         # Build update query
@@ -567,28 +824,37 @@ class DatabaseManager:
         
         if slots_json is not None:
             updates.append("slots_json = ?")
-            params.append(json.dumps(slots_json))
+            params.append(_dumps(slots_json))
         
         updates.append("updated_at = ?")
-        now = datetime.now().isoformat()
+        now = _now()
         params.append(now)
         
         params.extend([gear_set_id, session_uuid])
         
-        cursor.execute(f"""
-            UPDATE gear_sets
-            SET {', '.join(updates)}
-            WHERE id = ? AND session_uuid = ?
-        """, params)
-        
-        conn.commit()
+        # UNIQUE(session_uuid, name) rejects a rename onto another gear set's name
+        try:
+            cursor.execute(f"""
+                UPDATE gear_sets
+                SET {', '.join(updates)}
+                WHERE id = ? AND session_uuid = ?
+                RETURNING id, session_uuid, name, slots_json, created_at, updated_at
+            """, params)
+            row = cursor.fetchone()
+        except sqlite3.IntegrityError:
+            raise ValueError(f"A gear set with name '{name}' already exists")
         
-        # Only close if not persistent connection
-        if not self._persistent_conn:
-            conn.close()
+        if not row:
+            return None
         
-        # Return updated gear set
-        return self.get_gear_set(session_uuid, gear_set_id)
+        return {
+            'id': row[0],
+            'session_uuid': row[1],
+            'name': row[2],
+            'slots_json': slots_json if slots_json is not None else (_loads(row[3]) if row[3] else {}),
+            'created_at': _to_iso(row[4]),
+            'updated_at': _to_iso(row[5])
+        }
 
     def save_gear_set(self, session_uuid: str, name: str, slots_json: Dict[str, Any], 
                       gear_set_id: Optional[str] = None, is_optimized: bool = False, export_string: str = None) -> Dict[str, Any]:
@@ -608,19 +874,32 @@ class DatabaseManager:
         Returns:
             Saved gear set dictionary
         """
-        # If ID provided, try to update by ID
-        if gear_set_id:
-            existing = self.get_gear_set(session_uuid, gear_set_id)
-            if existing:
-                return self.update_gear_set(session_uuid, gear_set_id, name=name, slots_json=slots_json)
-        
-        # Check if name exists
-        existing_by_name = self.get_gear_set_by_name(session_uuid, name)
-        if existing_by_name:
-            return self.update_gear_set(session_uuid, existing_by_name['id'], slots_json=slots_json)
+        # One write transaction for the whole save, so the by-id update and the
+        # by-name upsert see the same state
+        with self._connection() as conn, self._txn(conn):
+            # If ID provided, try to update by ID
+            if gear_set_id:
+                updated = self._update_gear_set_with_conn(conn, session_uuid, gear_set_id, name, slots_json)
+                if updated:
+                    return updated
+            
+            # Insert, or overwrite the slots of the same-named gear set, in one statement
+            now = _now()
+            row = conn.execute(SQL_UPSERT_GEAR_SET, (
+                str(uuid.uuid4()), session_uuid, name, _dumps(slots_json), export_string,
+                1 if is_optimized else 0, now, now
+            )).fetchone()
         
-        # Create new
-        return self.create_gear_set(session_uuid, name, slots_json, is_optimized=is_optimized, export_string=export_string)
+        return {
+            'id': row[0],
+            'session_uuid': session_uuid,
+            'name': name,
+            'slots_json': slots_json,
+            'export_string': row[1],
+            'is_optimized': bool(row[2]),
+            'created_at': _to_iso(row[3]),
+            'updated_at': _to_iso(row[4])
+        }
 
     def delete_gear_set(self, session_uuid: str, gear_set_id: str) -> bool:
         """Delete a gear set.
@@ -632,20 +911,16 @@ class DatabaseManager:
         Returns:
             True if deleted, False if not found
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            DELETE FROM gear_sets
-            WHERE id = ? AND session_uuid = ?
-        """, (gear_set_id, session_uuid))
-        
-        deleted = cursor.rowcount > 0
-        conn.commit()
-        
-        # Only close if not persistent connection
-        if not self._persistent_conn:
-            conn.close()
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("""
+                DELETE FROM gear_sets
+                WHERE id = ? AND session_uuid = ?
+            """, (gear_set_id, session_uuid))
+            
+            deleted = cursor.rowcount > 0
+            conn.commit()
         
         return deleted
 
@@ -663,29 +938,27 @@ class DatabaseManager:
         Returns:
             List of preset dictionaries
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT id, session_uuid, name, preset_type, sorting_json, include_consumables, created_at, updated_at
-            FROM optimization_presets
-            WHERE session_uuid = ? AND preset_type = ?
-            ORDER BY updated_at DESC
-        """, (session_uuid, preset_type))
-        
-        rows = cursor.fetchall()
-        if not self._persistent_conn:
-            conn.close()
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("""
+                SELECT id, session_uuid, name, preset_type, sorting_json, include_consumables, created_at, updated_at
+                FROM optimization_presets
+                WHERE session_uuid = ? AND preset_type = ?
+                ORDER BY updated_at DESC
+            """, (session_uuid, preset_type))
+            
+            rows = cursor.fetchall()
         
         return [{
             'id': row[0],
             'session_uuid': row[1],
             'name': row[2],
             'preset_type': row[3],
-            'sorting': json.loads(row[4]) if row[4] else [],
+            'sorting': _loads(row[4]) if row[4] else [],
             'include_consumables': bool(row[5]),
-            'created_at': row[6],
-            'updated_at': row[7]
+            'created_at': _to_iso(row[6]),
+            'updated_at': _to_iso(row[7])
         } for row in rows]
 
     def save_optimization_preset(self, session_uuid: str, name: str, preset_type: str,
@@ -707,85 +980,75 @@ class DatabaseManager:
         Raises:
             ValueError: If name conflicts
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        now = datetime.now().isoformat()
-        sorting_json = json.dumps(sorting)
-        
-        # If ID provided, update by ID
-        if preset_id:
-            cursor.execute("""
-                SELECT id FROM optimization_presets WHERE id = ? AND session_uuid = ?
-            """, (preset_id, session_uuid))
-            if cursor.fetchone():
-                # Check name conflict with other presets
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            now = _now()
+            sorting_json = _dumps(sorting)
+            
+            # If ID provided, update by ID
+            if preset_id:
                 cursor.execute("""
-                    SELECT id FROM optimization_presets
-                    WHERE session_uuid = ? AND name = ? AND preset_type = ? AND id != ?
-                """, (session_uuid, name, preset_type, preset_id))
+                    SELECT id FROM optimization_presets WHERE id = ? AND session_uuid = ?
+                """, (preset_id, session_uuid))
                 if cursor.fetchone():
-                    if not self._persistent_conn:
-                        conn.close()
-                    raise ValueError(f"A preset with name '{name}' already exists")
-                
+                    # Check name conflict with other presets
+                    cursor.execute("""
+                        SELECT id FROM optimization_presets
+                        WHERE session_uuid = ? AND name = ? AND preset_type = ? AND id != ?
+                    """, (session_uuid, name, preset_type, preset_id))
+                    if cursor.fetchone():
+                        raise ValueError(f"A preset with name '{name}' already exists")
+                    
+                    cursor.execute("""
+                        UPDATE optimization_presets
+                        SET name = ?, sorting_json = ?, include_consumables = ?, updated_at = ?
+                        WHERE id = ? AND session_uuid = ?
+                    """, (name, sorting_json, 1 if include_consumables else 0, now, preset_id, session_uuid))
+                    conn.commit()
+                    return self._get_preset_by_id(session_uuid, preset_id)
+            
+            # Check for existing by name+type
+            cursor.execute("""
+                SELECT id FROM optimization_presets
+                WHERE session_uuid = ? AND name = ? AND preset_type = ?
+            """, (session_uuid, name, preset_type))
+            existing = cursor.fetchone()
+            
+            if existing:
+                # Update existing
                 cursor.execute("""
                     UPDATE optimization_presets
-                    SET name = ?, sorting_json = ?, include_consumables = ?, updated_at = ?
+                    SET sorting_json = ?, include_consumables = ?, updated_at = ?
                     WHERE id = ? AND session_uuid = ?
-                """, (name, sorting_json, 1 if include_consumables else 0, now, preset_id, session_uuid))
+                """, (sorting_json, 1 if include_consumables else 0, now, existing[0], session_uuid))
                 conn.commit()
-                if not self._persistent_conn:
-                    conn.close()
-                return self._get_preset_by_id(session_uuid, preset_id)
-        
-        # Check for existing by name+type
-        cursor.execute("""
-            SELECT id FROM optimization_presets
-            WHERE session_uuid = ? AND name = ? AND preset_type = ?
-        """, (session_uuid, name, preset_type))
-        existing = cursor.fetchone()
-        
-        if existing:
-            # Update existing
+                return self._get_preset_by_id(session_uuid, existing[0])
+            
+            # Create new
+            new_id = str(uuid.uuid4())
             cursor.execute("""
-                UPDATE optimization_presets
-                SET sorting_json = ?, include_consumables = ?, updated_at = ?
-                WHERE id = ? AND session_uuid = ?
-            """, (sorting_json, 1 if include_consumables else 0, now, existing[0], session_uuid))
+                INSERT INTO optimization_presets (id, session_uuid, name, preset_type, sorting_json, include_consumables, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, (new_id, session_uuid, name, preset_type, sorting_json, 1 if include_consumables else 0, now, now))
             conn.commit()
-            if not self._persistent_conn:
-                conn.close()
-            return self._get_preset_by_id(session_uuid, existing[0])
-        
-        # Create new
-        new_id = str(uuid.uuid4())
-        cursor.execute("""
-            INSERT INTO optimization_presets (id, session_uuid, name, preset_type, sorting_json, include_consumables, created_at, updated_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """, (new_id, session_uuid, name, preset_type, sorting_json, 1 if include_consumables else 0, now, now))
-        conn.commit()
-        if not self._persistent_conn:
-            conn.close()
         return self._get_preset_by_id(session_uuid, new_id)
 
     def _get_preset_by_id(self, session_uuid: str, preset_id: str) -> dict:
         """Get a single preset by ID."""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT id, session_uuid, name, preset_type, sorting_json, include_consumables, created_at, updated_at
-            FROM optimization_presets
-            WHERE id = ? AND session_uuid = ?
-        """, (preset_id, session_uuid))
-        row = cursor.fetchone()
-        if not self._persistent_conn:
-            conn.close()
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT id, session_uuid, name, preset_type, sorting_json, include_consumables, created_at, updated_at
+                FROM optimization_presets
+                WHERE id = ? AND session_uuid = ?
+            """, (preset_id, session_uuid))
+            row = cursor.fetchone()
         if not row:
             return None
         return {
             'id': row[0], 'session_uuid': row[1], 'name': row[2], 'preset_type': row[3],
-            'sorting': json.loads(row[4]) if row[4] else [], 'include_consumables': bool(row[5]),
-            'created_at': row[6], 'updated_at': row[7]
+            'sorting': _loads(row[4]) if row[4] else [], 'include_consumables': bool(row[5]),
+            'created_at': _to_iso(row[6]), 'updated_at': _to_iso(row[7])
         }
 
     def delete_optimization_preset(self, session_uuid: str, preset_id: str) -> bool:
@@ -794,15 +1057,13 @@ class DatabaseManager:
         Returns:
             True if deleted, False if not found
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-            DELETE FROM optimization_presets WHERE id = ? AND session_uuid = ?
-        """, (preset_id, session_uuid))
-        deleted = cursor.rowcount > 0
-        conn.commit()
-        if not self._persistent_conn:
-            conn.close()
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                DELETE FROM optimization_presets WHERE id = ? AND session_uuid = ?
+            """, (preset_id, session_uuid))
+            deleted = cursor.rowcount > 0
+            conn.commit()
         return deleted
 
     # ========================================================================
@@ -825,28 +1086,23 @@ class DatabaseManager:
         Returns:
             Created bug report dictionary
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        report_id = str(uuid.uuid4())
-        now = datetime.now().isoformat()
-        
-        cursor.execute("""
-            INSERT INTO bug_reports (
-                id, original_session_uuid, snapshot_session_uuid, description,
-                app_version, browser_info, timestamp, screenshots_json, reviewed
-            )
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, 0)
-        """, (
-            report_id, original_session_uuid, snapshot_session_uuid, description,
-            app_version, browser_info, now, 
-            json.dumps(screenshots_json) if screenshots_json else None
-        ))
-        
-        conn.commit()
-        
-        if not self._persistent_conn:
-            conn.close()
+        with self._connection() as conn, self._txn(conn):
+            cursor = conn.cursor()
+            
+            report_id = str(uuid.uuid4())
+            now = _now()
+            
+            cursor.execute("""
+                INSERT INTO bug_reports (
+                    id, original_session_uuid, snapshot_session_uuid, description,
+                    app_version, browser_info, timestamp, screenshots_json, reviewed
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, 0)
+            """, (
+                report_id, original_session_uuid, snapshot_session_uuid, description,
+                app_version, browser_info, now, 
+                _pack_json(screenshots_json) if screenshots_json else None
+            ))
         
         return {
             'id': report_id,
@@ -855,7 +1111,7 @@ class DatabaseManager:
             'description': description,
             'app_version': app_version,
             'browser_info': browser_info,
-            'timestamp': now,
+            'timestamp': _to_iso(now),
             'screenshots_json': screenshots_json,
             'reviewed': False,
             'reviewed_at': None,
@@ -863,59 +1119,55 @@ class DatabaseManager:
             'notes': None
         }
 
-    def get_bug_reports(self, reviewed: Optional[bool] = None) -> list:
+    def get_bug_reports(self, reviewed: Optional[bool] = None, include_screenshots: bool = False) -> list:
         """Get all bug reports, optionally filtered by reviewed status.
         
         Args:
             reviewed: If True, only reviewed reports. If False, only unreviewed. If None, all reports.
+            include_screenshots: Load and parse screenshots_json; when False it is None, so the
+                                 (large, base64) screenshot data is never read for list views
             
         Returns:
             List of bug report dictionaries
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        if reviewed is None:
-            cursor.execute("""
-                SELECT id, original_session_uuid, snapshot_session_uuid, description,
-                       app_version, browser_info, timestamp, screenshots_json,
-                       reviewed, reviewed_at, reviewed_by, notes
-                FROM bug_reports
-                ORDER BY timestamp DESC
-            """)
-        else:
-            cursor.execute("""
-                SELECT id, original_session_uuid, snapshot_session_uuid, description,
-                       app_version, browser_info, timestamp, screenshots_json,
-                       reviewed, reviewed_at, reviewed_by, notes
-                FROM bug_reports
-                WHERE reviewed = ?
-                ORDER BY timestamp DESC
-            """, (1 if reviewed else 0,))
-        
-        rows = cursor.fetchall()
-        
-        if not self._persistent_conn:
-            conn.close()
+        screenshots_column = "screenshots_json" if include_screenshots else "NULL AS screenshots_json"
         
-        reports = []
-        for row in rows:
-            reports.append({
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            
+            if reviewed is None:
+                cursor.execute(f"""
+                    SELECT id, original_session_uuid, snapshot_session_uuid, description,
+                           app_version, browser_info, timestamp, {screenshots_column},
+                           reviewed, reviewed_at, reviewed_by, notes
+                    FROM bug_reports
+                    ORDER BY timestamp DESC
+                """)
+            else:
+                cursor.execute(f"""
+                    SELECT id, original_session_uuid, snapshot_session_uuid, description,
+                           app_version, browser_info, timestamp, {screenshots_column},
+                           reviewed, reviewed_at, reviewed_by, notes
+                    FROM bug_reports
+                    WHERE reviewed = ?
+                    ORDER BY timestamp DESC
+                """, (1 if reviewed else 0,))
+            
+            # Build the dicts straight off the cursor, no intermediate fetchall() list
+            return [{
                 'id': row[0],
                 'original_session_uuid': row[1],
                 'snapshot_session_uuid': row[2],
                 'description': row[3],
                 'app_version': row[4],
                 'browser_info': row[5],
-                'timestamp': row[6],
-                'screenshots_json': json.loads(row[7]) if row[7] else None,
+                'timestamp': _to_iso(row[6]),
+                'screenshots_json': _unpack_json(row[7]) if row[7] else None,
                 'reviewed': bool(row[8]),
-                'reviewed_at': row[9],
+                'reviewed_at': _to_iso(row[9]),
                 'reviewed_by': row[10],
                 'notes': row[11]
-            })
-        
-        return reports
+            } for row in cursor]
 
     def get_bug_report(self, report_id: str) -> Optional[Dict[str, Any]]:
         """Get a specific bug report by ID.
@@ -926,21 +1178,18 @@ class DatabaseManager:
         Returns:
             Bug report dictionary or None if not found
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT id, original_session_uuid, snapshot_session_uuid, description,
-                   app_version, browser_info, timestamp, screenshots_json,
-                   reviewed, reviewed_at, reviewed_by, notes
-            FROM bug_reports
-            WHERE id = ?
-        """, (report_id,))
-        
-        row = cursor.fetchone()
-        
-        if not self._persistent_conn:
-            conn.close()
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("""
+                SELECT id, original_session_uuid, snapshot_session_uuid, description,
+                       app_version, browser_info, timestamp, screenshots_json,
+                       reviewed, reviewed_at, reviewed_by, notes
+                FROM bug_reports
+                WHERE id = ?
+            """, (report_id,))
+            
+            row = cursor.fetchone()
         
         if not row:
             return None
@@ -952,10 +1201,10 @@ class DatabaseManager:
             'description': row[3],
             'app_version': row[4],
             'browser_info': row[5],
-            'timestamp': row[6],
-            'screenshots_json': json.loads(row[7]) if row[7] else None,
+            'timestamp': _to_iso(row[6]),
+            'screenshots_json': _unpack_json(row[7]) if row[7] else None,
             'reviewed': bool(row[8]),
-            'reviewed_at': row[9],
+            'reviewed_at': _to_iso(row[9]),
             'reviewed_by': row[10],
             'notes': row[11]
         }
@@ -971,20 +1220,17 @@ class DatabaseManager:
         Returns:
             True if updated, False if not found
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            UPDATE bug_reports
-            SET reviewed = 1, reviewed_at = ?, reviewed_by = ?, notes = ?
-            WHERE id = ?
-        """, (datetime.now().isoformat(), reviewed_by, notes, report_id))
-        
-        updated = cursor.rowcount > 0
-        conn.commit()
-        
-        if not self._persistent_conn:
-            conn.close()
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("""
+                UPDATE bug_reports
+                SET reviewed = 1, reviewed_at = ?, reviewed_by = ?, notes = ?
+                WHERE id = ?
+            """, (_now(), reviewed_by, notes, report_id))
+            
+            updated = cursor.rowcount > 0
+            conn.commit()
         
         return updated
 
@@ -997,26 +1243,24 @@ class DatabaseManager:
         Returns:
             True if session was deleted, False if not found
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        # Delete associated gear sets
-        cursor.execute("DELETE FROM gear_sets WHERE session_uuid = ?", (session_uuid,))
-        
-        # Delete associated debug session entry if exists
-        cursor.execute("DELETE FROM debug_sessions WHERE session_uuid = ?", (session_uuid,))
-        
-        # Delete associated broadcast dismissals
-        cursor.execute("DELETE FROM broadcast_dismissals WHERE session_uuid = ?", (session_uuid,))
-        
-        # Delete the session itself
-        cursor.execute("DELETE FROM sessions WHERE uuid = ?", (session_uuid,))
-        deleted = cursor.rowcount > 0
-        
-        conn.commit()
-        
-        if not self._persistent_conn:
-            conn.close()
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            
+            # Delete associated gear sets
+            cursor.execute("DELETE FROM gear_sets WHERE session_uuid = ?", (session_uuid,))
+            
+            # Delete associated debug session entry if exists
+            cursor.execute("DELETE FROM debug_sessions WHERE session_uuid = ?", (session_uuid,))
+            
+            # Delete associated broadcast dismissals
+            cursor.execute("DELETE FROM broadcast_dismissals WHERE session_uuid = ?", (session_uuid,))
+            
+            # Delete the session itself
+            cursor.execute("DELETE FROM sessions WHERE uuid = ?", (session_uuid,))
+            deleted = cursor.rowcount > 0
+            
+            conn.commit()
+        self._invalidate_session(session_uuid)
         
         return deleted
 
@@ -1026,17 +1270,14 @@ class DatabaseManager:
         Returns:
             Number of snapshot sessions deleted
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        # Get all snapshot session UUIDs from reviewed bug reports
-        cursor.execute("""
-            SELECT snapshot_session_uuid FROM bug_reports WHERE reviewed = 1
-        """)
-        rows = cursor.fetchall()
-        
-        if not self._persistent_conn:
-            conn.close()
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            
+            # Get all snapshot session UUIDs from reviewed bug reports
+            cursor.execute("""
+                SELECT snapshot_session_uuid FROM bug_reports WHERE reviewed = 1
+            """)
+            rows = cursor.fetchall()
         
         deleted_count = 0
         for row in rows:
@@ -1053,6 +1294,9 @@ class DatabaseManager:
                        user_agent: Optional[str] = None, ip_address: Optional[str] = None):
         """Log an API access event.
         
+        The row is queued and written in a batch by a background thread
+        (see flush_api_access), so this does no database work itself.
+        
         Args:
             session_uuid: Session UUID making the request
             endpoint: API endpoint accessed (e.g., '/api/catalog', '/api/session')
@@ -1060,18 +1304,49 @@ class DatabaseManager:
             user_agent: User agent string (optional)
             ip_address: IP address (optional)
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            INSERT INTO api_access_audit (session_uuid, endpoint, method, user_agent, ip_address, timestamp)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """, (session_uuid, endpoint, method, user_agent, ip_address, datetime.now().isoformat()))
-        
-        conn.commit()
+        self._audit_queue.append(
+            (session_uuid, endpoint, method, user_agent, ip_address, _now())
+        )
         
-        if not self._persistent_conn:
-            conn.close()
+        if self._persistent_conn:
+            # In-memory databases share one connection; write right away
+            self.flush_api_access()
+        elif self._audit_thread is None:
+            self._start_audit_thread()
+    
+    def flush_api_access(self):
+        """Write all queued API access rows, one executemany + commit per batch."""
+        queue = self._audit_queue
+        while queue:
+            batch = []
+            while queue and len(batch) < AUDIT_BATCH_SIZE:
+                batch.append(queue.popleft())
+            
+            with self._connection() as conn:
+                conn.executemany(SQL_INSERT_API_ACCESS, batch)
+                conn.commit()
+    
+    def _start_audit_thread(self):
+        """Start the background thread that flushes queued API access rows."""
+        with self._audit_thread_lock:
+            if self._audit_thread is not None:
+                return
+            self._audit_thread = threading.Thread(
+                target=self._audit_flush_loop, name="api-access-audit", daemon=True
+            )
+            self._audit_thread.start()
+            # Write whatever is still queued when the process exits
+            atexit.register(self.flush_api_access)
+    
+    def _audit_flush_loop(self):
+        """Flush queued API access rows every AUDIT_FLUSH_INTERVAL seconds."""
+        while True:
+            time.sleep(AUDIT_FLUSH_INTERVAL)
+            try:
+                self.flush_api_access()
+            except Exception as e:
+                # Access logging is best effort; drop the failed batch and keep going
+                print(f"⚠️  Failed to write API access log: {e}")
 
     def get_api_access_stats(self, days: int = 7) -> Dict[str, Any]:
         """Get API access statistics for the last N days.
@@ -1089,69 +1364,71 @@ class DatabaseManager:
         """
         from datetime import timedelta
         
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
         # Calculate cutoff date using timedelta
         cutoff = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
         cutoff = cutoff - timedelta(days=days)
-        cutoff_str = cutoff.isoformat()
-        
-        # Total requests
-        cursor.execute("""
-            SELECT COUNT(*) FROM api_access_audit
-            WHERE timestamp >= ?
-        """, (cutoff_str,))
-        total_requests = cursor.fetchone()[0]
+        cutoff_ms = int(cutoff.timestamp() * 1000)
         
-        # Unique sessions
-        cursor.execute("""
-            SELECT COUNT(DISTINCT session_uuid) FROM api_access_audit
-            WHERE timestamp >= ?
-        """, (cutoff_str,))
-        unique_sessions = cursor.fetchone()[0]
+        # Recent result for the same window (a new day moves the cutoff and misses)
+        with self._stats_cache_lock:
+            cached = self._stats_cache.get(days)
+        if cached is not None and cached[0] > time.monotonic() and cached[1] == cutoff_ms:
+            return _copy_json(cached[2])
         
-        # Requests by endpoint
-        cursor.execute("""
-            SELECT endpoint, COUNT(*) as count
-            FROM api_access_audit
-            WHERE timestamp >= ?
-            GROUP BY endpoint
-            ORDER BY count DESC
-        """, (cutoff_str,))
-        requests_by_endpoint = {row[0]: row[1] for row in cursor.fetchall()}
-        
-        # Requests by day
-        cursor.execute("""
-            SELECT DATE(timestamp) as day, COUNT(*) as count
-            FROM api_access_audit
-            WHERE timestamp >= ?
-            GROUP BY day
-            ORDER BY day DESC
-        """, (cutoff_str,))
-        requests_by_day = {row[0]: row[1] for row in cursor.fetchall()}
-        
-        # Top sessions
-        cursor.execute("""
-            SELECT session_uuid, COUNT(*) as count
-            FROM api_access_audit
-            WHERE timestamp >= ?
-            GROUP BY session_uuid
-            ORDER BY count DESC
-            LIMIT 10
-        """, (cutoff_str,))
-        top_sessions = [(row[0], row[1]) for row in cursor.fetchall()]
-        
-        if not self._persistent_conn:
-            conn.close()
+        # Include rows still waiting in the audit queue
+        self.flush_api_access()
         
-        return {
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            
+            # Requests per (session, endpoint) pair: one range scan over the window,
+            # from which totals, unique sessions, endpoint counts and top sessions
+            # are all summed here. The unary + keeps the planner on the timestamp
+            # range rather than walking all of history in session_uuid order.
+            cursor.execute("""
+                SELECT session_uuid, endpoint, COUNT(*) as count
+                FROM api_access_audit
+                WHERE timestamp >= ?
+                GROUP BY +session_uuid, endpoint
+            """, (cutoff_ms,))
+            counts_by_session = {}
+            counts_by_endpoint = {}
+            for session_uuid, endpoint, count in cursor:
+                counts_by_session[session_uuid] = counts_by_session.get(session_uuid, 0) + count
+                counts_by_endpoint[endpoint] = counts_by_endpoint.get(endpoint, 0) + count
+            
+            total_requests = sum(counts_by_endpoint.values())
+            unique_sessions = len(counts_by_session)
+            requests_by_endpoint = dict(sorted(counts_by_endpoint.items(), key=lambda item: item[1], reverse=True))
+            top_sessions = sorted(counts_by_session.items(), key=lambda item: item[1], reverse=True)[:10]
+            
+            # Requests by day. SQL only buckets by integer division (no per-row
+            # DATE(..., 'localtime')); the few hundred buckets are folded into local
+            # dates here. Every UTC offset is a multiple of 15 minutes, so no bucket
+            # straddles a local midnight.
+            cursor.execute("""
+                SELECT timestamp / ? AS bucket, COUNT(*) as count
+                FROM api_access_audit
+                WHERE timestamp >= ?
+                GROUP BY bucket
+            """, (DAY_BUCKET_MS, cutoff_ms))
+            counts_by_day = {}
+            for bucket, count in cursor:
+                day = datetime.fromtimestamp(bucket * DAY_BUCKET_MS / 1000).date().isoformat()
+                counts_by_day[day] = counts_by_day.get(day, 0) + count
+            requests_by_day = {day: counts_by_day[day] for day in sorted(counts_by_day, reverse=True)}
+        
+        stats = {
             'total_requests': total_requests,
             'unique_sessions': unique_sessions,
             'requests_by_endpoint': requests_by_endpoint,
             'requests_by_day': requests_by_day,
             'top_sessions': top_sessions
         }
+        with self._stats_cache_lock:
+            self._stats_cache[days] = (time.monotonic() + STATS_CACHE_TTL, cutoff_ms, stats)
+        # Callers may modify the result, so the cached copy is never handed out
+        return _copy_json(stats)
 
     def get_session_api_access(self, session_uuid: str, limit: int = 100) -> list:
         """Get API access history for a specific session.
@@ -1163,21 +1440,21 @@ class DatabaseManager:
         Returns:
             List of access log dictionaries
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
+        # Include rows still waiting in the audit queue
+        self.flush_api_access()
         
-        cursor.execute("""
-            SELECT id, session_uuid, endpoint, method, timestamp, user_agent, ip_address
-            FROM api_access_audit
-            WHERE session_uuid = ?
-            ORDER BY timestamp DESC
-            LIMIT ?
-        """, (session_uuid, limit))
-        
-        rows = cursor.fetchall()
-        
-        if not self._persistent_conn:
-            conn.close()
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("""
+                SELECT id, session_uuid, endpoint, method, timestamp, user_agent, ip_address
+                FROM api_access_audit
+                WHERE session_uuid = ?
+                ORDER BY timestamp DESC
+                LIMIT ?
+            """, (session_uuid, limit))
+            
+            rows = cursor.fetchall()
         
         logs = []
         for row in rows:
@@ -1186,7 +1463,7 @@ class DatabaseManager:
                 'session_uuid': row[1],
                 'endpoint': row[2],
                 'method': row[3],
-                'timestamp': row[4],
+                'timestamp': _to_iso(row[4]),
                 'user_agent': row[5],
                 'ip_address': row[6]
             })
@@ -1203,39 +1480,36 @@ class DatabaseManager:
         Returns:
             Tuple of (list of dicts with uuid/name/last_updated, total_count)
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
-
-        # Build query — filter to sessions that have a character_config with a name
-        base_where = "WHERE character_config IS NOT NULL AND json_extract(character_config, '$.name') IS NOT NULL"
-        params = []
+        with self._connection() as conn:
+            cursor = conn.cursor()
 
-        if search:
-            base_where += " AND json_extract(character_config, '$.name') LIKE ?"
-            params.append(f'%{search}%')
+            # Build query — filter to sessions that have a character_config with a name
+            base_where = "WHERE character_config IS NOT NULL AND json_extract(character_config, '$.name') IS NOT NULL"
+            params = []
 
-        # Get total count
-        cursor.execute(f"SELECT COUNT(*) FROM sessions {base_where}", params)
-        total = cursor.fetchone()[0]
+            if search:
+                base_where += " AND json_extract(character_config, '$.name') LIKE ?"
+                params.append(f'%{search}%')
 
-        # Get page of results
-        cursor.execute(f"""
-            SELECT uuid, character_config, last_updated
-            FROM sessions
-            {base_where}
-            ORDER BY last_updated DESC
-            LIMIT ? OFFSET ?
-        """, params + [limit, offset])
+            # Get total count
+            cursor.execute(f"SELECT COUNT(*) FROM sessions {base_where}", params)
+            total = cursor.fetchone()[0]
 
-        rows = cursor.fetchall()
+            # Get page of results
+            cursor.execute(f"""
+                SELECT uuid, character_config, last_updated
+                FROM sessions
+                {base_where}
+                ORDER BY last_updated DESC
+                LIMIT ? OFFSET ?
+            """, params + [limit, offset])
 
-        if not self._persistent_conn:
-            conn.close()
+            rows = cursor.fetchall()
 
         results = []
         for row in rows:
             try:
-                config = json.loads(row[1]) if row[1] else {}
+                config = _loads(row[1]) if row[1] else {}
             except (json.JSONDecodeError, TypeError):
                 config = {}
 
@@ -1243,7 +1517,7 @@ class DatabaseManager:
                 'uuid': row[0],
                 'name': config.get('name', 'Unknown'),
                 'steps': config.get('steps', 0),
-                'last_updated': row[2],
+                'last_updated': _to_iso(row[2]),
             })
 
         return results, total
@@ -1262,63 +1536,61 @@ class DatabaseManager:
                 active_7d: int
                 top_5_recent: list of {uuid, name, steps, last_updated}
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
+        with self._connection() as conn:
+            cursor = conn.cursor()
 
-        # Total sessions
-        cursor.execute("SELECT COUNT(*) FROM sessions")
-        total_sessions = cursor.fetchone()[0]
+            # Total sessions
+            cursor.execute("SELECT COUNT(*) FROM sessions")
+            total_sessions = cursor.fetchone()[0]
 
-        # Sessions with characters (non-null character_config with a name)
-        cursor.execute("""
-            SELECT COUNT(*) FROM sessions
-            WHERE character_config IS NOT NULL
-              AND json_extract(character_config, '$.name') IS NOT NULL
-        """)
-        sessions_with_characters = cursor.fetchone()[0]
-
-        # Total gear sets
-        cursor.execute("SELECT COUNT(*) FROM gear_sets")
-        total_gear_sets = cursor.fetchone()[0]
+            # Sessions with characters (non-null character_config with a name)
+            cursor.execute("""
+                SELECT COUNT(*) FROM sessions
+                WHERE character_config IS NOT NULL
+                  AND json_extract(character_config, '$.name') IS NOT NULL
+            """)
+            sessions_with_characters = cursor.fetchone()[0]
 
-        # Total bug reports
-        cursor.execute("SELECT COUNT(*) FROM bug_reports")
-        total_bug_reports = cursor.fetchone()[0]
+            # Total gear sets
+            cursor.execute("SELECT COUNT(*) FROM gear_sets")
+            total_gear_sets = cursor.fetchone()[0]
 
-        # Unreviewed bug reports
-        cursor.execute("SELECT COUNT(*) FROM bug_reports WHERE reviewed = 0")
-        unreviewed_bug_reports = cursor.fetchone()[0]
+            # Total bug reports
+            cursor.execute("SELECT COUNT(*) FROM bug_reports")
+            total_bug_reports = cursor.fetchone()[0]
 
-        # Sessions active in last 24 hours
-        cursor.execute("""
-            SELECT COUNT(*) FROM sessions
-            WHERE last_updated >= datetime('now', '-1 day')
-        """)
-        active_24h = cursor.fetchone()[0]
+            # Unreviewed bug reports
+            cursor.execute("SELECT COUNT(*) FROM bug_reports WHERE reviewed = 0")
+            unreviewed_bug_reports = cursor.fetchone()[0]
 
-        # Sessions active in last 7 days
-        cursor.execute("""
-            SELECT COUNT(*) FROM sessions
-            WHERE last_updated >= datetime('now', '-7 days')
-        """)
-        active_7d = cursor.fetchone()[0]
+            # Sessions active in last 24 hours
+            now = _now()
+            cursor.execute("""
+                SELECT COUNT(*) FROM sessions
+                WHERE last_updated >= ?
+            """, (now - 86400000,))
+            active_24h = cursor.fetchone()[0]
 
-        # Top 5 most recently active sessions with character names
-        cursor.execute("""
-            SELECT uuid, character_config, last_updated
-            FROM sessions
-            ORDER BY last_updated DESC
-            LIMIT 5
-        """)
-        rows = cursor.fetchall()
+            # Sessions active in last 7 days
+            cursor.execute("""
+                SELECT COUNT(*) FROM sessions
+                WHERE last_updated >= ?
+            """, (now - 7 * 86400000,))
+            active_7d = cursor.fetchone()[0]
 
-        if not self._persistent_conn:
-            conn.close()
+            # Top 5 most recently active sessions with character names
+            cursor.execute("""
+                SELECT uuid, character_config, last_updated
+                FROM sessions
+                ORDER BY last_updated DESC
+                LIMIT 5
+            """)
+            rows = cursor.fetchall()
 
         top_5_recent = []
         for row in rows:
             try:
-                config = json.loads(row[1]) if row[1] else {}
+                config = _loads(row[1]) if row[1] else {}
             except (json.JSONDecodeError, TypeError):
                 config = {}
 
@@ -1326,7 +1598,7 @@ class DatabaseManager:
                 'uuid': row[0],
                 'name': config.get('name', None),
                 'steps': config.get('steps', 0),
-                'last_updated': row[2],
+                'last_updated': _to_iso(row[2]),
             })
 
         return {
@@ -1351,36 +1623,33 @@ class DatabaseManager:
         Returns:
             Tuple of (list of {uuid, name, steps, last_updated}, total_count)
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
-
-        time_filter = f"-{hours} hours"
+        with self._connection() as conn:
+            cursor = conn.cursor()
 
-        # Get total count of active sessions
-        cursor.execute("""
-            SELECT COUNT(*) FROM sessions
-            WHERE last_updated >= datetime('now', ?)
-        """, (time_filter,))
-        total = cursor.fetchone()[0]
+            cutoff_ms = _now() - hours * 3600000
 
-        # Get page of results
-        cursor.execute("""
-            SELECT uuid, character_config, last_updated
-            FROM sessions
-            WHERE last_updated >= datetime('now', ?)
-            ORDER BY last_updated DESC
-            LIMIT ? OFFSET ?
-        """, (time_filter, limit, offset))
+            # Get total count of active sessions
+            cursor.execute("""
+                SELECT COUNT(*) FROM sessions
+                WHERE last_updated >= ?
+            """, (cutoff_ms,))
+            total = cursor.fetchone()[0]
 
-        rows = cursor.fetchall()
+            # Get page of results
+            cursor.execute("""
+                SELECT uuid, character_config, last_updated
+                FROM sessions
+                WHERE last_updated >= ?
+                ORDER BY last_updated DESC
+                LIMIT ? OFFSET ?
+            """, (cutoff_ms, limit, offset))
 
-        if not self._persistent_conn:
-            conn.close()
+            rows = cursor.fetchall()
 
         results = []
         for row in rows:
             try:
-                config = json.loads(row[1]) if row[1] else {}
+                config = _loads(row[1]) if row[1] else {}
             except (json.JSONDecodeError, TypeError):
                 config = {}
 
@@ -1388,7 +1657,7 @@ class DatabaseManager:
                 'uuid': row[0],
                 'name': config.get('name', None),
                 'steps': config.get('steps', 0),
-                'last_updated': row[2],
+                'last_updated': _to_iso(row[2]),
             })
 
         return results, total
@@ -1409,24 +1678,19 @@ class DatabaseManager:
         Returns:
             True if debug was enabled, False if session doesn't exist
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
-
-        # Validate session exists
-        cursor.execute("SELECT uuid FROM sessions WHERE uuid = ?", (session_uuid,))
-        if not cursor.fetchone():
-            if not self._persistent_conn:
-                conn.close()
-            return False
+        with self._connection() as conn:
+            cursor = conn.cursor()
 
-        cursor.execute("""
-            INSERT OR REPLACE INTO debug_sessions (session_uuid, enabled_at, enabled_by)
-            VALUES (?, CURRENT_TIMESTAMP, ?)
-        """, (session_uuid, enabled_by))
-        conn.commit()
+            # Validate session exists
+            cursor.execute("SELECT uuid FROM sessions WHERE uuid = ?", (session_uuid,))
+            if not cursor.fetchone():
+                return False
 
-        if not self._persistent_conn:
-            conn.close()
+            cursor.execute("""
+                INSERT OR REPLACE INTO debug_sessions (session_uuid, enabled_at, enabled_by)
+                VALUES (?, CURRENT_TIMESTAMP, ?)
+            """, (session_uuid, enabled_by))
+            conn.commit()
         return True
 
     def disable_debug_session(self, session_uuid: str) -> bool:
@@ -1438,18 +1702,15 @@ class DatabaseManager:
         Returns:
             True if a record was deleted, False if none existed
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
+        with self._connection() as conn:
+            cursor = conn.cursor()
 
-        cursor.execute(
-            "DELETE FROM debug_sessions WHERE session_uuid = ?",
-            (session_uuid,)
-        )
-        deleted = cursor.rowcount > 0
-        conn.commit()
-
-        if not self._persistent_conn:
-            conn.close()
+            cursor.execute(
+                "DELETE FROM debug_sessions WHERE session_uuid = ?",
+                (session_uuid,)
+            )
+            deleted = cursor.rowcount > 0
+            conn.commit()
         return deleted
 
     def is_debug_enabled(self, session_uuid: str) -> bool:
@@ -1461,17 +1722,14 @@ class DatabaseManager:
         Returns:
             True if debug is enabled, False otherwise
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute(
-            "SELECT 1 FROM debug_sessions WHERE session_uuid = ?",
-            (session_uuid,)
-        )
-        result = cursor.fetchone() is not None
+        with self._connection() as conn:
+            cursor = conn.cursor()
 
-        if not self._persistent_conn:
-            conn.close()
+            cursor.execute(
+                "SELECT 1 FROM debug_sessions WHERE session_uuid = ?",
+                (session_uuid,)
+            )
+            result = cursor.fetchone() is not None
         return result
 
     def list_debug_sessions(self) -> list:
@@ -1480,18 +1738,15 @@ class DatabaseManager:
         Returns:
             List of dicts with session_uuid, enabled_at, enabled_by
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
+        with self._connection() as conn:
+            cursor = conn.cursor()
 
-        cursor.execute("""
-            SELECT session_uuid, enabled_at, enabled_by
-            FROM debug_sessions
-            ORDER BY enabled_at DESC
-        """)
-        rows = cursor.fetchall()
-
-        if not self._persistent_conn:
-            conn.close()
+            cursor.execute("""
+                SELECT session_uuid, enabled_at, enabled_by
+                FROM debug_sessions
+                ORDER BY enabled_at DESC
+            """)
+            rows = cursor.fetchall()
 
         return [
             {
@@ -1516,28 +1771,25 @@ class DatabaseManager:
         Returns:
             Dict with broadcast id, message, created_at, created_by, active
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
+        with self._connection() as conn:
+            cursor = conn.cursor()
 
-        # Deactivate existing active broadcasts
-        cursor.execute("UPDATE broadcasts SET active = 0 WHERE active = 1")
+            # Deactivate existing active broadcasts
+            cursor.execute("UPDATE broadcasts SET active = 0 WHERE active = 1")
 
-        broadcast_id = str(uuid.uuid4())
-        cursor.execute("""
-            INSERT INTO broadcasts (id, message, created_at, created_by, active)
-            VALUES (?, ?, CURRENT_TIMESTAMP, ?, 1)
-        """, (broadcast_id, message, created_by))
-        conn.commit()
-
-        # Fetch the created record to get the timestamp
-        cursor.execute(
-            "SELECT id, message, created_at, created_by, active FROM broadcasts WHERE id = ?",
-            (broadcast_id,)
-        )
-        row = cursor.fetchone()
+            broadcast_id = str(uuid.uuid4())
+            cursor.execute("""
+                INSERT INTO broadcasts (id, message, created_at, created_by, active)
+                VALUES (?, ?, CURRENT_TIMESTAMP, ?, 1)
+            """, (broadcast_id, message, created_by))
+            conn.commit()
 
-        if not self._persistent_conn:
-            conn.close()
+            # Fetch the created record to get the timestamp
+            cursor.execute(
+                "SELECT id, message, created_at, created_by, active FROM broadcasts WHERE id = ?",
+                (broadcast_id,)
+            )
+            row = cursor.fetchone()
 
         return {
             'id': row[0],
@@ -1553,15 +1805,12 @@ class DatabaseManager:
         Returns:
             True if any broadcast was deactivated, False if none were active
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute("UPDATE broadcasts SET active = 0 WHERE active = 1")
-        changed = cursor.rowcount > 0
-        conn.commit()
+        with self._connection() as conn:
+            cursor = conn.cursor()
 
-        if not self._persistent_conn:
-            conn.close()
+            cursor.execute("UPDATE broadcasts SET active = 0 WHERE active = 1")
+            changed = cursor.rowcount > 0
+            conn.commit()
         return changed
 
     def get_active_broadcast(self) -> Optional[Dict[str, Any]]:
@@ -1570,20 +1819,17 @@ class DatabaseManager:
         Returns:
             Dict with broadcast data or None if no active broadcast
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
+        with self._connection() as conn:
+            cursor = conn.cursor()
 
-        cursor.execute("""
-            SELECT id, message, created_at, created_by, active
-            FROM broadcasts
-            WHERE active = 1
-            ORDER BY created_at DESC
-            LIMIT 1
-        """)
-        row = cursor.fetchone()
-
-        if not self._persistent_conn:
-            conn.close()
+            cursor.execute("""
+                SELECT id, message, created_at, created_by, active
+                FROM broadcasts
+                WHERE active = 1
+                ORDER BY created_at DESC
+                LIMIT 1
+            """)
+            row = cursor.fetchone()
 
         if not row:
             return None
@@ -1608,21 +1854,18 @@ class DatabaseManager:
         Returns:
             True on success (including duplicate dismissal)
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
+        with self._connection() as conn:
+            cursor = conn.cursor()
 
-        try:
-            cursor.execute("""
-                INSERT INTO broadcast_dismissals (broadcast_id, session_uuid, dismissed_at)
-                VALUES (?, ?, CURRENT_TIMESTAMP)
-            """, (broadcast_id, session_uuid))
-            conn.commit()
-        except sqlite3.IntegrityError:
-            # Duplicate dismissal — that's fine, idempotent
-            pass
-
-        if not self._persistent_conn:
-            conn.close()
+            try:
+                cursor.execute("""
+                    INSERT INTO broadcast_dismissals (broadcast_id, session_uuid, dismissed_at)
+                    VALUES (?, ?, CURRENT_TIMESTAMP)
+                """, (broadcast_id, session_uuid))
+                conn.commit()
+            except sqlite3.IntegrityError:
+                # Duplicate dismissal — that's fine, idempotent
+                pass
         return True
 
     def get_broadcast_dismissal_count(self, broadcast_id: str) -> int:
@@ -1634,17 +1877,14 @@ class DatabaseManager:
         Returns:
             Count of dismissals
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
+        with self._connection() as conn:
+            cursor = conn.cursor()
 
-        cursor.execute(
-            "SELECT COUNT(*) FROM broadcast_dismissals WHERE broadcast_id = ?",
-            (broadcast_id,)
-        )
-        count = cursor.fetchone()[0]
-
-        if not self._persistent_conn:
-            conn.close()
+            cursor.execute(
+                "SELECT COUNT(*) FROM broadcast_dismissals WHERE broadcast_id = ?",
+                (broadcast_id,)
+            )
+            count = cursor.fetchone()[0]
         return count
 
     def list_broadcasts(self, limit: int = 50) -> list:
@@ -1656,19 +1896,16 @@ class DatabaseManager:
         Returns:
             List of dicts with id, message, created_at, created_by, active
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
+        with self._connection() as conn:
+            cursor = conn.cursor()
 
-        cursor.execute("""
-            SELECT id, message, created_at, created_by, active
-            FROM broadcasts
-            ORDER BY created_at DESC
-            LIMIT ?
-        """, (limit,))
-        rows = cursor.fetchall()
-
-        if not self._persistent_conn:
-            conn.close()
+            cursor.execute("""
+                SELECT id, message, created_at, created_by, active
+                FROM broadcasts
+                ORDER BY created_at DESC
+                LIMIT ?
+            """, (limit,))
+            rows = cursor.fetchall()
 
         return [
             {
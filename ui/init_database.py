@@ -9,7 +9,8 @@ Usage:
     python3 init_database.py [--force]
 
 Options:
-    --force    Overwrite existing database (WARNING: destroys all data)
+    --force    Overwrite existing database, including its -wal/-shm files
+               (WARNING: destroys all data)
 """
 
 import sys
@@ -36,6 +37,12 @@ def init_database(db_path: str = "sessions.db", force: bool = False):
         else:
             print(f"⚠️  Removing existing database at {db_path}")
             db_file.unlink()
+            # WAL mode keeps uncheckpointed pages in sidecar files; a stale
+            # -wal left next to the new database would be replayed into it
+            for suffix in ('-wal', '-shm'):
+                sidecar = Path(str(db_file) + suffix)
+                if sidecar.exists():
+                    sidecar.unlink()
     
     print(f"📝 Creating new database at {db_path}")
     
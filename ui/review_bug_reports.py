@@ -142,7 +142,7 @@ def review_report(db, report):
     print_session_summary(snapshot_session)
     
     # Show gear sets
-    gear_sets = db.get_gear_sets(report['snapshot_session_uuid'])
+    gear_sets = db.get_gear_sets(report['snapshot_session_uuid'], include_slots=False)
     if gear_sets:
         print(f"\n  Gear Sets: {len(gear_sets)}")
         for gs in gear_sets:
@@ -219,7 +219,7 @@ def main():
     db = DatabaseManager(DATABASE_PATH)
     
     # Get unreviewed reports
-    reports = db.get_bug_reports(reviewed=False)
+    reports = db.get_bug_reports(reviewed=False, include_screenshots=True)
     
     if not reports:
         print("\n✓ No unreviewed reports!")
@@ -13,7 +13,7 @@ Functions:
 
 # Standard library imports
 import math
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 
 # ============================================================================
 # ACTIVITY METRICS
@@ -85,23 +85,57 @@ def calculate_activity_metrics(
         if steps_percent is None:
             steps_percent = 0.0
     
+    expected_steps_per_action, steps_per_reward_roll, primary_xp_per_step, reward_rolls_per_step = _activity_core(
+        base_steps, base_xp, max_efficiency, work_efficiency, double_action, double_rewards,
+        steps_add, steps_percent, bonus_xp_percent, bonus_xp_add
+    )
+    
+    return {
+        'expected_steps_per_action': expected_steps_per_action,
+        'steps_per_reward_roll': steps_per_reward_roll,
+        'primary_xp_per_step': primary_xp_per_step,
+        'reward_rolls_per_step': reward_rolls_per_step,
+    }
+
+
+def _activity_core(
+    base_steps: int,
+    base_xp: float,
+    max_efficiency: float,
+    work_efficiency: float,
+    double_action: float,
+    double_rewards: float,
+    steps_add: float,
+    steps_percent: float,
+    bonus_xp_percent: float,
+    bonus_xp_add: float
+) -> Tuple[float, float, float, float]:
+    """
+    calculate_activity_metrics() arithmetic on plain numbers.
+    
+    Returns:
+        (expected_steps_per_action, steps_per_reward_roll, primary_xp_per_step, reward_rolls_per_step)
+    """
+    # min()/max() written as comparisons: builtin calls dominate a kernel this small
+    ceil = math.ceil
+    
     # Apply work efficiency (capped at max)
-    capped_we = min(work_efficiency, max_efficiency)
+    capped_we = work_efficiency if work_efficiency < max_efficiency else max_efficiency
     total_efficiency = 1.0 + capped_we
-    steps_with_efficiency = math.ceil(base_steps / total_efficiency)
+    steps_with_efficiency = ceil(base_steps / total_efficiency)
     
     # Enforce minimum steps (at max efficiency)
-    min_steps = math.ceil(base_steps / (1 + max_efficiency))
-    steps_after_min = max(steps_with_efficiency, min_steps)
+    min_steps = ceil(base_steps / (1 + max_efficiency))
+    steps_after_min = steps_with_efficiency if steps_with_efficiency >= min_steps else min_steps
     
     # Apply percentage and flat modifiers
     steps_with_pct = steps_after_min * (1 + steps_percent)
     steps_with_flat = steps_with_pct + steps_add
-    steps_per_single_action = max(steps_with_flat, 10)  # Minimum 10 steps
+    steps_per_single_action = steps_with_flat if steps_with_flat >= 10 else 10  # Minimum 10 steps
     
     # Calculate expected steps with double action
     expected_paid_actions = 1.0 / (1 + double_action)
-    expected_steps_per_action = math.ceil(expected_paid_actions * steps_per_single_action)
+    expected_steps_per_action = ceil(expected_paid_actions * steps_per_single_action)
     
     # Calculate reward efficiency
     rewards_per_completion = (1 + double_rewards) * (1 + double_action)
@@ -111,12 +145,12 @@ def calculate_activity_metrics(
     total_xp = base_xp * (1 + bonus_xp_percent) + bonus_xp_add
     primary_xp_per_step = total_xp / expected_steps_per_action if expected_steps_per_action > 0 else 0
     
-    return {
-        'expected_steps_per_action': expected_steps_per_action,
-        'steps_per_reward_roll': steps_per_reward_roll,
-        'primary_xp_per_step': primary_xp_per_step,
-        'reward_rolls_per_step': 1.0 / steps_per_reward_roll if steps_per_reward_roll > 0 else 0,
-    }
+    return (
+        expected_steps_per_action,
+        steps_per_reward_roll,
+        primary_xp_per_step,
+        1.0 / steps_per_reward_roll if steps_per_reward_roll > 0 else 0,
+    )
 
 # ============================================================================
 # CRAFTING METRICS
@@ -182,20 +216,85 @@ def calculate_crafting_metrics(
         steps_percent = total_stats.get('steps_percent', 0.0)
         bonus_xp_percent = total_stats.get('bonus_xp_percent', 0.0)
         bonus_xp_add = total_stats.get('bonus_xp_add', 0.0)
+    else:
+        # Use legacy parameters (with defaults for backward compatibility)
+        if work_efficiency is None:
+            work_efficiency = 0.0
+        if double_action is None:
+            double_action = 0.0
+        if double_rewards is None:
+            double_rewards = 0.0
+        if no_materials_consumed is None:
+            no_materials_consumed = 0.0
+        if quality_outcome is None:
+            quality_outcome = 0.0
+        if steps_add is None:
+            steps_add = 0
+        if steps_percent is None:
+            steps_percent = 0.0
+
+    # Chest finding is only taken from total_stats (no legacy parameter)
+    chest_finding = total_stats.get('chest_finding', 0.0) if total_stats else 0.0
+    
+    (current_steps, expected_steps_per_action, expected_steps_per_item, materials_per_craft,
+     crafts_per_material, primary_xp_per_step, quality_outcome, steps_per_chest) = _crafting_core(
+        base_steps, base_xp, max_efficiency, work_efficiency, double_action, double_rewards,
+        no_materials_consumed, quality_outcome, steps_add, steps_percent, bonus_xp_percent,
+        bonus_xp_add, chest_finding
+    )
+    
+    return {
+        'current_steps': current_steps,
+        'expected_steps_per_action': expected_steps_per_action,
+        'expected_steps_per_item': expected_steps_per_item,
+        'materials_per_craft': materials_per_craft,
+        'crafts_per_material': crafts_per_material,
+        'primary_xp_per_step': primary_xp_per_step,
+        'quality_outcome': quality_outcome,
+        'steps_for_chest': steps_per_chest,
+    }
+
+
+def _crafting_core(
+    base_steps: int,
+    base_xp: float,
+    max_efficiency: float,
+    work_efficiency: float,
+    double_action: float,
+    double_rewards: float,
+    no_materials_consumed: float,
+    quality_outcome: float,
+    steps_add: float,
+    steps_percent: float,
+    bonus_xp_percent: float,
+    bonus_xp_add: float,
+    chest_finding: float
+) -> Tuple[float, ...]:
+    """
+    calculate_crafting_metrics() arithmetic on plain numbers.
+    
+    Returns:
+        (current_steps, expected_steps_per_action, expected_steps_per_item, materials_per_craft,
+        crafts_per_material, primary_xp_per_step, quality_outcome, steps_for_chest)
+    """
+    # min()/max() written as comparisons, as in _activity_core()
+    ceil = math.ceil
     
     # Apply work efficiency (capped at max)
-    capped_we = min(work_efficiency, max_efficiency)
+    capped_we = work_efficiency if work_efficiency < max_efficiency else max_efficiency
     total_efficiency = 1.0 + capped_we
-    steps_with_efficiency = math.ceil(base_steps / total_efficiency)
+    steps_with_efficiency = ceil(base_steps / total_efficiency)
     
     # Apply percentage and flat modifiers
     steps_with_pct = steps_with_efficiency * (1 + steps_percent)
     steps_with_flat = steps_with_pct + steps_add
-    current_steps = max(math.ceil(steps_with_flat), 1)  # Minimum 1 step
+    current_steps = ceil(steps_with_flat)
+    if current_steps < 1:
+        current_steps = 1  # Minimum 1 step
     
     # Calculate expected steps with double action
     expected_paid_actions = 1.0 / (1 + double_action)
-    expected_steps_per_action = math.ceil(expected_paid_actions * current_steps)
+    expected_steps_per_action = ceil(expected_paid_actions * current_steps)
     
     # Calculate material efficiency
     # DR gives extra crafts, NMC reduces material consumption
@@ -213,7 +312,6 @@ def calculate_crafting_metrics(
     
     # Calculate chest finding efficiency
     # Chest finding works like other finding bonuses - increases drop rate
-    chest_finding = total_stats.get('chest_finding', 0.0) if total_stats else 0.0
     # Base chest drop rate is typically 1% (0.01), modified by chest_finding
     base_chest_rate = 0.01
     chest_rate_with_bonus = base_chest_rate * (1 + chest_finding)
@@ -221,16 +319,16 @@ def calculate_crafting_metrics(
     # DR affects all drops including chests
     steps_per_chest = expected_steps_per_action / (chest_rate_with_bonus * (1 + double_rewards)) if chest_rate_with_bonus > 0 else 999999
     
-    return {
-        'current_steps': current_steps,
-        'expected_steps_per_action': expected_steps_per_action,
-        'expected_steps_per_item': expected_steps_per_item,
-        'materials_per_craft': materials_per_craft,
-        'crafts_per_material': crafts_per_material,
-        'primary_xp_per_step': primary_xp_per_step,
-        'quality_outcome': quality_outcome,
-        'steps_for_chest': steps_per_chest,
-    }
+    return (
+        current_steps,
+        expected_steps_per_action,
+        expected_steps_per_item,
+        materials_per_craft,
+        crafts_per_material,
+        primary_xp_per_step,
+        quality_outcome,
+        steps_per_chest,
+    )
 
 # ============================================================================
 # STAT AGGREGATION
@@ -141,6 +141,16 @@ class Attribute(Enum):
         """Get the attribute description."""
         return self.value.description
     
+    @property
+    def id(self) -> int:
+        """Get the dense integer id (0..NUM_ATTRIBUTES-1, in definition order)."""
+        return ATTRIBUTE_ID[self]
+    
+    @classmethod
+    def from_id(cls, attr_id: int) -> 'Attribute':
+        """Look up a attribute by its dense integer id."""
+        return ATTRIBUTE_BY_ID[attr_id]
+    
     @classmethod
     def by_internal_name(cls, name: str) -> 'Attribute | None':
         """Look up a attribute by its internal name."""
@@ -164,3 +174,8 @@ ATTRIBUTE_BY_ABBREVIATION = {attr.abbr: attr for attr in Attribute}
 
 # All attr internal names (for validation)
 ALL_ATTRIBUTE_NAMES = {attr.internal_name for attr in Attribute}
+
+# Dense integer ids, for stat tables indexed by position instead of name
+ATTRIBUTE_BY_ID = tuple(Attribute)
+ATTRIBUTE_ID = {attr: i for i, attr in enumerate(ATTRIBUTE_BY_ID)}
+NUM_ATTRIBUTES = len(ATTRIBUTE_BY_ID)
@@ -4,7 +4,7 @@ Character export utilities for Walkscape
 """
 
 import json
-from typing import Dict, List, Optional, Union
+from typing import Dict, List, Optional, Tuple, Union
 from util.walkscape_constants import *
 import util.walkscape_globals as walkscape_globals
 
@@ -27,6 +27,7 @@ class Character:
         self.achievement_points = data.get('achievement_points', 0)
         self.coins = data.get('coins', 0)
         self._all_items = {}
+        self._valued_items = None
         
         # Custom stats (UI toggles like activity completions)
         # Format: {'screwdriver_underwater_basket_weaving': True, 'skate_skiing': True}
@@ -152,6 +153,16 @@ class Character:
         
         return self._all_items
     
+    @property
+    def valued_items(self) -> List[Tuple[object, int]]:
+        """
+        Get (item, quantity) pairs for items that have a coin value
+        Built once from items on first access
+        """
+        if self._valued_items is None:
+            self._valued_items = [(item, qty) for item, qty in self.items.items() if hasattr(item, 'value')]
+        return self._valued_items
+    
     @property
     def equipment_items(self) -> Dict[object, int]:
         """Get only equipment items with quantities"""
@@ -195,16 +206,15 @@ class Character:
     def get_total_value(self) -> int:
         """Get total coin value of all items (gear + inventory + bank)"""
         total = 0
-        for item, qty in self.items.items():
-            if hasattr(item, 'value'):
-                total += item.value * qty
+        for item, qty in self.valued_items:
+            total += item.value * qty
         return total
     
     def get_duplicate_value(self, min_quantity: int = 2) -> int:
         """Get total value of items with quantity >= min_quantity"""
         total = 0
-        for item, qty in self.items.items():
-            if qty >= min_quantity and hasattr(item, 'value'):
+        for item, qty in self.valued_items:
+            if qty >= min_quantity:
                 total += item.value * qty
         return total
     
@@ -222,8 +232,8 @@ class Character:
         """Get total value of equipment items with quantity >= min_quantity"""
         # Item already imported from walkscape_constants
         total = 0
-        for item, qty in self.items.items():
-            if qty >= min_quantity and hasattr(item, 'value'):
+        for item, qty in self.valued_items:
+            if qty >= min_quantity:
                 # Check if it's equipment (not material or consumable)
                 if hasattr(item, 'slot'):
                     total += item.value * qty
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Travel step kernels for gear search hot loops.
+
+Works on parallel per-route stat lists instead of stat dicts, so the inner
+loop is plain float math with no dict lookups. route_steps() is the single
+copy of the travel formula; calc_steps() in the travel scripts delegates to it.
+
+Functions:
+- route_steps() - Expected travel steps for a single route
+- cached_route_steps() - route_steps() memoized on quantized stats
+- total_steps() - Sum expected travel steps over a batch of routes
+"""
+
+# Standard library imports
+import math
+from functools import lru_cache
+from typing import Sequence
+
+# Resolution stats are rounded to for cache keys (finer than any real stat step)
+STAT_QUANTUM = 1e-6
+
+
+def route_steps(base: int, we: float, da: float, flat: float, pct: float, level_we: float) -> float:
+    """Expected steps (with DA) for one route; see total_steps() for the arguments."""
+    per_action = base / (2.00 + level_we + we) / 10.0
+    per_action = per_action * (1.0 + pct) + flat
+    per_action = max(10, math.ceil(per_action))
+    return math.ceil(10.0 / (1 + da) * per_action)
+
+
+@lru_cache(maxsize=1 << 20)
+def _route_steps_quantized(base: int, we_q: int, da_q: int, flat_q: int, pct_q: int, level_we: float) -> float:
+    """route_steps() on integer-quantized stats, memoized."""
+    return route_steps(
+        base, we_q * STAT_QUANTUM, da_q * STAT_QUANTUM, flat_q * STAT_QUANTUM, pct_q * STAT_QUANTUM, level_we
+    )
+
+
+def cached_route_steps(base: int, we: float, da: float, flat: float, pct: float, level_we: float) -> float:
+    """
+    Memoized route_steps().
+
+    Swapping items with identical stat lines produces the same per-route stats
+    over and over, so those repeats become a dict lookup. Stats are rounded to
+    STAT_QUANTUM first, which also absorbs float noise from add/subtract chains.
+    Use cache_info() to check the hit rate.
+    """
+    return _route_steps_quantized(
+        base, round(we / STAT_QUANTUM), round(da / STAT_QUANTUM),
+        round(flat / STAT_QUANTUM), round(pct / STAT_QUANTUM), level_we
+    )
+
+
+cache_info = _route_steps_quantized.cache_info
+
+
+def total_steps(
+    base_arr: Sequence[int],
+    we_arr: Sequence[float],
+    da_arr: Sequence[float],
+    flat_arr: Sequence[float],
+    pct_arr: Sequence[float],
+    level_we: float
+) -> float:
+    """
+    Sum expected steps (with DA) over a batch of routes.
+
+    Args:
+        base_arr: Base distance per route
+        we_arr: Work efficiency per route (decimal)
+        da_arr: Double action per route (decimal)
+        flat_arr: Flat steps modifier per route
+        pct_arr: Percentage steps modifier per route (decimal)
+        level_we: Work efficiency from agility level
+
+    Returns:
+        Total expected steps across all routes
+    """
+    ceil = math.ceil
+    base_eff = 2.00 + level_we  # Travel base efficiency is 200%, NO WE cap
+    total = 0
+    for base, we, da, flat, pct in zip(base_arr, we_arr, da_arr, flat_arr, pct_arr):
+        per_action = base / (base_eff + we) / 10.0
+        per_action = per_action * (1.0 + pct) + flat
+        per_action = max(10, ceil(per_action))
+        total += ceil(10.0 / (1 + da) * per_action)
+    return total
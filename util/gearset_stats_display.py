@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Detailed per-item stat display for a gearset.
+
+Shared by the gearset stats scripts, which only supply the export string,
+skill and location.
+"""
+
+import sys
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from util.gearset_utils import Gearset, aggregate_gearset_stats
+from util.walkscape_constants import ATTRIBUTE_BY_ID, NUM_ATTRIBUTES
+from util.collectibles_utils import calculate_collectible_stats
+from util.my_config_helpers import load_gearset_export
+from my_config import get_character
+
+Formatter = Callable[[Union[int, float]], str]
+
+
+def _make_formatter(is_percentage: Optional[bool], precision: int) -> Formatter:
+    """
+    Build the value formatter for one kind of stat.
+
+    Args:
+        is_percentage: Attribute.is_percentage, or None for unknown attributes
+        precision: Decimal places to show
+    """
+    percent = f"{{:.{precision}f}}%".format
+    signed = f"{{:+.{precision}f}}".format
+
+    if is_percentage:
+        return lambda value: percent(value * 100)
+    if is_percentage is None:
+        # Unknown attribute - format based on value type
+        return lambda value: (
+            (percent(value * 100) if abs(value) < 1 else signed(value)) if isinstance(value, float) else f"{value:+d}"
+        )
+    return lambda value: signed(value) if isinstance(value, float) else f"{value:+d}"
+
+
+# Known stats by dense attribute id, with the name-sorted display order computed once at import
+STAT_NAMES: List[str] = [attr.name.lower() for attr in ATTRIBUTE_BY_ID]
+STAT_ID_BY_NAME: Dict[str, int] = {stat_name: i for i, stat_name in enumerate(STAT_NAMES)}
+STAT_IS_PERCENTAGE: List[Optional[bool]] = [attr.is_percentage for attr in ATTRIBUTE_BY_ID]
+STAT_ORDER: List[int] = sorted(range(NUM_ATTRIBUTES), key=STAT_NAMES.__getitem__)
+
+# Totals closer to zero than this, with no contributors, are not displayed
+ZERO_EPSILON: float = 1e-9
+
+# (is_percentage, precision) -> formatter; 2 decimals in the breakdown, 1 in the summary
+FORMATTERS: Dict[Tuple[Optional[bool], int], Formatter] = {
+    (is_percentage, precision): _make_formatter(is_percentage, precision)
+    for is_percentage in (True, False, None)
+    for precision in (1, 2)
+}
+
+
+def display_gearset_stats(gearset_export: str, skill, location) -> None:
+    """
+    Print every stat of a gearset with the items and collectibles contributing to it.
+
+    Args:
+        gearset_export: Base64-encoded gearset export string, or a .b64 file path
+        skill: Skill to display stats for
+        location: Location for location-aware stats
+    """
+    # Output lines, written in one go at the end
+    lines: List[str] = []
+    out = lines.append
+
+    # Load character to get collectibles
+    character = get_character()
+
+    # Load gearset
+    gearset = Gearset(load_gearset_export(gearset_export))
+
+    out("="*80)
+    out(f"GEARSET DETAILED STATS (Region: {location})")
+    out("="*80)
+
+    # Each item's stats WITH set bonuses; one pass over the gearset feeds totals and contributors
+    item_stats: List[Tuple[str, Any, Dict[str, Union[int, float]]]] = gearset.get_stats_for_skill_per_item(skill, location=location, character=character)
+    items: List[Any] = [item for slot, item, stats in item_stats]
+
+    # Use aggregate_gearset_stats to get total stats including collectibles
+    total_stats: Dict[str, Union[int, float]] = aggregate_gearset_stats(
+        items=items,
+        skill=skill,
+        location=location,
+        character=character,
+        include_level_bonus=False,  # Don't include level bonus for display
+        include_collectibles=True
+    )
+
+    # Get collectible stats separately for display
+    collectible_stats: Dict[str, Union[int, float]] = calculate_collectible_stats(
+        character.collectibles,
+        skill=skill,
+        location=location
+    )
+
+    # Stats are indexed by dense attribute id from here on; names only come back at print time.
+    # Stats without an Attribute entry get ids past the known ones.
+    stat_ids = STAT_ID_BY_NAME
+    stat_names = STAT_NAMES
+    is_percentage = STAT_IS_PERCENTAGE
+    stat_order = STAT_ORDER
+    unknown: List[str] = sorted(
+        {stat_name for stat_name in total_stats if stat_name not in stat_ids}
+        | {stat_name for _, _, stats in item_stats for stat_name in stats if stat_name not in stat_ids}
+        | {stat_name for stat_name in collectible_stats if stat_name not in stat_ids}
+    )
+    if unknown:
+        stat_ids = dict(stat_ids)
+        for stat_name in unknown:
+            stat_ids[stat_name] = len(stat_ids)
+        stat_names = STAT_NAMES + unknown
+        is_percentage = STAT_IS_PERCENTAGE + [None] * len(unknown)
+        stat_order = sorted(range(len(stat_names)), key=stat_names.__getitem__)
+    num_stats = len(stat_names)
+
+    # Totals per stat id; has_total marks the stats aggregate_gearset_stats returned
+    totals: List[Union[int, float]] = [0] * num_stats
+    has_total: List[bool] = [False] * num_stats
+    for stat_name, stat_value in total_stats.items():
+        stat_id = stat_ids[stat_name]
+        totals[stat_id] = stat_value
+        has_total[stat_id] = True
+
+    # Collect individual item stats (WITH set bonuses per item) as parallel columns per stat id:
+    # source (slot or "collectibles"), item (None for collectibles) and value
+    contributor_sources: List[List[str]] = [[] for _ in range(num_stats)]
+    contributor_items: List[List[Any]] = [[] for _ in range(num_stats)]
+    contributor_values: List[List[Union[int, float]]] = [[] for _ in range(num_stats)]
+    for slot, item, stats in item_stats:
+        for stat_name, stat_value in stats.items():
+            stat_id = stat_ids[stat_name]
+            contributor_sources[stat_id].append(slot)
+            contributor_items[stat_id].append(item)
+            contributor_values[stat_id].append(stat_value)
+
+    # Add collectible contributions
+    for stat_name, stat_value in collectible_stats.items():
+        stat_id = stat_ids[stat_name]
+        contributor_sources[stat_id].append('collectibles')
+        contributor_items[stat_id].append(None)
+        contributor_values[stat_id].append(stat_value)
+
+    # Display stats grouped by stat type
+    out("\nSTATS BY TYPE:")
+    out("="*80)
+
+    # Only stats present in the totals are shown, skipping float residue (~0) nothing contributes to;
+    # filtering the order once applies the skip to both the breakdown and the summary
+    stat_order = [
+        stat_id for stat_id in stat_order
+        if has_total[stat_id] and (abs(totals[stat_id]) >= ZERO_EPSILON or contributor_values[stat_id])
+    ]
+
+    for stat_id in stat_order:
+        stat_name = stat_names[stat_id]
+        stat_value = totals[stat_id]
+        format_value = FORMATTERS[(is_percentage[stat_id], 2)]
+
+        out(f"\n{stat_name.upper()}: {format_value(stat_value)}")
+
+        # Show items that contribute to this stat (if any)
+        values = contributor_values[stat_id]
+        if values:
+            out(f"  Contributors (including set bonuses and collectibles):")
+            for source, item, value in zip(contributor_sources[stat_id], contributor_items[stat_id], values):
+                if source == 'collectibles':
+                    item_name = "Collectibles"
+                else:
+                    item_name = item.display_name if hasattr(item, 'display_name') else item.name
+
+                out(f"    {source:12}: {item_name:40} {format_value(value)}")
+
+            # Check if there's a discrepancy (shouldn't be with new logic)
+            if abs(sum(values) - stat_value) > 0.001:
+                out(f"  Note: Total includes set bonuses and collectibles")
+        else:
+            out(f"  (No direct contributors - may be from set bonus only)")
+
+    out("\n" + "="*80)
+    out("TOTAL GEARSET STATS (including set bonuses and collectibles)")
+    out("="*80)
+    for stat_id in stat_order:
+        out(f"  {stat_names[stat_id]}: {FORMATTERS[(is_percentage[stat_id], 1)](totals[stat_id])}")
+    out("="*80)
+
+    sys.stdout.write("\n".join(lines) + "\n")
@@ -6,6 +6,7 @@ Utilities for working with Walkscape gearset exports
 import base64
 import zlib
 import json
+from functools import lru_cache
 from typing import Dict, List, Optional, Tuple, Union
 from util.walkscape_constants import *
 
@@ -34,9 +35,23 @@ def get_quality_rank(item_name: str) -> int:
     return 999  # No quality = lowest priority
 
 
+# Equipment slots in display order
+GEARSET_SLOTS = ('head', 'cape', 'back', 'chest', 'primary', 'secondary',
+                 'hands', 'legs', 'neck', 'feet', 'ring1', 'ring2',
+                 'tool0', 'tool1', 'tool2', 'tool3', 'tool4', 'tool5')
+
+# Private attributes holding equipped items; assigning one invalidates cached set counts
+_SLOT_ATTRIBUTES = frozenset(f'_{slot}' for slot in GEARSET_SLOTS)
+
+
 class Gearset:
     """Represents a complete equipment loadout"""
     
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        if name in _SLOT_ATTRIBUTES:
+            object.__setattr__(self, '_set_piece_counts', None)
+    
     def __init__(self, export_string: str = None):
         """
         Initialize gearset from export string or empty
@@ -171,11 +186,8 @@ class Gearset:
     def get_all_items(self) -> List[Tuple[str, object]]:
         """Get all equipped items as (slot_name, item) tuples"""
         items = []
-        slots = ['head', 'cape', 'back', 'chest', 'primary', 'secondary', 
-                'hands', 'legs', 'neck', 'feet', 'ring1', 'ring2',
-                'tool0', 'tool1', 'tool2', 'tool3', 'tool4', 'tool5']
         
-        for slot in slots:
+        for slot in GEARSET_SLOTS:
             item = getattr(self, slot)
             if item:
                 items.append((slot, item))
@@ -195,12 +207,8 @@ class Gearset:
         """
         total = {}
         
-        # First, calculate set piece counts
-        set_piece_counts = self._calculate_set_piece_counts()
-        
         # Calculate stats from all items, including set bonuses per piece
-        for slot, item in self.get_all_items():
-            stats = item.get_stats_for_skill(skill, location=location, set_piece_counts=set_piece_counts)
+        for slot, item, stats in self.get_stats_for_skill_per_item(skill, location=location):
             for stat_name, value in stats.items():
                 total[stat_name] = total.get(stat_name, 0.0) + value
         
@@ -210,6 +218,49 @@ class Gearset:
         
         return total
     
+    def get_stats_for_skill_per_item(
+        self,
+        skill: Union[Skill, str] = Skill.TRAVEL,
+        location=None,
+        character=None,
+        set_piece_counts: Dict[str, int] = None
+    ) -> List[Tuple[str, object, Dict[str, float]]]:
+        """
+        Get each equipped item's stats, including its set bonuses
+        
+        The set piece counts are worked out once for the whole gearset and
+        shared by every item, instead of being threaded through per call.
+        
+        Args:
+            skill: Skill enum to filter stats for
+            location: Optional location for location-aware stats
+            character: Optional Character for character-gated stats
+            set_piece_counts: Set piece counts to use (defaults to self.set_piece_counts)
+        
+        Returns:
+            List of (slot_name, item, stats) tuples in get_all_items() order
+        """
+        if set_piece_counts is None:
+            set_piece_counts = self.set_piece_counts
+        
+        return [
+            (slot, item, item.get_stats_for_skill(
+                skill, location=location, character=character, set_piece_counts=set_piece_counts
+            ))
+            for slot, item in self.get_all_items()
+        ]
+    
+    @property
+    def set_piece_counts(self) -> Dict[str, int]:
+        """
+        Unique equipped pieces per set, cached until a slot changes.
+        
+        The dict is shared between callers, so don't modify it.
+        """
+        if self._set_piece_counts is None:
+            self._set_piece_counts = self._calculate_set_piece_counts()
+        return self._set_piece_counts
+    
     def _calculate_set_piece_counts(self) -> Dict[str, int]:
         """
         Calculate how many unique pieces of each set are equipped.
@@ -374,10 +425,14 @@ def _calculate_set_piece_counts_from_items(items: list) -> Dict[str, int]:
 # ============================================================================
 
 
+@lru_cache(maxsize=256)
 def decode_gearset(export_string: str) -> dict:
     """
     Decode a gearset export string from Walkscape
     
+    Each distinct export string is only base64-decoded, inflated and parsed
+    once; repeats return the same (shared, read-only) dictionary.
+    
     Args:
         export_string: Base64-encoded, gzip-compressed JSON string
         
@@ -392,10 +447,10 @@ def decode_gearset(export_string: str) -> dict:
     # Decode base64
     decoded = base64.b64decode(export_string)
     
-    # Decompress gzip
+    # Decompress gzip directly with zlib (no gzip module round-trip)
     decompressed = zlib.decompress(decoded, 16 + zlib.MAX_WBITS)
     
-    # Parse JSON
+    # Parse JSON straight from the bytes
     return json.loads(decompressed)
 
 
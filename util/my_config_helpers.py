@@ -4,9 +4,15 @@ Helper functions and constants for my_config.py
 These are shared utilities that can be imported by other modules.
 """
 
+from functools import lru_cache
+from pathlib import Path
 from typing import Union
 from util.walkscape_constants import *
 
+# Gearset exports may be stored in files under the repo root, e.g. 'gearsets/gdte.b64'
+REPO_ROOT = Path(__file__).resolve().parent.parent
+GEARSET_FILE_SUFFIX = '.b64'
+
 
 # ============================================================
 # SERVICE HELPER FUNCTIONS
@@ -73,9 +79,21 @@ def from_to_location_gear_set_name(from_location, to_location) -> str:
 # GEARSET HELPER FUNCTIONS
 # ============================================================
 
+@lru_cache(maxsize=None)
+def load_gearset_export(value: str) -> str:
+    """
+    Resolve a gearset entry to its export string.
+    
+    Entries ending in .b64 are paths (relative to the repo root) of files holding
+    the export, read the first time they're needed; anything else is the export itself.
+    """
+    if value and value.endswith(GEARSET_FILE_SUFFIX):
+        return (REPO_ROOT / value).read_text().strip()
+    return value
+
 def get_gearset(gearsets_dict: dict, name: str = 'default') -> str:
     """Get a gearset export string by name from a gearsets dictionary."""
-    return gearsets_dict.get(name, gearsets_dict.get('default', ''))
+    return load_gearset_export(gearsets_dict.get(name, gearsets_dict.get('default', '')))
 
 def get_gearset_stats(gearsets_dict: dict, name: str = 'default') -> dict:
     """Get stats dict for a gearset from a gearsets dictionary."""
@@ -276,7 +276,9 @@ class StatsMixin:
         activity_key = activity.name if hasattr(activity, 'name') else (activity if activity else None)
         set_key = frozenset(set_piece_counts.items()) if set_piece_counts else None
         
-        cache_key = (id(self), skill_key, location_key, activity_key, set_key)
+        # Key on the item's identity rather than id(self): quality and AP variants are
+        # rebuilt on every access, so their ids get reused by unrelated instances
+        cache_key = (type(self).__name__, self.name, skill_key, location_key, activity_key, set_key)
         
         # Check cache
         if cache_key in _STATS_CACHE: